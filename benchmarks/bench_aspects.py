@@ -0,0 +1,42 @@
+"""Single-pass aspect extraction: throughput per batch size, to check it scales linearly.
+
+Run from the repository root:
+    python -m benchmarks.bench_aspects --sizes 10000 50000 100000
+"""
+import argparse
+import time
+
+from review_aspects import AspectExtractor
+from review_corpus import generate_sample_reviews
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    extractor = AspectExtractor()
+    print(f"{'reviews':>8}{'mentions':>10}{'scan+score s':>14}{'summary s':>11}{'us/review':>11}")
+    summary = None
+    for n in args.sizes:
+        texts = [r['text'] for r in generate_sample_reviews("Benchmark Bistro", n, seed=args.seed)]
+
+        start = time.perf_counter()
+        mentions = extractor.extract_mentions(texts)
+        t_extract = time.perf_counter() - start
+
+        start = time.perf_counter()
+        summary = extractor.summarize(mentions, n)
+        t_summary = time.perf_counter() - start
+
+        total = t_extract + t_summary
+        print(f"{n:>8}{len(mentions['window']):>10}{t_extract:>14.2f}{t_summary:>11.3f}{total / n * 1e6:>11.1f}")
+
+    if summary is not None:
+        print()
+        print(summary.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Businesses per minute of the /api/batch scheduler, and how long a small batch waits behind a large one.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch --businesses 24 --latency 0.3 --rate 20
+
+Every business is scraped from the local stub search server and analyzed in
+'fast' mode. "small waits" is the time until a 2-business batch submitted right
+after the large one is finished: with round-robin scheduling (separate batches)
+vs first-in-first-out (the same businesses queued at the end of the large batch).
+"""
+import argparse
+import time
+from functools import partial
+
+from flask_script import ReviewServices, summarize_business
+from rate_limiter import get_rate_limiter
+from review_batch import BatchScheduler
+from review_results import ResultStore
+from benchmarks.stub_server import StubSearchServer
+
+
+def wait_for(batch, entries=None):
+    entries = batch.entries if entries is None else entries
+    while any(entry.finished is None for entry in entries):
+        time.sleep(0.02)
+    return max(entry.finished for entry in entries)
+
+
+def check_all_done(*batches):
+    """A failing analysis finishes fast too, so timings only count when every business was analyzed"""
+    for batch in batches:
+        failed = [entry.error for entry in batch.entries if entry.status != 'done']
+        assert not failed, f"{len(failed)} businesses failed, e.g. {failed[0]}"
+
+
+def run(services, workers, businesses, max_reviews):
+    scheduler = BatchScheduler(workers=workers)
+    fn = partial(summarize_business, services=services)
+    large = [(f"Bench Bistro {i}", "Springfield", max_reviews) for i in range(businesses)]
+    small = [("Small Diner A", "Shelbyville", max_reviews), ("Small Diner B", "Shelbyville", max_reviews)]
+
+    start = time.time()
+    big = scheduler.submit(fn, large, analysis_mode='fast')
+    little = scheduler.submit(fn, small, analysis_mode='fast')
+    fair_wait = wait_for(little) - start
+    wait_for(big)
+    check_all_done(big, little)
+    per_minute = big.businesses_per_minute
+
+    start = time.time()
+    fifo = scheduler.submit(fn, large + small, analysis_mode='fast')
+    fifo_wait = wait_for(fifo, fifo.entries[-len(small):]) - start
+    wait_for(fifo)
+    check_all_done(fifo)
+    return per_minute, fair_wait, fifo_wait
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--businesses', type=int, default=24)
+    parser.add_argument('--max-reviews', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.3, help="stub response latency in seconds")
+    parser.add_argument('--rate', type=float, default=20.0, help="requests/sec per host (the shared rate limiter)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    get_rate_limiter().configure(rate=args.rate, burst=args.rate)
+    services = ReviewServices(analysis_mode='fast', results=ResultStore(max_results=4 * args.businesses))
+    services.warm_up()
+    print(f"{'workers':>8}{'businesses/min':>16}{'small waits (rr) s':>20}{'small waits (fifo) s':>22}")
+    with StubSearchServer(latency=args.latency) as server:
+        services.scraper.search_endpoint = server.search_endpoint
+        for workers in args.workers:
+            per_minute, fair_wait, fifo_wait = run(services, workers, args.businesses, args.max_reviews)
+            print(f"{workers:>8}{per_minute:>16.1f}{fair_wait:>20.2f}{fifo_wait:>22.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Live vs cached vs replay-only scraping with the on-disk response cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_cache --latency 0.3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from flask_script import GoogleReviewsScraper
+from review_cache import ResponseCache
+from benchmarks.stub_server import StubSearchServer
+
+
+def run_scrape(endpoint, cache, replay_only=False):
+    scraper = GoogleReviewsScraper(cache=cache, replay_only=replay_only)
+    scraper.search_endpoint = endpoint
+    start = time.perf_counter()
+    reviews = scraper.scrape_reviews_from_search("Stub Cafe", "Springfield", max_reviews=200)
+    return reviews, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.3, help="stub response latency in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(os.path.join(tmp, 'cache.sqlite'))
+        with StubSearchServer(latency=args.latency) as server:
+            endpoint = server.search_endpoint
+            live, t_live = run_scrape(endpoint, cache)
+            warm, t_warm = run_scrape(endpoint, cache)
+            served = server.requests_served
+        # The stub server is gone now; replay must not need the network
+        replay, t_replay = run_scrape(endpoint, cache, replay_only=True)
+
+    print(f"cold (network) : {t_live * 1000:8.1f} ms  ({len(live)} reviews)")
+    print(f"warm (cache)   : {t_warm * 1000:8.1f} ms  ({len(warm)} reviews)")
+    print(f"replay offline : {t_replay * 1000:8.1f} ms  ({len(replay)} reviews)")
+    print(f"network requests: {served}, cache hits: {cache.hits}, misses: {cache.misses}")
+    print(f"identical      : {live == warm == replay}")
+
+
+if __name__ == "__main__":
+    main()
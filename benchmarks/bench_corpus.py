@@ -0,0 +1,33 @@
+"""Throughput and memory of the seeded synthetic review corpus generator.
+
+Run from the repository root:
+    python -m benchmarks.bench_corpus --sizes 100000 1000000 5000000
+"""
+import argparse
+import time
+
+from review_corpus import generate_sample_reviews, sample_reviews_frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000, 5000000])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'reviews':>10}{'frame s':>10}{'rows/s':>14}{'MiB':>8}{'positive %':>12}{'mean stars':>12}")
+    for n in args.sizes:
+        start = time.perf_counter()
+        frame = sample_reviews_frame("Benchmark Bistro", n, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        mib = frame.memory_usage(deep=True).sum() / 2 ** 20
+        positive = (frame['template_sentiment'] == 'positive').mean() * 100
+        print(f"{n:>10}{elapsed:>10.3f}{n / elapsed:>14.0f}{mib:>8.1f}{positive:>12.1f}{frame['stars'].mean():>12.3f}")
+
+    start = time.perf_counter()
+    reviews = generate_sample_reviews("Benchmark Bistro", 100000, seed=args.seed)
+    print(f"list-of-dicts, 100000 reviews: {time.perf_counter() - start:.3f}s ({len(reviews)} dicts)")
+
+
+if __name__ == "__main__":
+    main()
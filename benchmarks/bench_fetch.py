@@ -0,0 +1,67 @@
+"""Legacy fixed-sleep fetching vs token-bucket sequential and concurrent fetching.
+
+Run from the repository root against a local stub search server:
+    python -m benchmarks.bench_fetch --latency 0.5
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from flask_script import GoogleReviewsScraper
+from rate_limiter import HostRateLimiter
+from review_fetcher import ConcurrentFetcher
+from benchmarks.stub_server import StubSearchServer
+
+
+class LegacyFetcher(ConcurrentFetcher):
+    """The pre-token-bucket behaviour: one request at a time, then a fixed 1-2s pause"""
+
+    async def _fetch_one(self, semaphore, url):
+        async with semaphore:
+            response = await asyncio.to_thread(self.session.get, url, timeout=self.timeout)
+            await asyncio.sleep(random.uniform(1, 2))
+            return response
+
+
+def run_scrape(endpoint, max_concurrency, rate_limiter, legacy=False):
+    scraper = GoogleReviewsScraper(max_concurrency=max_concurrency, rate_limiter=rate_limiter)
+    if legacy:
+        scraper.fetcher = LegacyFetcher(scraper.session, max_concurrency=1, timeout=15,
+                                        rate_limiter=HostRateLimiter(rate=1e6, burst=1e6))
+    scraper.search_endpoint = endpoint
+    start = time.perf_counter()
+    reviews = scraper.scrape_reviews_from_search("Stub Cafe", "Springfield", max_reviews=200)
+    return reviews, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.5, help="stub response latency in seconds")
+    parser.add_argument('--concurrency', type=int, default=3)
+    parser.add_argument('--rate', type=float, default=2.0, help="token bucket requests/sec per host")
+    parser.add_argument('--burst', type=float, default=5)
+    parser.add_argument('--throttle-first', type=int, default=0,
+                        help="make the stub answer this many requests with 429")
+    args = parser.parse_args()
+
+    rows = []
+    with StubSearchServer(latency=args.latency) as server:
+        rows.append(('legacy sleeps',) + run_scrape(server.search_endpoint, 1, None, legacy=True))
+        rows.append(('sequential',) + run_scrape(server.search_endpoint, 1, HostRateLimiter(args.rate, args.burst)))
+        rows.append(('concurrent',) + run_scrape(server.search_endpoint, args.concurrency,
+                                                 HostRateLimiter(args.rate, args.burst)))
+    if args.throttle_first:
+        limiter = HostRateLimiter(args.rate, args.burst)
+        with StubSearchServer(latency=args.latency, throttle_first=args.throttle_first) as server:
+            rows.append(('throttled',) + run_scrape(server.search_endpoint, args.concurrency, limiter))
+        print(f"429 responses: {server.requests_throttled}, backoffs recorded: {limiter.throttled}")
+
+    baseline = rows[0][2]
+    for name, reviews, elapsed in rows:
+        print(f"{name:<14}: {elapsed:6.2f}s  ({len(reviews)} reviews)  speedup {baseline / elapsed:5.1f}x")
+    print(f"identical     : {all(reviews == rows[0][1] for _, reviews, _ in rows)}")
+
+
+if __name__ == "__main__":
+    main()
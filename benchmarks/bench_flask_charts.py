@@ -0,0 +1,74 @@
+"""Results-page chart payload and render time: inlined plotly.js vs the /assets bundle plus figure JSON.
+
+Run from the repository root:
+    python -m benchmarks.bench_flask_charts --sizes 200 1000 5000
+"""
+import argparse
+import time
+
+import pandas as pd
+import plotly.express as px
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from flask_script import create_app, plotly_js_url, render_charts
+from review_corpus import generate_sample_reviews
+from sentiment_engine import score_texts_vader
+
+
+def legacy_render_charts(df):
+    """The original index() chart code, kept verbatim as the reference"""
+    sentiment_counts = df['sentiment'].value_counts()
+    fig_pie = px.pie(names=sentiment_counts.index, values=sentiment_counts.values,
+                     title="Sentiment Distribution",
+                     color=sentiment_counts.index,
+                     color_discrete_map={'Positive': 'green', 'Negative': 'red', 'Neutral': 'gold'})
+    pie_html = fig_pie.to_html(full_html=False)
+
+    fig_hist = px.histogram(df, x="score", nbins=20, title="Sentiment Score Distribution")
+    hist_html = fig_hist.to_html(full_html=False)
+    return pie_html, hist_html
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 1000, 5000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    app = create_app(warm_in_background=False)
+    client = app.test_client()
+    with app.test_request_context():
+        url = plotly_js_url()
+    plain = client.get(url)
+    gzipped = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    revalidated = client.get(url, headers={'If-None-Match': gzipped.headers['ETag'], 'Accept-Encoding': 'gzip'})
+    print(f"{url}: {len(plain.data):,} bytes, {len(gzipped.data):,} gzipped, "
+          f"Cache-Control '{plain.headers['Cache-Control']}', revalidation -> {revalidated.status_code}")
+
+    vader = SentimentIntensityAnalyzer()
+    print(f"{'reviews':>8}{'old bytes':>12}{'new bytes':>11}{'smaller':>9}{'old ms':>9}{'new ms':>9}")
+    for n in args.sizes:
+        texts = [r['text'] for r in generate_sample_reviews("Benchmark Bistro", n, seed=args.seed)]
+        df = pd.DataFrame(score_texts_vader(texts, vader))
+
+        old, t_old = best_time(lambda: legacy_render_charts(df), args.repeat)
+        with app.test_request_context():
+            new, t_new = best_time(lambda: render_charts(df), args.repeat)
+        old_bytes = sum(len(html.encode('utf-8')) for html in old)
+        new_bytes = sum(len(html.encode('utf-8')) for html in new)
+        print(f"{n:>8}{old_bytes:>12,}{new_bytes:>11,}{old_bytes / new_bytes:>8.0f}x"
+              f"{t_old * 1e3:>9.1f}{t_new * 1e3:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Per-request latency of the Flask app: per-request objects vs per-worker warm singletons.
+
+Run from the repository root against a local keep-alive stub search server:
+    python -m benchmarks.bench_flask_latency --requests 50 --latency 0.005
+"""
+import argparse
+import statistics
+import time
+
+from flask_script import GoogleReviewsScraper, SentimentAnalyzer, create_app
+from rate_limiter import get_rate_limiter
+from benchmarks.stub_server import StubSearchServer
+
+
+class PerRequestServices:
+    """The pre-factory behaviour: a new scraper (session) and analyzer (VADER lexicon) per request
+
+    Everything else (settings, aspect extractor, result store, ...) is the real
+    ReviewServices', so the shim keeps working as services gain attributes.
+    """
+
+    def __init__(self, services, endpoint):
+        self._services = services
+        self._endpoint = endpoint
+        self.ready = True
+
+    def __getattr__(self, name):
+        return getattr(self._services, name)
+
+    def wait_until_ready(self, timeout=None):
+        return self
+
+    @property
+    def scraper(self):
+        scraper = GoogleReviewsScraper(cache=self._services.response_cache,
+                                       replay_only=self._services.replay_only)
+        scraper.search_endpoint = self._endpoint
+        return scraper
+
+    @property
+    def analyzer(self):
+        return SentimentAnalyzer(cache=self._services.sentiment_cache, mode=self._services.polarity_mode,
+                                 analysis_mode=self._services.analysis_mode,
+                                 aspect_extractor=self._services.aspect_extractor)
+
+
+def time_requests(client, n, form):
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = client.post('/stream', data=form)
+        response.get_data()
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.005, help="stub response latency in seconds")
+    args = parser.parse_args()
+
+    # Pacing is not what is being measured here
+    get_rate_limiter().configure(rate=1e6, burst=1e6)
+    form = {'business': 'Stub Cafe', 'location': 'Springfield', 'max_reviews': '50'}
+
+    rows = []
+    for name in ('per-request', 'singletons'):
+        with StubSearchServer(latency=args.latency, keep_alive=True) as server:
+            app = create_app(warm_in_background=False)
+            services = app.extensions['review_services']
+            services.scraper.search_endpoint = server.search_endpoint
+            if name == 'per-request':
+                app.extensions['review_services'] = PerRequestServices(services, server.search_endpoint)
+            client = app.test_client()
+            time_requests(client, 2, form)  # first-request costs (sentiment cache, imports)
+            opened = server.connections_opened
+            latencies = time_requests(client, args.requests, form)
+            rows.append((name, latencies, server.connections_opened - opened))
+
+    print(f"{'services':<12}{'mean ms':>9}{'p50 ms':>8}{'p95 ms':>8}{'connections':>13}")
+    for name, latencies, connections in rows:
+        p95 = statistics.quantiles(latencies, n=20)[-1]
+        print(f"{name:<12}{statistics.mean(latencies) * 1000:>9.1f}"
+              f"{statistics.median(latencies) * 1000:>8.1f}{p95 * 1000:>8.1f}{connections:>13}")
+    print(f"speedup (mean): {statistics.mean(rows[0][1]) / statistics.mean(rows[1][1]):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Reviews/sec of the fast, balanced and full analysis modes, cold and with a warm result cache.
+
+Run from the repository root:
+    python -m benchmarks.bench_modes --n 10000
+
+These are the numbers documented next to sentiment_engine.ANALYSIS_MODES and in
+the Streamlit sidebar. Both apps' SentimentAnalyzer share the same engine, so the
+Flask one is measured: batch path (analyze_batch) and per-review path (analyze).
+"""
+import argparse
+import time
+
+from flask_script import SentimentAnalyzer
+from review_aspects import AspectExtractor
+from review_corpus import generate_sample_reviews
+from sentiment_cache import SentimentCache
+from sentiment_engine import ANALYSIS_MODES
+
+
+def best_rate(fn, n, repeat, setup=None):
+    """Best items/sec over `repeat` runs of fn(), calling setup() before each"""
+    best = 0.0
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = max(best, n / (time.perf_counter() - start))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=10000, help="reviews per batch")
+    parser.add_argument('--single', type=int, default=1000, help="reviews scored one call at a time")
+    parser.add_argument('--repeat', type=int, default=3, help="best of this many runs")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    # The sample templates repeat, so number each review: "cold" means every text is new to the cache
+    reviews = generate_sample_reviews("Benchmark Bistro", args.n, seed=args.seed)
+    texts = [f"{r['text']} Visit {i}." for i, r in enumerate(reviews)]
+    warm_up = [r['text'] for r in generate_sample_reviews("Warm Up Cafe", 200, seed=args.seed + 1)]
+    base = SentimentAnalyzer()
+    base.aspect_extractor = AspectExtractor(vader=base.vader)
+
+    print(f"{'mode':<10}{'batch cold/s':>14}{'batch warm/s':>14}{'single cold/s':>15}{'single ms':>11}")
+    for mode in ANALYSIS_MODES:
+        analyzer = base.with_analysis_mode(mode)
+        analyzer.analyze_batch(warm_up)
+
+        def fresh_cache():
+            analyzer.cache = SentimentCache(maxsize=2 * args.n)
+
+        cold = best_rate(lambda: analyzer.analyze_batch(texts), len(texts), args.repeat, setup=fresh_cache)
+        # The last cold run left every text cached
+        warm = best_rate(lambda: analyzer.analyze_batch(texts), len(texts), args.repeat)
+
+        analyzer.cache = None
+        single_texts = texts[:args.single]
+        single = best_rate(lambda: [analyzer.analyze(text) for text in single_texts], len(single_texts),
+                           args.repeat)
+        print(f"{mode:<10}{cold:>14,.0f}{warm:>14,.0f}{single:>15,.0f}{1000 / single:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Pages/sec of the per-selector soup.select() parser vs the single-pass SelectorEngine.
+
+Run from the repository root:
+    python -m benchmarks.bench_parsing --repeat 50
+"""
+import argparse
+import time
+
+from review_parsing import SelectorEngine, select_texts_bs4
+from benchmarks.fixture_data import load_html_fixtures
+
+# Same list as streamlit_script.GoogleReviewsScraper.review_selectors (the larger of the two apps)
+REVIEW_SELECTORS = [
+    'div[data-attrid]', 'span.aCOpRe', 'div.VwiC3b', 'div.yXK7lf', 'div.MUxGbd', 'div.kp-blk',
+    'div.review-item', 'div.gws-localreviews__google-review', 'span.review-text', 'div[jsname="fmcmS"]'
+]
+
+
+def pages_per_second(extract, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract(page)
+    return repeat * len(pages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    engine = SelectorEngine(REVIEW_SELECTORS)
+    old = lambda page: select_texts_bs4(page, REVIEW_SELECTORS)
+
+    print(f"{'fixture':<18}{'bytes':>8}{'old p/s':>10}{'new p/s':>10}{'speedup':>9}  identical")
+    for name, page in load_html_fixtures().items():
+        identical = old(page) == engine.extract_texts(page)
+        old_pps = pages_per_second(old, [page], args.repeat)
+        new_pps = pages_per_second(engine.extract_texts, [page], args.repeat)
+        print(f"{name:<18}{len(page):>8}{old_pps:>10.1f}{new_pps:>10.1f}{new_pps / old_pps:>8.1f}x  {identical}")
+
+
+if __name__ == "__main__":
+    main()
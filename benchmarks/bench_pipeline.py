@@ -0,0 +1,258 @@
+"""Throughput, latency and peak memory of every pipeline stage of both apps, as JSON.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline --output bench.json
+    python -m benchmarks.bench_pipeline --compare bench.json --output bench-new.json
+
+Each stage of flask_script and streamlit_script is driven on deterministic
+inputs (the saved HTML fixtures and the seeded synthetic corpus) in a fresh
+process of its own, so the reported peak RSS belongs to that stage alone.
+Sentiment results are not cached, so the scoring itself is measured.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is reported as null
+    resource = None
+
+from review_corpus import generate_sample_reviews
+from benchmarks.fixture_data import load_html_fixtures
+
+APPS = ('flask', 'streamlit')
+STAGES = ('parse_pages', 'is_valid_review', 'extract_stars', 'analyze_sentiment', 'analyze_batch',
+          'build_dataframe', 'render_charts', 'aspects')
+# A throughput drop larger than this against --compare is reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process in MiB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def load_app(app):
+    if app == 'streamlit':
+        # Importing the script outside `streamlit run` logs a bare-mode warning per st call
+        import streamlit.logger
+        streamlit.logger.set_log_level('error')
+        import streamlit_script as module
+    else:
+        import flask_script as module
+    return module
+
+
+def timed_calls(fn, inputs):
+    """Latency of fn(item) for each item, in nanoseconds"""
+    clock = time.perf_counter_ns
+    latencies = []
+    for item in inputs:
+        start = clock()
+        fn(item)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def make_inputs(n, seed):
+    pages = list(load_html_fixtures().values())
+    reviews = generate_sample_reviews("Benchmark Bistro", n, seed=seed)
+    return pages, reviews
+
+
+def run_stage(app, stage, n, sentiment_n, batch_size, repeat, seed):
+    """Run one stage in this process: item count, per-call latencies in ns and RSS before and after"""
+    module = load_app(app)
+    pages, reviews = make_inputs(n, seed)
+    texts = [r['text'] for r in reviews]
+    scraper = module.GoogleReviewsScraper()
+    analyzer = module.SentimentAnalyzer()
+    analyze = analyzer.analyze if app == 'flask' else analyzer.analyze_sentiment
+    baseline = peak_rss_mb()
+
+    if stage == 'parse_pages':
+        # Candidate texts the way the scrapers pull them out of a result page
+        latencies = timed_calls(scraper.selector_engine.extract_texts, pages * repeat)
+        items, unit = len(pages) * repeat, 'page'
+    elif stage == 'is_valid_review':
+        candidates = [text for page in pages for text in scraper.selector_engine.extract_texts(page)] + texts
+        latencies = timed_calls(scraper._is_valid_review, candidates)
+        items, unit = len(candidates), 'text'
+    elif stage == 'extract_stars':
+        candidates = [text for page in pages for text in scraper.selector_engine.extract_texts(page)] + texts
+        latencies = timed_calls(scraper._extract_stars_from_text, candidates)
+        items, unit = len(candidates), 'text'
+    elif stage == 'analyze_sentiment':
+        latencies = timed_calls(analyze, texts[:sentiment_n])
+        items, unit = min(sentiment_n, len(texts)), 'text'
+    elif stage == 'analyze_batch':
+        latencies = timed_calls(lambda batch: analyzer.analyze_batch(batch, workers=1), chunks(texts, batch_size))
+        items, unit = len(texts), f'batch of {batch_size}'
+    else:
+        scored = [dict(review, **res) for review, res in zip(reviews, analyzer.analyze_batch(texts, workers=1))]
+        if stage == 'build_dataframe':
+            latencies = timed_calls(pd.DataFrame, [scored] * repeat)
+            items, unit = len(scored) * repeat, f'frame of {len(scored)}'
+        elif stage == 'render_charts':
+            df = pd.DataFrame(scored)
+            render = render_flask_charts if app == 'flask' else render_streamlit_charts
+            latencies = timed_calls(render, [df] * repeat)
+            items, unit = repeat, f'chart set over {len(df)} reviews'
+        elif stage == 'aspects':
+            extractor = module.AspectExtractor()
+            latencies = timed_calls(extractor.analyze, [texts] * repeat)
+            items, unit = len(texts) * repeat, f'batch of {len(texts)}'
+        else:
+            raise ValueError(f"Unknown stage {stage!r}; expected one of {STAGES}")
+
+    return {'items': items, 'latencies_ns': latencies, 'unit': unit,
+            'baseline_rss_mb': baseline, 'peak_rss_mb': peak_rss_mb()}
+
+
+def render_flask_charts(df):
+    """The figures POST / renders, serialized as index() does"""
+    counts = df['sentiment'].value_counts()
+    pie = px.pie(names=counts.index, values=counts.values, title="Sentiment Distribution",
+                 color=counts.index,
+                 color_discrete_map={'Positive': 'green', 'Negative': 'red', 'Neutral': 'gold'})
+    hist = px.histogram(df, x="score", nbins=20, title="Sentiment Score Distribution")
+    return pie.to_html(full_html=False), hist.to_html(full_html=False)
+
+
+def render_streamlit_charts(df):
+    """The figures display_results() draws, as the JSON st.plotly_chart sends to the browser"""
+    colors = {'Positive': '#2E8B57', 'Negative': '#DC143C', 'Neutral': '#FFD700'}
+    counts = df['sentiment'].value_counts()
+    figures = [
+        px.pie(values=counts.values, names=counts.index, title="Sentiment Distribution",
+               color=counts.index, color_discrete_map=colors),
+        px.bar(x=counts.index, y=counts.values, title="Sentiment Count", color=counts.index,
+               color_discrete_map=colors),
+        px.histogram(df, x='score', title="Sentiment Score Distribution", nbins=20,
+                     color_discrete_sequence=['#4CAF50']),
+        px.scatter(df, x='stars', y='score', color='sentiment', title="Star Rating vs Sentiment Score",
+                   hover_data=['text'], color_discrete_map=colors),
+    ]
+    return [fig.to_json() for fig in figures]
+
+
+def summarize(app, stage, result):
+    latencies = np.asarray(result['latencies_ns'], dtype=np.float64)
+    seconds = latencies.sum() / 1e9
+    return {
+        'app': app,
+        'stage': stage,
+        'items': result['items'],
+        'calls': len(latencies),
+        'call_unit': result['unit'],
+        'seconds': round(seconds, 6),
+        'items_per_sec': round(result['items'] / seconds, 2) if seconds else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)) / 1e6, 6) if len(latencies) else None,
+        'p95_ms': round(float(np.percentile(latencies, 95)) / 1e6, 6) if len(latencies) else None,
+        'baseline_rss_mb': result['baseline_rss_mb'] and round(result['baseline_rss_mb'], 1),
+        'peak_rss_mb': result['peak_rss_mb'] and round(result['peak_rss_mb'], 1),
+    }
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(report, baseline):
+    """Per-stage throughput ratio against an earlier report; True if any stage regressed"""
+    before = {(s['app'], s['stage']): s for s in baseline['stages']}
+    regressed = False
+    print(f"{'app':<10}{'stage':<19}{'before/s':>13}{'now/s':>13}{'ratio':>8}", file=sys.stderr)
+    for stage in report['stages']:
+        old = before.get((stage['app'], stage['stage']))
+        if not old or not old['items_per_sec'] or not stage['items_per_sec']:
+            continue
+        ratio = stage['items_per_sec'] / old['items_per_sec']
+        flag = ''
+        if ratio < 1 - REGRESSION_THRESHOLD:
+            flag, regressed = '  REGRESSION', True
+        print(f"{stage['app']:<10}{stage['stage']:<19}{old['items_per_sec']:>13.1f}"
+              f"{stage['items_per_sec']:>13.1f}{ratio:>7.2f}x{flag}", file=sys.stderr)
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--apps', nargs='+', choices=APPS, default=list(APPS))
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--n', type=int, default=5000, help="synthetic reviews")
+    parser.add_argument('--sentiment-n', type=int, default=2000, help="reviews scored one call at a time")
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=20, help="repeats of the page, frame and chart stages")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--in-process', action='store_true',
+                        help="run every stage in this process (faster, but peak RSS accumulates)")
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    parser.add_argument('--compare', help="earlier JSON report; exit status 1 if a stage regressed")
+    args = parser.parse_args()
+
+    stage_args = (args.n, args.sentiment_n, args.batch_size, args.repeat, args.seed)
+    stages = []
+    for app in args.apps:
+        for stage in args.stages:
+            if args.in_process:
+                result = run_stage(app, stage, *stage_args)
+            else:
+                # A fresh interpreter per stage, so ru_maxrss is that stage's own high-water mark
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+                    result = pool.submit(run_stage, app, stage, *stage_args).result()
+            stages.append(summarize(app, stage, result))
+            s = stages[-1]
+            print(f"{app:<10}{stage:<19}{s['items_per_sec'] or 0:>13.1f}/s  p50 {s['p50_ms']:.4f} ms"
+                  f"  p95 {s['p95_ms']:.4f} ms  peak {s['peak_rss_mb']} MiB", file=sys.stderr)
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'args': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        },
+        'stages': stages,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            if compare(report, json.load(f)):
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
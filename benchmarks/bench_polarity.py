@@ -0,0 +1,82 @@
+"""TextBlob(text).sentiment.polarity vs the lexicon-only FastPolarity: agreement and throughput.
+
+Run from the repository root:
+    python -m benchmarks.bench_polarity --regression 5000 --sizes 10000 100000
+"""
+import argparse
+import time
+
+from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from review_corpus import generate_sample_reviews
+from review_parsing import SelectorEngine
+from sentiment_engine import score_batch
+from textblob_fast import FastPolarity
+from benchmarks.bench_parsing import REVIEW_SELECTORS
+from benchmarks.bench_vader import regression_corpus
+from benchmarks.fixture_data import load_html_fixtures
+
+# Cases around TextBlob's tokenizer and rules: contractions, modifiers, negation, "!", "(!)", emoticons
+TEXTBLOB_EXAMPLES = [
+    "This isn't good! Really, not bad at all.",
+    "I'm so happy :) (!) great...",
+    "Very very good!!!",
+    "not really good",
+    "really not good",
+    "Mr. Smith was e.g. great... :-) ( ! ) : )",
+    "It's \"nice\" - the food wasn't great.",
+    "Terribly slow.\n\nExtremely friendly staff :D",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--regression', type=int, default=5000, help="random regression texts")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    fast = FastPolarity()
+    engine = SelectorEngine(REVIEW_SELECTORS)
+    texts = TEXTBLOB_EXAMPLES + regression_corpus(SentimentIntensityAnalyzer(), args.regression, seed=args.seed)
+    for page in load_html_fixtures().values():
+        texts.extend(engine.extract_texts(page))
+
+    exact = [TextBlob(text).sentiment.polarity for text in texts]
+    approx = fast.polarity_batch(texts)
+    diffs = [abs(a - b) for a, b in zip(exact, approx)]
+    print(f"regression corpus: {len(texts)} texts, {sum(d == 0 for d in diffs)} identical, "
+          f"max |polarity diff| {max(diffs):.2e}")
+
+    print(f"{'reviews':>8}{'exact s':>10}{'fast s':>9}{'speedup':>9}{'max diff':>10}"
+          f"{'e2e exact s':>13}{'e2e fast s':>12}{'same labels':>13}")
+    for n in args.sizes:
+        texts = [r['text'] for r in generate_sample_reviews("Benchmark Bistro", n, seed=args.seed)]
+        # Cold chunk cache each time, as in a fresh worker
+        fast = FastPolarity()
+
+        start = time.perf_counter()
+        exact = [TextBlob(text).sentiment.polarity for text in texts]
+        t_exact = time.perf_counter() - start
+
+        start = time.perf_counter()
+        approx = fast.polarity_batch(texts)
+        t_fast = time.perf_counter() - start
+        max_diff = max(abs(a - b) for a, b in zip(exact, approx))
+
+        # End to end through score_batch (TextBlob + batch VADER + combining)
+        start = time.perf_counter()
+        exact_results = score_batch(texts, mode='exact')
+        t_e2e_exact = time.perf_counter() - start
+        start = time.perf_counter()
+        fast_results = score_batch(texts, mode='fast')
+        t_e2e_fast = time.perf_counter() - start
+        same_labels = sum(a['sentiment'] == b['sentiment'] for a, b in zip(exact_results, fast_results))
+
+        print(f"{n:>8}{t_exact:>10.2f}{t_fast:>9.2f}{t_exact / t_fast:>8.1f}x{max_diff:>10.1e}"
+              f"{t_e2e_exact:>13.2f}{t_e2e_fast:>12.2f}{same_labels / n:>12.2%}")
+
+
+if __name__ == '__main__':
+    main()
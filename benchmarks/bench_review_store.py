@@ -0,0 +1,75 @@
+"""Memory and speed of analyzed reviews as a list of dicts vs the columnar ReviewStore.
+
+Run from the repository root:
+    python -m benchmarks.bench_review_store --n 100000
+"""
+import argparse
+import pickle
+import time
+import tracemalloc
+
+import pandas as pd
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from review_corpus import generate_sample_reviews
+from review_store import ReviewStore
+from sentiment_engine import score_texts_vader
+
+
+def allocated(fn):
+    """(result, bytes fn() left allocated)"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def analyzed_reviews(n, seed, unique):
+    reviews = generate_sample_reviews("Benchmark Bistro", n, seed=seed)
+    if unique:
+        for i, review in enumerate(reviews):
+            review['text'] = f"{review['text']} Visit {i}."
+    scores = score_texts_vader([r['text'] for r in reviews], SentimentIntensityAnalyzer())
+    # Every review as its own objects, like the dicts a scrape-and-analyze stream produces
+    return pickle.loads(pickle.dumps([{**review, **score, 'textblob_polarity': score['score']}
+                                      for review, score in zip(reviews, scores)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'corpus':<10}{'texts':>8}{'dicts MB':>10}{'store MB':>10}{'ratio':>8}"
+          f"{'frame dicts s':>15}{'frame store s':>15}{'filter+sort dicts s':>21}{'filter+sort store s':>21}")
+    for unique in (False, True):
+        data = pickle.dumps(analyzed_reviews(args.n, args.seed, unique))
+        reviews, dict_bytes = allocated(lambda: pickle.loads(data))
+        store, store_bytes = allocated(lambda: ReviewStore.from_reviews(reviews))
+
+        _, t_frame_dicts = timed(lambda: pd.DataFrame(reviews))
+        _, t_frame_store = timed(store.to_pandas)
+
+        def filter_sort_dicts():
+            df = pd.DataFrame(reviews)
+            return df[df['sentiment'] == 'Negative'].sort_values('score')
+
+        _, t_fs_dicts = timed(filter_sort_dicts)
+        _, t_fs_store = timed(lambda: store.to_pandas(store.sort_rows(store.rows_where(sentiment='Negative'),
+                                                                      'score', descending=False)))
+        print(f"{'unique' if unique else 'sample':<10}{store.distinct_texts:>8}{dict_bytes / 1e6:>10.1f}"
+              f"{store_bytes / 1e6:>10.1f}{dict_bytes / store_bytes:>7.1f}x"
+              f"{t_frame_dicts:>15.3f}{t_frame_store:>15.4f}{t_fs_dicts:>21.3f}{t_fs_store:>21.4f}")
+
+
+if __name__ == '__main__':
+    main()
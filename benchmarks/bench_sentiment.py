@@ -0,0 +1,43 @@
+"""Sequential vs process-pool sentiment scoring (TextBlob + VADER).
+
+Run from the repository root:
+    python -m benchmarks.bench_sentiment --sizes 1000 10000 100000 --workers 4
+"""
+import argparse
+import os
+import time
+
+from review_corpus import generate_sample_reviews
+from sentiment_engine import score_batch, shutdown_pools
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--workers', type=int, default=max(2, os.cpu_count() or 1))
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    # Start the pool (and load VADER in each worker) before timing anything
+    score_batch(["warm up the pool"] * args.workers, workers=args.workers)
+
+    print(f"cpus: {os.cpu_count()}, workers: {args.workers}")
+    print(f"{'reviews':>8}{'sequential s':>14}{'parallel s':>12}{'speedup':>9}  same order")
+    for n in args.sizes:
+        texts = [r['text'] for r in generate_sample_reviews("Benchmark Bistro", n, seed=args.seed)]
+
+        start = time.perf_counter()
+        sequential = score_batch(texts)
+        t_seq = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = score_batch(texts, workers=args.workers, chunk_size=args.chunk_size)
+        t_par = time.perf_counter() - start
+
+        print(f"{n:>8}{t_seq:>14.2f}{t_par:>12.2f}{t_seq / t_par:>8.1f}x  {sequential == parallel}")
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
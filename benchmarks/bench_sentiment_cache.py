@@ -0,0 +1,63 @@
+"""Uncached vs content-hash cached sentiment scoring on repetitive review text.
+
+Run from the repository root:
+    python -m benchmarks.bench_sentiment_cache --sizes 1000 10000 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from review_corpus import generate_sample_reviews
+from sentiment_cache import SentimentCache
+from sentiment_engine import score_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    vader = SentimentIntensityAnalyzer()
+
+    def compute(batch):
+        return score_batch(batch, vader=vader)
+
+    print(f"{'reviews':>8}{'uncached s':>12}{'cold s':>9}{'warm s':>9}{'disk s':>9}"
+          f"{'speedup':>9}{'hit rate':>10}  same")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            texts = [r['text'] for r in generate_sample_reviews("Benchmark Bistro", n, seed=args.seed)]
+            path = os.path.join(tmp, f"sentiment_{n}.sqlite")
+
+            start = time.perf_counter()
+            uncached = compute(texts)
+            t_uncached = time.perf_counter() - start
+
+            # Cold: empty cache, so only each distinct text is scored
+            cache = SentimentCache(path=path)
+            start = time.perf_counter()
+            cold = cache.get_or_compute_batch(texts, compute)
+            t_cold = time.perf_counter() - start
+
+            # Warm: everything comes from the memory LRU
+            start = time.perf_counter()
+            warm = cache.get_or_compute_batch(texts, compute)
+            t_warm = time.perf_counter() - start
+
+            # Disk: a fresh process would start with an empty LRU and the SQLite tier
+            reopened = SentimentCache(path=path)
+            start = time.perf_counter()
+            disk = reopened.get_or_compute_batch(texts, compute)
+            t_disk = time.perf_counter() - start
+
+            same = uncached == cold == warm == disk
+            print(f"{n:>8}{t_uncached:>12.2f}{t_cold:>9.2f}{t_warm:>9.3f}{t_disk:>9.3f}"
+                  f"{t_uncached / t_cold:>8.1f}x{cache.hit_rate:>10.1%}  {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Star-rating extraction: per-call re.search loop vs StarRatingExtractor.extract_batch.
+
+Run from the repository root:
+    python -m benchmarks.bench_stars --n 100000
+"""
+import argparse
+import random
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from review_parsing import StarRatingExtractor
+
+
+def legacy_extract_stars(text):
+    """The original streamlit_script implementation, kept verbatim as the reference"""
+    star_patterns = [
+        r'(\d)\s*(?:stars?|out of 5|\/5)',
+        r'★{1,5}',
+        r'(\d)\.?\d*\s*(?:stars?)',
+    ]
+    for pattern in star_patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            if '★' in match.group():
+                return len(match.group())
+            else:
+                try:
+                    return float(match.group(1))
+                except:
+                    return 0
+    return 0
+
+
+def make_texts(n, rated_share=0.25, seed=0):
+    """Review-like texts; about `rated_share` of them carry a rating in one of the supported forms"""
+    rng = random.Random(seed)
+    words = ['Great', 'food', 'slow', 'service', 'friendly', 'staff', 'would', 'return', 'the', 'table',
+             'was', 'clean', 'but', 'pricey', 'open', 'late', 'no', 'rating', 'here', 'STARS', 'out', 'of']
+    ratings = ['5 stars', '4.5 Stars', '3 out of 5', '2/5', '★★★', '★★★★★★★', '1 STAR', '٣ stars',
+               'table for 2', 'paid $40', '10/10 would return']
+    texts = []
+    for _ in range(n):
+        parts = [rng.choice(words) for _ in range(rng.randint(4, 30))]
+        if rng.random() < rated_share:
+            parts.insert(rng.randrange(len(parts) + 1), rng.choice(ratings))
+        texts.append(' '.join(parts))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=100000)
+    parser.add_argument('--rated-share', type=float, default=0.25)
+    args = parser.parse_args()
+
+    texts = make_texts(args.n, args.rated_share)
+    extractor = StarRatingExtractor()
+    # Warm-up: the first non-ASCII text builds the Unicode digit table once per process
+    extractor.extract_batch(texts[:1000])
+
+    start = time.perf_counter()
+    expected = np.array([legacy_extract_stars(text) for text in texts], dtype=np.float64)
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = extractor.extract_batch(pd.Series(texts))
+    t_new = time.perf_counter() - start
+
+    print(f"texts      : {len(texts)} ({int((expected > 0).sum())} with a rating)")
+    print(f"re.search  : {t_old:6.3f}s  ({len(texts) / t_old:10.0f}/s)")
+    print(f"batch      : {t_new:6.3f}s  ({len(texts) / t_new:10.0f}/s)  speedup {t_old / t_new:4.1f}x")
+    print(f"identical  : {np.array_equal(expected, actual)}")
+
+
+if __name__ == "__main__":
+    main()
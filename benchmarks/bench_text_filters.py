@@ -0,0 +1,77 @@
+"""Review candidate filtering: per-keyword substring scans vs the compiled ReviewTextFilter.
+
+Run from the repository root:
+    python -m benchmarks.bench_text_filters --n 100000
+"""
+import argparse
+import random
+import time
+
+import review_parsing
+from review_parsing import ReviewTextFilter
+
+# Copies of streamlit_script.GoogleReviewsScraper's lists, so the benchmark needs no Streamlit runtime
+SKIP_PATTERNS = [
+    'http', 'www', '.com', '.org', 'privacy policy', 'terms of service', 'contact us', 'about us',
+    'follow us', 'subscribe', 'copyright', '©', '®', 'menu', 'hours', 'location',
+    'phone', 'email', 'address'
+]
+REVIEW_INDICATORS = [
+    'good', 'bad', 'great', 'terrible', 'amazing', 'awful', 'nice', 'poor',
+    'excellent', 'disappointing', 'satisfied', 'recommend', 'love', 'hate',
+    'worst', 'best', 'fantastic', 'horrible', 'outstanding', 'mediocre',
+    'service', 'staff', 'food', 'experience', 'quality', 'price',
+    'clean', 'dirty', 'fresh', 'stale', 'fast', 'slow', 'friendly',
+    'rude', 'helpful', 'professional', 'unprofessional'
+]
+FILLER = ['the', 'we', 'visited', 'on', 'sunday', 'table', 'order', 'waited', 'Pizza', 'COFFEE',
+          'and', 'it', 'was', 'really', 'very', 'ww', 'sl', 'ow', 'cont', 'act', 'us', 'http:', 'x.com']
+
+
+def legacy_is_valid_review(text):
+    """The original streamlit_script implementation, kept verbatim as the reference"""
+    if len(text) < 15 or len(text) > 1000:
+        return False
+    text_lower = text.lower()
+    if any(pattern in text_lower for pattern in SKIP_PATTERNS):
+        return False
+    return any(indicator in text_lower for indicator in REVIEW_INDICATORS)
+
+
+def make_candidates(n, seed=0):
+    rng = random.Random(seed)
+    vocab = FILLER * 6 + REVIEW_INDICATORS + SKIP_PATTERNS
+    candidates = []
+    for _ in range(n):
+        words = [rng.choice(vocab) for _ in range(rng.randint(2, 40))]
+        # Glue some words together so keywords also appear across word boundaries
+        sep = rng.choice([' ', ' ', ' ', '', '. '])
+        candidates.append(sep.join(w.upper() if rng.random() < 0.1 else w for w in words))
+    return candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--n', type=int, default=100000)
+    args = parser.parse_args()
+
+    candidates = make_candidates(args.n)
+    review_filter = ReviewTextFilter(SKIP_PATTERNS, REVIEW_INDICATORS, max_length=1000)
+
+    start = time.perf_counter()
+    expected = [legacy_is_valid_review(text) for text in candidates]
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [review_filter.is_valid(text) for text in candidates]
+    t_new = time.perf_counter() - start
+
+    print(f"candidates : {len(candidates)} ({sum(expected)} accepted)")
+    print(f"substring  : {t_old:6.3f}s  ({len(candidates) / t_old:10.0f}/s)")
+    backend = 'aho-corasick' if review_parsing.ahocorasick is not None else 'trie regex'
+    print(f"compiled   : {t_new:6.3f}s  ({len(candidates) / t_new:10.0f}/s)  speedup {t_old / t_new:4.1f}x  [{backend}]")
+    print(f"identical  : {expected == actual}")
+
+
+if __name__ == "__main__":
+    main()
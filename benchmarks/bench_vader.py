@@ -0,0 +1,103 @@
+"""Stock VADER polarity_scores vs the lexicon-array batch scorer: agreement and throughput.
+
+Run from the repository root:
+    python -m benchmarks.bench_vader --regression 20000 --sizes 10000 100000
+"""
+import argparse
+import random
+import time
+
+from vaderSentiment.vaderSentiment import BOOSTER_DICT, NEGATE, SPECIAL_CASES, SentimentIntensityAnalyzer
+
+from review_corpus import generate_sample_reviews
+from vader_batch import LexiconVader
+
+# Sentences from VADER's own examples, which exercise each of its heuristics
+VADER_EXAMPLES = [
+    "VADER is smart, handsome, and funny.",
+    "VADER is very smart, handsome, and funny.",
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "VADER is not smart, handsome, nor funny.",
+    "At least it isn't a horrible book.",
+    "The book was only kind of good.",
+    "The plot was good, but the characters are uncompelling and the dialog is not great.",
+    "Today only kinda sux! But I'll get by, lol",
+    "Make sure you :) or :D today!",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Not bad at all",
+    "Sentiment analysis has never been this good!",
+    "With VADER, sentiment analysis is the shit!",
+    "On the other hand, VADER is quite bad ass",
+    "Without a doubt, excellent idea.",
+    "Roger Dodger is one of the least compelling variations on this theme.",
+    "Roger Dodger is at least compelling as a variation on the theme.",
+]
+
+_FILLER = ['food', 'place', 'staff', 'we', 'it', 'was', 'is', 'and', 'the', 'service']
+_DECORATIONS = ['!', '.', ',', '?', '!!', "'s", ':)']
+
+
+def regression_corpus(analyzer, size, seed=0):
+    """Random texts dense in lexicon words, boosters, negations, idiom parts, caps, punctuation and emoji"""
+    rng = random.Random(seed)
+    lexicon = list(analyzer.lexicon)
+    rule_words = (list(BOOSTER_DICT) + NEGATE + [w for key in SPECIAL_CASES for w in key.split()]
+                  + ['no', 'or', 'nor', 'kind', 'of', 'never', 'so', 'this', 'without', 'doubt',
+                     'least', 'at', 'very', 'but', 'But', 'BUT', 'just', 'enough', 'sort'])
+    emojis = list(analyzer.emojis)[:200]
+
+    def word():
+        r = rng.random()
+        w = rng.choice(lexicon) if r < 0.4 else rng.choice(rule_words) if r < 0.85 else rng.choice(_FILLER)
+        if rng.random() < 0.1:
+            w = w.upper()
+        elif rng.random() < 0.1:
+            w = w.capitalize()
+        if rng.random() < 0.1:
+            w += rng.choice(_DECORATIONS)
+        if rng.random() < 0.03:
+            w = rng.choice(emojis) + rng.choice(['', ' ']) + w
+        return w
+
+    texts = [
+        ' '.join(word() for _ in range(rng.randint(0, 25))) + rng.choice(['', '!', '!!!!!', '??', '????', '.'])
+        for _ in range(size)
+    ]
+    return VADER_EXAMPLES + ['', '   ', '!!!'] + texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--regression', type=int, default=20000, help="random regression texts")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    analyzer = SentimentIntensityAnalyzer()
+    batch = LexiconVader(analyzer)
+
+    texts = regression_corpus(analyzer, args.regression, seed=args.seed)
+    stock = [analyzer.polarity_scores(text) for text in texts]
+    fast = batch.polarity_scores_batch(texts)
+    max_diff = max(abs(s['compound'] - f['compound']) for s, f in zip(stock, fast))
+    identical = sum(s == f for s, f in zip(stock, fast))
+    print(f"regression corpus: {len(texts)} texts, {identical} identical score dicts, "
+          f"max |compound diff| {max_diff:.2e}")
+
+    print(f"{'reviews':>8}{'stock s':>10}{'batch s':>10}{'speedup':>9}  identical")
+    for n in args.sizes:
+        texts = [r['text'] for r in generate_sample_reviews("Benchmark Bistro", n, seed=args.seed)]
+
+        start = time.perf_counter()
+        stock = [analyzer.polarity_scores(text) for text in texts]
+        t_stock = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast = batch.polarity_scores_batch(texts)
+        t_fast = time.perf_counter() - start
+
+        print(f"{n:>8}{t_stock:>10.2f}{t_fast:>10.2f}{t_stock / t_fast:>8.1f}x  {stock == fast}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Deterministic Google-like result pages used as saved HTML fixtures.
+
+Regenerate the files in benchmarks/html_fixtures/ with:
+    python -m benchmarks.fixture_data
+"""
+import os
+import random
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'html_fixtures')
+FIXTURE_SIZES = {'serp_small': 20, 'serp_medium': 80, 'serp_large': 300}
+# UTF-8 pages without <meta charset>, as search results often arrive; the charset must be sniffed
+UNDECLARED_CHARSET_FIXTURES = {'serp_utf8_no_meta': 40}
+
+_SNIPPETS = [
+    "Great food and friendly staff, would recommend to anyone. 5 stars",
+    "Service was slow and the staff seemed rude &amp; unhelpful. 2/5",
+    "Amazing experience, the quality is excellent ★★★★★",
+    "Terrible experience, the food was stale and cold. 1 star",
+    "Decent price for the quality, nothing special.",
+    "Open today &middot; Closes 10PM &middot; Call for hours",
+    "Visit www.example.com for our menu and location details",
+    "Best coffee in town! Clean tables and fast service. 4.5 stars",
+    "Mediocre pizza, but the staff were really helpful.",
+    "Privacy Policy &middot; Terms of Service &middot; Contact us",
+    "Horrible management, will never come back here again.",
+    "Fresh ingredients and a professional team, love it. 4 out of 5",
+]
+_NON_ASCII_SNIPPETS = [
+    "Best café in town, the crème brûlée is perfect ★★★★★",
+    "Überraschend gut – freundliches Personal. 4 out of 5",
+    "Service lent et serveur désagréable… 2/5",
+    "Très bon rapport qualité-prix ★★★★",
+    "寿司はとても新鮮でした。5 stars",
+]
+
+
+def build_page(n_blocks, seed=0, snippets=_SNIPPETS, declare_charset=True):
+    rng = random.Random(seed)
+    meta = '<meta charset="utf-8">' if declare_charset else ''
+    parts = [f'<!DOCTYPE html><html><head>{meta}<title>results</title>',
+             '<style>.VwiC3b{color:#4d5156}</style>',
+             '<script>window.google={kEI:"abc",sn:"web"};</script></head><body><div id="search">']
+    for i in range(n_blocks):
+        snippet = rng.choice(snippets)
+        kind = i % 6
+        if kind == 0:
+            parts.append(
+                f'<div class="g"><div data-attrid="description"><div class="VwiC3b yXK7lf">'
+                f'<span>{snippet}</span> <!-- r{i} --><em>Review {i}</em></div></div></div>'
+            )
+        elif kind == 1:
+            parts.append(f'<div class="kp-blk"><span class="aCOpRe">{snippet}</span>'
+                         f'<script>var r{i}=1;</script></div>')
+        elif kind == 2:
+            parts.append(f'<div class="gws-localreviews__google-review"><div class="review-item">'
+                         f'{snippet}<br>Visited {i} days ago</div></div>')
+        elif kind == 3:
+            parts.append(f'<div jsname="fmcmS">{snippet}</div><div class="MUxGbd">Result {i}: {snippet}</div>')
+        elif kind == 4:
+            parts.append(f'<p><span class="review-text">  {snippet}\n  </span></p>')
+        else:
+            parts.append(f'<div class="unrelated"><a href="/url?q={i}">Link {i}</a> {snippet}</div>')
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+
+def load_html_fixtures():
+    """Return {name: bytes} for every saved fixture page"""
+    pages = {}
+    for name in sorted(os.listdir(FIXTURE_DIR)):
+        if name.endswith('.html'):
+            with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+                pages[name[:-5]] = f.read()
+    return pages
+
+
+def main():
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for seed, (name, n_blocks) in enumerate(FIXTURE_SIZES.items()):
+        with open(os.path.join(FIXTURE_DIR, f'{name}.html'), 'w', encoding='utf-8', newline='\n') as f:
+            f.write(build_page(n_blocks, seed=seed))
+    for seed, (name, n_blocks) in enumerate(UNDECLARED_CHARSET_FIXTURES.items(), len(FIXTURE_SIZES)):
+        with open(os.path.join(FIXTURE_DIR, f'{name}.html'), 'w', encoding='utf-8', newline='\n') as f:
+            f.write(build_page(n_blocks, seed=seed, snippets=_NON_ASCII_SNIPPETS, declare_charset=False))
+    print(f"wrote {len(FIXTURE_SIZES) + len(UNDECLARED_CHARSET_FIXTURES)} fixtures to {FIXTURE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def render_results_page(query, n_reviews=8):
+    """Build a small Google-like results page whose review snippets depend on the query"""
+    items = []
+    for i in range(n_reviews):
+        items.append(
+            f'<div class="VwiC3b">Great service and friendly staff, review {i} for {query}. 5 stars</div>'
+        )
+        items.append(
+            f'<span class="aCOpRe">Slow service and rude staff, visit {i} for {query}. 2/5</span>'
+        )
+    return f"<html><body><div id='search'>{''.join(items)}</div></body></html>"
+
+
+class StubSearchServer:
+    """Local HTTP server that mimics the search endpoint with a fixed response latency"""
+
+    def __init__(self, latency=0.5, page_builder=render_results_page, throttle_first=0, keep_alive=False):
+        self.latency = latency
+        # Answer the first `throttle_first` requests with 429 to exercise backoff
+        self.throttle_first = throttle_first
+        self.requests_served = 0
+        self.requests_throttled = 0
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 lets clients reuse a connection; HTTP/1.0 closes it after every response
+            protocol_version = 'HTTP/1.1' if keep_alive else 'HTTP/1.0'
+            # Headers and body go out as separate writes; without this Nagle stalls each reused connection
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections_opened += 1
+
+            def do_GET(self):
+                time.sleep(server.latency)
+                with server._lock:
+                    throttle = server.requests_throttled < server.throttle_first
+                    if throttle:
+                        server.requests_throttled += 1
+                if throttle:
+                    self.send_response(429)
+                    self.send_header('Retry-After', '0')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+                body = page_builder(query).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.requests_served += 1
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def search_endpoint(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}/search"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
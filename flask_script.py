@@ -1,31 +1,78 @@
-from flask import Flask, render_template, request, send_file, jsonify
-import requests
-from bs4 import BeautifulSoup
+from flask import (Blueprint, Flask, Response, current_app, render_template, request, send_file,
+                   jsonify, stream_with_context, url_for)
+import numpy as np
 import pandas as pd
+import plotly
 import plotly.express as px
-from textblob import TextBlob
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import re, time, random, io, json
+import time, random, io, json, os, threading, copy, queue, gzip
+from functools import partial
 from urllib.parse import quote_plus
 import warnings
 from flask_cors import CORS
+from rate_limiter import configure_from_env
+from review_aspects import AspectExtractor
+from review_batch import batch_scheduler_from_env
+from review_cache import CachedSession, cache_from_env
+from review_dedup import ReviewDeduplicator
+from review_fetcher import ConcurrentFetcher
+from review_jobs import QueueFull, job_manager_from_env
+from review_metrics import get_metrics
+from review_parsing import ReviewTextFilter, SelectorEngine, StarRatingExtractor, response_charset
+from review_results import EXPORT_FORMATS, EXPORT_MIMETYPES, ResultStore, iter_export, result_store_from_env
+from review_stats import SentimentAggregate
+from review_store import ReviewStore
+from sentiment_cache import sentiment_cache_from_env
+from sentiment_engine import (ANALYSIS_MODES, POLARITY_MODES, check_analysis_mode, default_workers, score_batch,
+                              score_text, score_text_vader, score_texts_vader)
 
 warnings.filterwarnings('ignore')
 
-app = Flask(__name__)
-CORS(app, origins=["https://preview--review-radar-77.lovable.app"])
+# GET /api/analyze/stream: a comment line when nothing else was sent for this long (keeps proxies
+# from timing out and finds disconnected clients), and how often an aggregate snapshot is pushed
+SSE_HEARTBEAT_SECONDS = 10.0
+SSE_SNAPSHOT_EVERY = 25
+SSE_SNAPSHOT_SECONDS = 1.0
+
+# Results-page histogram: fixed bins over the score range, counted on the server
+SCORE_HISTOGRAM_BINS = 20
+
+bp = Blueprint('reviews', __name__)
 
 # -------------------- Scraper Class --------------------
 class GoogleReviewsScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    search_endpoint = "https://www.google.com/search"
+    review_selectors = [
+        'span.aCOpRe', 'div.VwiC3b', 'div.yXK7lf', 'div.MUxGbd',
+        'div.review-item', 'span.review-text'
+    ]
+    blacklist = ['privacy policy', 'terms', 'contact', 'address']
+
+    def __init__(self, max_concurrency=3, dedup_mode='exact', cache=None, replay_only=False, rate_limiter=None):
+        self.session = CachedSession(cache, replay_only=replay_only)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0',
             'Accept-Language': 'en-US,en;q=0.9',
         })
+        # Requests are paced by the process-wide per-host token bucket (rate_limiter.get_rate_limiter)
+        self.fetcher = ConcurrentFetcher(self.session, max_concurrency=max_concurrency, timeout=15,
+                                         rate_limiter=rate_limiter)
+        # 'exact' or 'near' (also collapses whitespace/punctuation variants)
+        self.dedup_mode = dedup_mode
+        self.selector_engine = SelectorEngine(self.review_selectors)
+        self.review_filter = ReviewTextFilter(self.blacklist, max_length=500)
+        self.star_extractor = StarRatingExtractor([r'(\d)/5'], number=int, flags=0)
 
     def scrape_reviews_from_search(self, business_name, location="", max_reviews=200):
-        reviews = []
+        return list(self.iter_reviews_from_search(business_name, location, max_reviews))
+
+    def iter_reviews_from_search(self, business_name, location="", max_reviews=200):
+        """Yield reviews as soon as each result page has been parsed"""
+        count = 0
+        seen = ReviewDeduplicator(mode=self.dedup_mode)
+        metrics = get_metrics()
         try:
             search_queries = [
                 f"{business_name} reviews",
@@ -35,45 +82,44 @@ class GoogleReviewsScraper:
             if location:
                 search_queries = [f"{q} {location}" for q in search_queries]
 
-            for query in search_queries:
-                search_url = f"https://www.google.com/search?q={quote_plus(query)}&num=20"
-                response = self.session.get(search_url, timeout=15)
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                review_selectors = [
-                    'span.aCOpRe', 'div.VwiC3b', 'div.yXK7lf', 'div.MUxGbd',
-                    'div.review-item', 'span.review-text'
-                ]
-
-                for selector in review_selectors:
-                    containers = soup.select(selector)
-                    for c in containers:
-                        text = c.get_text().strip()
-                        if self._is_valid_review(text):
-                            stars = self._extract_stars_from_text(text)
-                            if not any(r['text'] == text for r in reviews):
-                                reviews.append({
-                                    'text': text,
-                                    'stars': stars,
-                                    'source': 'Google Search'
-                                })
-                        if len(reviews) >= max_reviews:
-                            return reviews
-                time.sleep(random.uniform(1, 2))
-            return reviews or self._get_sample_reviews(business_name, max_reviews)
+            search_urls = [f"{self.search_endpoint}?q={quote_plus(q)}&num=20" for q in search_queries]
+            # 'fetch' is the wait for each next page; the fetcher has the others in flight meanwhile
+            for response in metrics.timed_iter(self.fetcher.iter_responses(search_urls), 'fetch'):
+                if isinstance(response, Exception):
+                    raise response
+                with metrics.time('parse'):
+                    texts = self.selector_engine.extract_texts(response.content, response_charset(response))
+                with metrics.time('validate'):
+                    candidates = [(text, self._extract_stars_from_text(text))
+                                  for text in texts if self._is_valid_review(text)]
+                metrics.inc('reviews_scraped', len(texts))
+                metrics.inc('reviews_rejected', len(texts) - len(candidates))
+                for text, stars in candidates:
+                    if not seen.add(text):
+                        metrics.inc('reviews_deduped')
+                        continue
+                    count += 1
+                    metrics.inc('reviews_kept')
+                    yield {
+                        'text': text,
+                        'stars': stars,
+                        'source': 'Google Search'
+                    }
+                    if count >= max_reviews:
+                        return
         except Exception as e:
             print("Scraping failed:", e)
-            return self._get_sample_reviews(business_name, max_reviews)
+        # Nothing usable scraped: fall back to sample data
+        if count == 0:
+            metrics.inc('sample_fallbacks')
+            metrics.inc('reviews_sampled', max_reviews)
+            yield from self._get_sample_reviews(business_name, max_reviews)
 
     def _is_valid_review(self, text):
-        if len(text) < 15 or len(text) > 500: 
-            return False
-        blacklist = ['privacy policy', 'terms', 'contact', 'address']
-        return not any(b in text.lower() for b in blacklist)
+        return self.review_filter.is_valid(text)
 
     def _extract_stars_from_text(self, text):
-        match = re.search(r'(\d)/5', text)
-        return int(match.group(1)) if match else 0
+        return self.star_extractor.extract(text)
 
     def _get_sample_reviews(self, business_name, num_reviews=50):
         samples = [
@@ -90,56 +136,538 @@ class GoogleReviewsScraper:
 
 # -------------------- Sentiment Analyzer --------------------
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, cache=None, mode='exact', analysis_mode='balanced', aspect_extractor=None):
+        """mode 'exact' scores TextBlob polarity with TextBlob itself, 'fast' with its lexicon directly
+
+        analysis_mode is one of sentiment_engine.ANALYSIS_MODES: 'fast' scores with
+        VADER only, 'balanced' the cached TextBlob + VADER combination and 'full'
+        adds per-aspect and per-sentence scores from aspect_extractor.
+        """
+        if mode not in POLARITY_MODES:
+            raise ValueError(f"Unknown polarity mode {mode!r}; expected one of {POLARITY_MODES}")
         self.vader = SentimentIntensityAnalyzer()
+        self.mode = mode
+        self.analysis_mode = check_analysis_mode(analysis_mode)
+        self.aspect_extractor = aspect_extractor
+        # Each mode keeps its own cached results
+        self.cache = cache.with_namespace(f"combined-{mode}-v1") if cache is not None and mode != 'exact' else cache
+
+    def with_analysis_mode(self, analysis_mode):
+        """This analyzer for another analysis mode, sharing its VADER, cache and aspect extractor"""
+        other = copy.copy(self)
+        other.analysis_mode = check_analysis_mode(analysis_mode)
+        if analysis_mode == 'full' and other.aspect_extractor is None:
+            other.aspect_extractor = AspectExtractor(vader=self.vader)
+        return other
 
     def analyze(self, text):
-        blob_score = TextBlob(text).sentiment.polarity
-        vader_score = self.vader.polarity_scores(text)['compound']
-        combined = (blob_score + vader_score) / 2
-        if combined >= 0.1: sentiment = 'Positive'
-        elif combined <= -0.1: sentiment = 'Negative'
-        else: sentiment = 'Neutral'
-        return {'sentiment': sentiment, 'score': combined}
+        with get_metrics().time('sentiment'):
+            return self._analyze(text)
+
+    def _analyze(self, text):
+        if self.analysis_mode == 'fast':
+            res = score_text_vader(text, self.vader)
+        elif self.cache is not None:
+            res = self.cache.get_or_compute(text, self._score)
+        else:
+            res = self._score(text)
+        out = {'sentiment': res['sentiment'], 'score': res['score']}
+        if self.analysis_mode == 'full':
+            out.update(self.aspect_extractor.detail_batch([text])[0])
+        return out
+
+    def _score(self, text):
+        return score_text(text, self.vader, mode=self.mode)
+
+    def analyze_batch(self, texts, workers=None, chunk_size=None):
+        """analyze() for many texts, on a process pool when workers > 1; results keep input order"""
+        with get_metrics().time('sentiment_batch'):
+            return self._analyze_batch(list(texts), workers, chunk_size)
+
+    def _analyze_batch(self, texts, workers, chunk_size):
+        def compute(batch):
+            return score_batch(batch, vader=self.vader, workers=workers, chunk_size=chunk_size, mode=self.mode)
+        if self.analysis_mode == 'fast':
+            results = score_texts_vader(texts, self.vader)
+        elif self.cache is not None:
+            results = self.cache.get_or_compute_batch(texts, compute)
+        else:
+            results = compute(texts)
+        out = [{'sentiment': res['sentiment'], 'score': res['score']} for res in results]
+        if self.analysis_mode == 'full':
+            for res, detail in zip(out, self.aspect_extractor.detail_batch(texts)):
+                res.update(detail)
+        return out
+
+    def analyze_stream(self, reviews):
+        """Annotate reviews one at a time as they arrive from the scraper"""
+        for r in reviews:
+            r.update(self.analyze(r['text']))
+            yield r
+
+# -------------------- Per-worker services --------------------
+class ReviewServices:
+    """The scraper and analyzer one worker process shares across all of its requests
+
+    Built once by create_app(): the VADER and TextBlob lexicons are loaded a single
+    time and the scraper's session keeps its pooled connections between requests.
+    """
+
+    def __init__(self, response_cache=None, replay_only=False, sentiment_cache=None, workers=1,
+                 polarity_mode='exact', analysis_mode='balanced', jobs=None, results=None, batches=None):
+        self.response_cache = response_cache
+        self.replay_only = replay_only
+        self.sentiment_cache = sentiment_cache
+        self.workers = workers
+        self.polarity_mode = polarity_mode
+        self.analysis_mode = check_analysis_mode(analysis_mode)
+        self.jobs = jobs
+        # Every analysis stores its rows for the export routes, so there is always a store
+        self.results = results if results is not None else ResultStore()
+        self.batches = batches
+        self.scraper = None
+        self.analyzer = None
+        self.aspect_extractor = None
+        self.error = None
+        self._ready = threading.Event()
+
+    def warm_up(self):
+        try:
+            self.scraper = GoogleReviewsScraper(cache=self.response_cache, replay_only=self.replay_only)
+            self.analyzer = SentimentAnalyzer(cache=self.sentiment_cache, mode=self.polarity_mode,
+                                              analysis_mode=self.analysis_mode)
+            self.aspect_extractor = self.analyzer.aspect_extractor = AspectExtractor(vader=self.analyzer.vader)
+            # TextBlob loads its pattern lexicon on first use, so score something once now
+            score_text("warm up", self.analyzer.vader, mode=self.polarity_mode)
+            metrics = get_metrics()
+            metrics.track_cache('pages', self.response_cache)
+            metrics.track_cache('sentiment', self.analyzer.cache)
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            self._ready.set()
+
+    @property
+    def ready(self):
+        return self._ready.is_set() and self.error is None
+
+    def wait_until_ready(self, timeout=None):
+        if not self._ready.wait(timeout):
+            raise RuntimeError("review services are still warming up")
+        if self.error is not None:
+            raise RuntimeError(f"review services failed to start: {self.error}")
+        return self
+
+
+def get_services():
+    """This worker's ReviewServices, waiting for warm-up if a request arrives first"""
+    return current_app.extensions['review_services'].wait_until_ready()
+
+
+def aspect_records(aspects):
+    """AspectExtractor summary rows for JSON: NaN averages (aspects never mentioned) become null"""
+    return aspects.astype(object).where(aspects.notna(), None).to_dict(orient="records")
+
+
+def aspect_summary(services, analysis_mode, texts):
+    """Per-aspect aggregate records, or None in the VADER-only 'fast' mode, which skips aspect extraction"""
+    if analysis_mode == 'fast':
+        return None
+    return aspect_records(services.aspect_extractor.analyze(texts))
+
+
+def run_analysis(report, services, business, location, max_reviews, analysis_mode, pinned=False):
+    """Scrape, score and aggregate one business off the request thread (the work behind /api/jobs)"""
+    services.wait_until_ready()
+    analyzer = services.analyzer.with_analysis_mode(analysis_mode)
+    stats = SentimentAggregate()
+    analyzed = []
+    report(0, max_reviews)
+    reviews = services.scraper.iter_reviews_from_search(business, location, max_reviews)
+    for r in analyzer.analyze_stream(reviews):
+        analyzed.append(r)
+        stats.add(r)
+        report(stats.total)
+    aspects = aspect_summary(services, analysis_mode, [r['text'] for r in analyzed])
+    stored = services.results.put(analyzed, pinned=pinned, business=business, location=location)
+    return {'business': business, 'location': location, 'analysis_mode': analysis_mode,
+            'reviews': analyzed, 'stats': stats.to_dict(), 'aspects': aspects,
+            'result_id': stored.id}
+
+
+def summarize_business(report, services, business, location, max_reviews, analysis_mode):
+    """run_analysis() without the per-review rows, for /api/batch
+
+    The rows stay downloadable by result_id: they are pinned in the result store
+    until release_batch_results() runs for the expired batch, so a batch of more
+    businesses than REVIEW_RESULT_MAX keeps every download link.
+    """
+    result = run_analysis(report, services, business, location, max_reviews, analysis_mode, pinned=True)
+    del result['reviews']
+    return result
+
+
+def release_batch_results(results, batch):
+    """Unpin the stored results of a batch the scheduler no longer keeps"""
+    results.unpin(entry.summary['result_id'] for entry in batch.entries if entry.summary is not None)
+
+
+def result_links(result_id):
+    """Export URLs of a stored result, by format"""
+    return {fmt: url_for('reviews.export_result', result_id=result_id, fmt=fmt) for fmt in EXPORT_FORMATS}
+
+
+def request_analyzer(services):
+    """The worker's analyzer in the analysis mode the request asks for (form field or query 'analysis_mode')"""
+    return services.analyzer.with_analysis_mode(request.values.get('analysis_mode', services.analysis_mode))
 
 # -------------------- Flask Routes --------------------
-@app.route("/", methods=["GET", "POST"])
+@bp.route("/ready")
+def ready():
+    """Readiness probe: 200 once the lexicons are loaded and the scraper is built, 503 before"""
+    services = current_app.extensions['review_services']
+    if services.ready:
+        return jsonify({"ready": True})
+    body = {"ready": False}
+    if services.error is not None:
+        body["error"] = str(services.error)
+    return jsonify(body), 503
+
+# -------------------- Charts --------------------
+_plotly_js = {}
+
+def plotly_js_payload(encoding):
+    """plotly.js as served from /assets, built (and gzipped) once per process"""
+    payload = _plotly_js.get(encoding)
+    if payload is None:
+        payload = get_plotlyjs().encode('utf-8')
+        if encoding == 'gzip':
+            payload = gzip.compress(payload, compresslevel=9, mtime=0)
+        _plotly_js[encoding] = payload
+    return payload
+
+@bp.route("/assets/plotly-<version>.min.js")
+def plotly_js(version):
+    """The plotly.js bundle, versioned in its URL so browsers may cache it for a year"""
+    if version != plotly.__version__:
+        return jsonify({"error": "unknown plotly.js version"}), 404
+    encoding = 'gzip' if 'gzip' in request.accept_encodings else 'identity'
+    response = Response(plotly_js_payload(encoding), mimetype="application/javascript")
+    if encoding == 'gzip':
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.cache_control.public = True
+    response.cache_control.max_age = 365 * 24 * 3600
+    response.cache_control.immutable = True
+    response.set_etag(f"plotly-{plotly.__version__}-{encoding}")
+    return response.make_conditional(request)
+
+def plotly_js_url():
+    return url_for('reviews.plotly_js', version=plotly.__version__)
+
+def render_charts(df):
+    """Results-page charts as HTML snippets holding only figure JSON
+
+    The first snippet loads plotly.js from /assets (one cached script tag, not the
+    inlined bundle); the score histogram is binned here, so its JSON carries
+    SCORE_HISTOGRAM_BINS counts instead of every review's score.
+    """
+    with get_metrics().time('render'):
+        return _render_charts(df)
+
+
+def _render_charts(df):
+    sentiment_counts = df['sentiment'].value_counts()
+    fig_pie = px.pie(names=sentiment_counts.index, values=sentiment_counts.values,
+                     title="Sentiment Distribution",
+                     color=sentiment_counts.index,
+                     color_discrete_map={'Positive': 'green', 'Negative': 'red', 'Neutral': 'gold'})
+    pie_html = fig_pie.to_html(full_html=False, include_plotlyjs=plotly_js_url())
+
+    counts, edges = np.histogram(df['score'].to_numpy(dtype=float), bins=SCORE_HISTOGRAM_BINS, range=(-1.0, 1.0))
+    fig_hist = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=edges[1] - edges[0],
+                                hovertemplate="score %{x:.2f}: %{y} reviews<extra></extra>"))
+    fig_hist.update_layout(title="Sentiment Score Distribution", xaxis_title="score", yaxis_title="count",
+                           bargap=0)
+    hist_html = fig_hist.to_html(full_html=False, include_plotlyjs=False)
+    return pie_html, hist_html
+
+@bp.route("/", methods=["GET", "POST"])
 def index():
     if request.method == "POST":
         business = request.form.get("business")
         location = request.form.get("location")
         max_reviews = int(request.form.get("max_reviews", 200))
 
-        scraper = GoogleReviewsScraper()
-        analyzer = SentimentAnalyzer()
+        services = get_services()
+        scraper = services.scraper
+        try:
+            analyzer = request_analyzer(services)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         reviews = scraper.scrape_reviews_from_search(business, location, max_reviews)
 
+        results = analyzer.analyze_batch([r['text'] for r in reviews], workers=services.workers)
         analyzed = []
-        for r in reviews:
-            res = analyzer.analyze(r['text'])
+        for r, res in zip(reviews, results):
             r.update(res)
             analyzed.append(r)
 
-        df = pd.DataFrame(analyzed)
+        with get_metrics().time('dataframe'):
+            df = pd.DataFrame(analyzed)
+        aspects = aspect_summary(services, analyzer.analysis_mode, [r['text'] for r in reviews])
 
         # Charts
-        sentiment_counts = df['sentiment'].value_counts()
-        fig_pie = px.pie(names=sentiment_counts.index, values=sentiment_counts.values,
-                         title="Sentiment Distribution",
-                         color=sentiment_counts.index,
-                         color_discrete_map={'Positive': 'green', 'Negative': 'red', 'Neutral': 'gold'})
-        pie_html = fig_pie.to_html(full_html=False)
-
-        fig_hist = px.histogram(df, x="score", nbins=20, title="Sentiment Score Distribution")
-        hist_html = fig_hist.to_html(full_html=False)
+        pie_html, hist_html = render_charts(df)
+        # Kept server-side, so the export links need no upload of the table
+        stored = services.results.put(analyzed, business=business, location=location)
 
         return render_template("results.html", business=business, location=location,
                                total=len(df), table=df.to_dict(orient="records"),
-                               pie_chart=pie_html, hist_chart=hist_html)
-    return render_template("index.html")
+                               pie_chart=pie_html, hist_chart=hist_html,
+                               aspects=aspects,
+                               analysis_mode=analyzer.analysis_mode,
+                               result_id=stored.id, downloads=result_links(stored.id))
+    return render_template("index.html", analysis_modes=ANALYSIS_MODES)
+
+@bp.route("/stream", methods=["POST"])
+def stream():
+    """Same analysis as POST /, streamed as NDJSON: one line per review plus running counts"""
+    business = request.form.get("business")
+    location = request.form.get("location")
+    max_reviews = int(request.form.get("max_reviews", 200))
+
+    services = get_services()
+    scraper = services.scraper
+    try:
+        analyzer = request_analyzer(services)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    def generate():
+        stats = SentimentAggregate()
+        store = ReviewStore()
+        reviews = scraper.iter_reviews_from_search(business, location, max_reviews)
+        for r in analyzer.analyze_stream(reviews):
+            stats.add(r)
+            store.append(r)
+            yield json.dumps({'review': r, 'processed': stats.total, 'counts': stats.counts,
+                              'avg_score': stats.score.mean}) + "\n"
+        # Per-aspect aggregates need every review, so they arrive with the final line
+        aspects = aspect_summary(services, analyzer.analysis_mode, store.texts())
+        stored = services.results.put(store, business=business, location=location)
+        yield json.dumps({'done': True, 'processed': stats.total, 'counts': stats.counts,
+                          'avg_score': stats.score.mean, 'stats': stats.to_dict(),
+                          'aspects': aspects, 'result_id': stored.id,
+                          'downloads': result_links(stored.id)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+def sse_event(event, data, event_id=None):
+    """One Server-Sent Events message with a JSON payload"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
 
-@app.route("/download", methods=["POST"])
+
+@bp.route("/api/analyze/stream", methods=["GET"])
+def analyze_stream_sse():
+    """Analysis as Server-Sent Events while it runs (query: business, location, max_reviews, analysis_mode)
+
+    Events: 'review' per analyzed review, 'stats' aggregate snapshots every
+    SSE_SNAPSHOT_EVERY reviews or SSE_SNAPSHOT_SECONDS, then 'done' with the final
+    stats and aspect summary (or 'error'). Scraping and scoring run in a producer
+    thread so heartbeats keep flowing during slow page fetches; when the client
+    disconnects the next write fails, the generator closes and the producer stops
+    after the review it is working on.
+    """
+    business = (request.args.get("business") or "").strip()
+    location = request.args.get("location") or ""
+    if not business:
+        return jsonify({"error": "business is required"}), 400
+    services = get_services()
+    try:
+        max_reviews = int(request.args.get("max_reviews", 200))
+        analyzer = request_analyzer(services)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    scraper = services.scraper
+
+    events = queue.Queue(maxsize=256)
+    cancelled = threading.Event()
+
+    def put(item):
+        # Bounded hand-off; gives up once the client is gone instead of blocking forever
+        while not cancelled.is_set():
+            try:
+                events.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        reviews = scraper.iter_reviews_from_search(business, location, max_reviews)
+        try:
+            for r in analyzer.analyze_stream(reviews):
+                if not put(('review', r)):
+                    return
+            put(('end', None))
+        except Exception as e:
+            put(('error', str(e)))
+        finally:
+            reviews.close()
+
+    def generate():
+        producer = threading.Thread(target=produce, name="sse-analysis", daemon=True)
+        producer.start()
+        stats = SentimentAggregate()
+        store = ReviewStore()
+        last_snapshot = time.monotonic()
+        try:
+            yield f"retry: 3000\n: analyzing {business}\n\n"
+            while True:
+                try:
+                    kind, payload = events.get(timeout=SSE_HEARTBEAT_SECONDS)
+                except queue.Empty:
+                    # Also how a vanished client is noticed while the producer is busy fetching
+                    yield ": heartbeat\n\n"
+                    continue
+                if kind == 'error':
+                    yield sse_event('error', {'error': payload, 'processed': stats.total})
+                    return
+                if kind == 'end':
+                    aspects = aspect_summary(services, analyzer.analysis_mode, store.texts())
+                    stored = services.results.put(store, business=business, location=location)
+                    yield sse_event('done', {'processed': stats.total, 'stats': stats.to_dict(),
+                                             'aspects': aspects, 'result_id': stored.id,
+                                             'downloads': result_links(stored.id)})
+                    return
+                stats.add(payload)
+                store.append(payload)
+                yield sse_event('review', payload, event_id=stats.total)
+                now = time.monotonic()
+                if stats.total % SSE_SNAPSHOT_EVERY == 0 or now - last_snapshot >= SSE_SNAPSHOT_SECONDS:
+                    last_snapshot = now
+                    yield sse_event('stats', {'processed': stats.total, 'target': max_reviews,
+                                              'counts': stats.counts, 'avg_score': stats.score.mean})
+        finally:
+            # Runs on normal completion and when the server closes us after a failed write
+            cancelled.set()
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(generate()), mimetype="text/event-stream", headers=headers)
+
+@bp.route("/api/jobs", methods=["POST"])
+def create_job():
+    """Queue an analysis (JSON body or form: business, location, max_reviews, analysis_mode) and return its id
+
+    Answers 202 at once; poll GET /api/jobs/<id>. 429 when the job queue is full.
+    """
+    services = current_app.extensions['review_services']
+    params = request.get_json(silent=True) or request.form
+    business = (params.get("business") or "").strip()
+    if not business:
+        return jsonify({"error": "business is required"}), 400
+    try:
+        max_reviews = int(params.get("max_reviews", 200))
+        analysis_mode = check_analysis_mode(params.get("analysis_mode", services.analysis_mode))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        job = services.jobs.submit(partial(run_analysis, services=services), business=business,
+                                   location=params.get("location") or "", max_reviews=max_reviews,
+                                   analysis_mode=analysis_mode)
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "5"}
+    body = job.to_dict(include_result=False)
+    body['status_url'] = url_for('reviews.get_job', job_id=job.id)
+    return jsonify(body), 202, {"Location": body['status_url']}
+
+@bp.route("/api/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Status, progress and, once done, the results of a queued analysis; 404 if unknown or expired"""
+    job = current_app.extensions['review_services'].jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "unknown or expired job"}), 404
+    body = job.to_dict()
+    if 'result' in body:
+        body['result'] = {**body['result'], 'downloads': result_links(body['result']['result_id'])}
+    return jsonify(body)
+
+@bp.route("/api/batch", methods=["POST"])
+def create_batch():
+    """Queue many businesses at once and return the batch id
+
+    JSON body: {"businesses": [{"business", "location", "max_reviews"} or
+    [business, location, max_reviews], ...], "max_reviews": default,
+    "analysis_mode": ...}. Answers 202 at once; poll GET /api/batch/<id>. 400 on
+    malformed entries, 429 when too many businesses are already waiting.
+    """
+    services = current_app.extensions['review_services']
+    params = request.get_json(silent=True)
+    businesses = params.get("businesses") if isinstance(params, dict) else None
+    if not isinstance(businesses, list):
+        return jsonify({"error": "businesses must be a list"}), 400
+    try:
+        default_max_reviews = int(params.get("max_reviews", 200))
+        analysis_mode = check_analysis_mode(params.get("analysis_mode", services.analysis_mode))
+        batch = services.batches.submit(partial(summarize_business, services=services), businesses,
+                                        default_max_reviews=default_max_reviews, analysis_mode=analysis_mode)
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 429, {"Retry-After": "30"}
+    body = batch.to_dict(include_entries=False)
+    body['status_url'] = url_for('reviews.get_batch', batch_id=batch.id)
+    return jsonify(body), 202, {"Location": body['status_url']}
+
+@bp.route("/api/batch/<batch_id>", methods=["GET"])
+def get_batch(batch_id):
+    """Per-business status and summaries, the comparison table and businesses/minute; 404 if unknown or expired"""
+    batch = current_app.extensions['review_services'].batches.get(batch_id)
+    if batch is None:
+        return jsonify({"error": "unknown or expired batch"}), 404
+    body = batch.to_dict()
+    for entry in body['entries']:
+        if 'summary' in entry:
+            entry['summary'] = {**entry['summary'], 'downloads': result_links(entry['summary']['result_id'])}
+    return jsonify(body)
+
+@bp.route("/api/results/<result_id>", methods=["GET"])
+def get_result(result_id):
+    """What a stored result holds and where to download it"""
+    services = current_app.extensions['review_services']
+    stored = services.results.get(result_id)
+    if stored is None:
+        return jsonify({"error": "unknown or expired result"}), 404
+    return jsonify({'id': stored.id, 'rows': len(stored.store), 'created': stored.created,
+                    'expires': stored.created + services.results.ttl, **stored.meta,
+                    'downloads': result_links(stored.id)})
+
+@bp.route("/api/results/<result_id>.csv", defaults={'fmt': 'csv'})
+@bp.route("/api/results/<result_id>.csv.gz", defaults={'fmt': 'csv.gz'})
+@bp.route("/api/results/<result_id>.parquet", defaults={'fmt': 'parquet'})
+def export_result(result_id, fmt):
+    """A stored result as CSV, gzipped CSV or Parquet, streamed in chunks as it is encoded"""
+    stored = current_app.extensions['review_services'].results.get(result_id)
+    if stored is None:
+        return jsonify({"error": "unknown or expired result"}), 404
+    try:
+        chunks = iter_export(stored.store, fmt)
+    except ImportError as e:
+        return jsonify({"error": str(e)}), 501
+    headers = {"Content-Disposition": f'attachment; filename="reviews_analysis_{result_id}.{fmt}"'}
+    return Response(chunks, mimetype=EXPORT_MIMETYPES[fmt], headers=headers)
+
+@bp.route("/metrics")
+def metrics():
+    """Stage timings, scrape counters and cache hit rates of this worker, for Prometheus to scrape"""
+    return Response(get_metrics().render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+@bp.route("/download", methods=["POST"])
 def download():
     try:
         data = request.get_json()
@@ -152,6 +680,53 @@ def download():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+# -------------------- App factory --------------------
+def create_app(warm_in_background=True):
+    """Build the app and this worker's ReviewServices
+
+    Configuration comes from the environment: REVIEW_CACHE_PATH / REVIEW_CACHE_REPLAY
+    (page cache), REVIEW_RATE_LIMIT / REVIEW_RATE_BURST (per-host pacing),
+    SENTIMENT_WORKERS (process-pool size, 1 = score in the request process),
+    SENTIMENT_CACHE_SIZE / SENTIMENT_CACHE_PATH (sentiment result cache) and
+    SENTIMENT_POLARITY_MODE ('exact' TextBlob or the 'fast' lexicon-only path),
+    SENTIMENT_ANALYSIS_MODE (the default of the per-request 'analysis_mode': 'fast'
+    VADER only, 'balanced' or 'full' with aspect and sentence scores),
+    REVIEW_JOB_WORKERS / REVIEW_JOB_QUEUE / REVIEW_JOB_TTL (the /api/jobs pool,
+    queue depth and seconds a finished job's result is kept),
+    REVIEW_RESULT_TTL / REVIEW_RESULT_MAX (stored results behind /api/results; a
+    batch's results are kept as long as the batch and not counted) and
+    REVIEW_BATCH_WORKERS / REVIEW_BATCH_MAX / REVIEW_BATCH_QUEUE / REVIEW_BATCH_TTL
+    (businesses /api/batch analyzes at once, per batch, waiting in total, and
+    seconds a finished batch is kept).
+    With warm_in_background the server starts accepting requests at once and
+    /ready reports 503 until warm-up has finished.
+    """
+    app = Flask(__name__)
+    CORS(app, origins=["https://preview--review-radar-77.lovable.app"])
+    app.register_blueprint(bp)
+
+    configure_from_env()
+    results = result_store_from_env()
+    services = ReviewServices(
+        response_cache=cache_from_env(),
+        replay_only=os.environ.get('REVIEW_CACHE_REPLAY') == '1',
+        sentiment_cache=sentiment_cache_from_env(),
+        workers=default_workers(),
+        polarity_mode=os.environ.get('SENTIMENT_POLARITY_MODE', 'exact'),
+        analysis_mode=os.environ.get('SENTIMENT_ANALYSIS_MODE', 'balanced'),
+        jobs=job_manager_from_env(),
+        results=results,
+        batches=batch_scheduler_from_env(on_expire=partial(release_batch_results, results)),
+    )
+    app.extensions['review_services'] = services
+    if warm_in_background:
+        threading.Thread(target=services.warm_up, name="review-services-warm-up", daemon=True).start()
+    else:
+        services.warm_up()
+    return app
+
+app = create_app()
+
 # -------------------- Run --------------------
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+THROTTLE_STATUS_CODES = {429, 503}
+_CAPTCHA_MARKERS = (b'unusual traffic from your computer network', b'g-recaptcha', b'/sorry/index')
+
+
+class TokenBucket:
+    """Thread-safe token bucket with adaptive backoff
+
+    Tokens refill at `rate` per second up to `burst`. acquire() reserves a token
+    and sleeps only as long as needed. backoff() pauses the whole bucket, doubling
+    the pause on each consecutive throttle signal; success() lets it decay again.
+    """
+
+    def __init__(self, rate=1.0, burst=5, min_backoff=2.0, max_backoff=60.0):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.penalty = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token now and return how many seconds the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def backoff(self, retry_after=None):
+        with self._lock:
+            self.penalty = min(self.max_backoff, max(self.min_backoff, self.penalty * 2))
+            pause = max(self.penalty, retry_after or 0)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause)
+            return pause
+
+    def success(self):
+        with self._lock:
+            self.penalty /= 2
+            if self.penalty < self.min_backoff:
+                self.penalty = 0.0
+
+
+class HostRateLimiter:
+    """One TokenBucket per host, created on first use"""
+
+    def __init__(self, rate=1.0, burst=5):
+        self.rate = rate
+        self.burst = burst
+        self.throttled = 0
+        self._overrides = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def configure(self, host=None, rate=None, burst=None):
+        """Change the default policy, or set one for a single host; existing buckets are rebuilt"""
+        with self._lock:
+            if host is None:
+                self.rate = rate if rate is not None else self.rate
+                self.burst = burst if burst is not None else self.burst
+                self._buckets.clear()
+            else:
+                self._overrides[host] = (rate or self.rate, burst or self.burst)
+                self._buckets.pop(host, None)
+
+    def bucket_for(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self._overrides.get(host, (self.rate, self.burst))
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+            return bucket
+
+    def acquire(self, url):
+        return self.bucket_for(url).acquire()
+
+    def report(self, url, throttled, retry_after=None):
+        bucket = self.bucket_for(url)
+        if throttled:
+            self.throttled += 1
+            return bucket.backoff(retry_after)
+        bucket.success()
+        return 0.0
+
+
+_shared_limiter = HostRateLimiter()
+
+
+def get_rate_limiter():
+    """The process-wide limiter shared by every GoogleReviewsScraper"""
+    return _shared_limiter
+
+
+def is_throttled(response, check_body=True):
+    """True for 429/503 responses and Google's 'unusual traffic' captcha page"""
+    if response.status_code in THROTTLE_STATUS_CODES:
+        return True
+    if '/sorry/' in (response.url or ''):
+        return True
+    if check_body:
+        body = response.content[:20000].lower()
+        return any(marker in body for marker in _CAPTCHA_MARKERS)
+    return False
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that waits for a token before each request and backs off when throttled
+
+    Only real network sends pass through an adapter, so cached responses cost no tokens.
+    """
+
+    def __init__(self, rate_limiter=None, max_retries_on_throttle=2, **kwargs):
+        super().__init__(**kwargs)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.max_retries_on_throttle = max_retries_on_throttle
+
+    def send(self, request, **kwargs):
+        check_body = not kwargs.get('stream', False)
+        for attempt in range(self.max_retries_on_throttle + 1):
+            self.rate_limiter.acquire(request.url)
+            response = super().send(request, **kwargs)
+            throttled = is_throttled(response, check_body=check_body)
+            self.rate_limiter.report(request.url, throttled, _retry_after_seconds(response))
+            if not throttled or attempt == self.max_retries_on_throttle:
+                return response
+            response.close()
+        return response
+
+
+def configure_from_env(environ=None):
+    """Apply REVIEW_RATE_LIMIT (requests/sec per host) and REVIEW_RATE_BURST to the shared limiter"""
+    environ = os.environ if environ is None else environ
+    rate = environ.get('REVIEW_RATE_LIMIT')
+    burst = environ.get('REVIEW_RATE_BURST')
+    if rate or burst:
+        _shared_limiter.configure(
+            rate=float(rate) if rate else None,
+            burst=float(burst) if burst else None,
+        )
+    return _shared_limiter
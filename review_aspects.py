@@ -0,0 +1,189 @@
+import re
+
+import numpy as np
+import pandas as pd
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from sentiment_engine import classify
+from vader_batch import LexiconVader
+
+# The aspects our review indicators already look for, with the words that mention each one
+ASPECT_KEYWORDS = {
+    'service': ['service', 'services', 'served', 'server', 'servers', 'waiter', 'waiters',
+                'waitress', 'customer care', 'customer service'],
+    'staff': ['staff', 'employee', 'employees', 'team', 'manager', 'managers', 'management',
+              'people', 'crew'],
+    'food': ['food', 'meal', 'meals', 'dish', 'dishes', 'menu', 'taste', 'delicious', 'fresh',
+             'stale', 'order', 'orders'],
+    'price': ['price', 'prices', 'pricing', 'priced', 'value', 'money', 'expensive', 'cheap',
+              'cost', 'costs', 'worth', 'overpriced'],
+    'quality': ['quality', 'standard', 'standards'],
+    'cleanliness': ['clean', 'cleanliness', 'dirty', 'hygiene', 'filthy', 'tidy', 'messy'],
+    'speed': ['speed', 'fast', 'slow', 'quick', 'quickly', 'wait', 'waiting', 'waited', 'timing',
+              'efficient', 'delay', 'delays'],
+}
+ASPECTS = tuple(ASPECT_KEYWORDS)
+
+# Sentence ends and contrastive conjunctions close the clause an aspect is scored in
+_SENTENCE_BREAK = r'[.!?;]+'
+_CLAUSE_WORDS = ('but', 'however', 'although', 'though', 'whereas')
+_BREAK = -1
+# Sentences for sentence-level scores keep their closing punctuation, which VADER weighs
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def _trie_alternation(words):
+    """Regex matching exactly one of words, arranged as a prefix trie so shared prefixes are tried once"""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return (body if len(branches) > 1 else '(?:' + body + ')') + '?'
+        return body
+
+    return build(trie)
+
+
+class AspectExtractor:
+    """Per-aspect sentiment from one scan over each review
+
+    A single regex pass over the lowercased text finds both aspect keywords and
+    clause boundaries, so each mention's window is the clause it sits in
+    ("great food but slow service" gives food -> "great food", speed -> "slow
+    service"). All windows of a batch are then scored together with the
+    lexicon-array VADER scorer. Work is linear in the total length of the reviews.
+    """
+
+    def __init__(self, aspects=ASPECT_KEYWORDS, vader=None):
+        self.aspects = tuple(aspects)
+        self._aspect_of = {}
+        for aspect_id, aspect in enumerate(self.aspects):
+            for keyword in aspects[aspect]:
+                self._aspect_of.setdefault(keyword.lower(), aspect_id)
+        for word in _CLAUSE_WORDS:
+            self._aspect_of[word] = _BREAK
+        pattern = rf"(?P<brk>{_SENTENCE_BREAK})|\b(?P<kw>{_trie_alternation(self._aspect_of)})\b"
+        self._scanner = re.compile(pattern)
+        # For the rare text whose lowercase form has a different length, so offsets would not line up
+        self._scanner_ignorecase = re.compile(pattern, re.IGNORECASE)
+        self.vader = LexiconVader(vader or SentimentIntensityAnalyzer())
+
+    def extract_mentions(self, texts):
+        """Aspect mentions as columnar arrays: 'review' index, 'aspect_id', 'compound' and the scored 'window'
+
+        An aspect mentioned several times in one clause counts once for that clause.
+        """
+        reviews, aspect_ids, windows = [], [], []
+        aspect_of = self._aspect_of
+        for review, text in enumerate(texts):
+            clause_start = 0
+            pending = {}
+            lowered = text.lower()
+            if len(lowered) == len(text):
+                matches = self._scanner.finditer(lowered)
+            else:
+                matches = self._scanner_ignorecase.finditer(text)
+            for match in matches:
+                keyword = match.group('kw')
+                aspect_id = _BREAK if keyword is None else aspect_of[keyword.lower()]
+                if aspect_id == _BREAK:
+                    if pending:
+                        window = text[clause_start:match.start()].strip()
+                        for aspect_id in pending:
+                            reviews.append(review)
+                            aspect_ids.append(aspect_id)
+                            windows.append(window)
+                        pending = {}
+                    clause_start = match.end()
+                else:
+                    pending.setdefault(aspect_id, None)
+            if pending:
+                window = text[clause_start:].strip()
+                for aspect_id in pending:
+                    reviews.append(review)
+                    aspect_ids.append(aspect_id)
+                    windows.append(window)
+
+        scores = self.vader.polarity_scores_batch(windows)
+        return {
+            'review': np.asarray(reviews, dtype=np.int64),
+            'aspect_id': np.asarray(aspect_ids, dtype=np.int8),
+            'compound': np.fromiter((s['compound'] for s in scores), dtype=np.float64, count=len(scores)),
+            'window': windows,
+        }
+
+    def summarize(self, mentions, num_reviews):
+        """Per-aspect aggregates for a business: mentions, reviews, share, average score and label counts"""
+        n_aspects = len(self.aspects)
+        aspect_ids = mentions['aspect_id']
+        compound = mentions['compound']
+        counts = np.bincount(aspect_ids, minlength=n_aspects)
+        totals = np.bincount(aspect_ids, weights=compound, minlength=n_aspects)
+
+        # Distinct (review, aspect) pairs: how many reviews talk about each aspect at all
+        pairs = np.unique(mentions['review'] * n_aspects + aspect_ids)
+        reviews = np.bincount(pairs % n_aspects, minlength=n_aspects) if len(pairs) else np.zeros(n_aspects, int)
+
+        labels = np.array([classify(score) for score in compound.tolist()], dtype=object)
+        label_counts = {
+            label: np.bincount(aspect_ids[labels == label], minlength=n_aspects)
+            for label in ('Positive', 'Neutral', 'Negative')
+        }
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average = np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
+        return pd.DataFrame({
+            'aspect': list(self.aspects),
+            'mentions': counts,
+            'reviews': reviews,
+            'review_share': reviews / num_reviews if num_reviews else np.zeros(n_aspects),
+            'avg_score': average,
+            'positive': label_counts['Positive'],
+            'neutral': label_counts['Neutral'],
+            'negative': label_counts['Negative'],
+        })
+
+    def scores_by_review(self, mentions, num_reviews):
+        """{aspect: mean clause score} for each review, for the aspects it mentions"""
+        per_review = [{} for _ in range(num_reviews)]
+        seen = {}
+        for review, aspect_id, score in zip(mentions['review'].tolist(), mentions['aspect_id'].tolist(),
+                                            mentions['compound'].tolist()):
+            aspect = self.aspects[aspect_id]
+            total, count = seen.get((review, aspect), (0.0, 0))
+            seen[(review, aspect)] = (total + score, count + 1)
+            per_review[review][aspect] = (total + score) / (count + 1)
+        return per_review
+
+    def detail_batch(self, texts):
+        """Per-review extras for full analysis: 'aspect_scores' {aspect: score} and 'sentence_scores'
+
+        Sentence scores are [{'text', 'compound'}] in order; all sentences of the
+        batch are scored in one VADER batch, as the aspect windows are.
+        """
+        texts = list(texts)
+        aspect_scores = self.scores_by_review(self.extract_mentions(texts), len(texts))
+        sentences, owners = [], []
+        for review, text in enumerate(texts):
+            for sentence in _SENTENCE_SPLIT.split(text.strip()):
+                if sentence:
+                    sentences.append(sentence)
+                    owners.append(review)
+        sentence_scores = [[] for _ in texts]
+        for review, sentence, scores in zip(owners, sentences, self.vader.polarity_scores_batch(sentences)):
+            sentence_scores[review].append({'text': sentence, 'compound': scores['compound']})
+        return [{'aspect_scores': aspects, 'sentence_scores': scored}
+                for aspects, scored in zip(aspect_scores, sentence_scores)]
+
+    def analyze(self, texts):
+        """summarize() straight from texts"""
+        texts = list(texts)
+        return self.summarize(self.extract_mentions(texts), len(texts))
@@ -0,0 +1,274 @@
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+from review_jobs import QueueFull
+
+
+class BatchEntry:
+    """One business of a batch: its parameters, status and, once analyzed, its summary"""
+
+    def __init__(self, index, business, location="", max_reviews=200):
+        for name, value in (('business', business), ('location', location)):
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"entry {index}: {name} must be a string")
+        business = (business or "").strip()
+        if not business:
+            raise ValueError(f"entry {index}: business is required")
+        try:
+            max_reviews = int(max_reviews)
+        except (TypeError, ValueError):
+            raise ValueError(f"entry {index}: max_reviews must be an integer") from None
+        if max_reviews < 1:
+            raise ValueError(f"entry {index}: max_reviews must be at least 1")
+        self.index = index
+        self.business = business
+        self.location = (location or "").strip()
+        self.max_reviews = max_reviews
+        self.status = 'queued'
+        self.processed = 0
+        self.summary = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @classmethod
+    def parse(cls, index, item, default_max_reviews=200):
+        """An entry from a {"business", "location", "max_reviews"} object or a [business, location, max_reviews] list"""
+        if isinstance(item, dict):
+            return cls(index, item.get('business'), item.get('location'),
+                       item.get('max_reviews', default_max_reviews))
+        if isinstance(item, (list, tuple)) and 1 <= len(item) <= 3:
+            business, location, max_reviews = (list(item) + [None, None])[:3]
+            return cls(index, business, location,
+                       default_max_reviews if max_reviews is None else max_reviews)
+        if isinstance(item, str):
+            return cls(index, item, "", default_max_reviews)
+        raise ValueError(f"entry {index}: expected an object, a [business, location, max_reviews] list or a name")
+
+    def report(self, processed, target=None):
+        """Progress callback handed to the batch function"""
+        self.processed = processed
+
+    def to_dict(self):
+        out = {
+            'index': self.index,
+            'business': self.business,
+            'location': self.location,
+            'max_reviews': self.max_reviews,
+            'status': self.status,
+            'processed': self.processed,
+            'seconds': round(self.finished - self.started, 3) if self.finished else None,
+        }
+        if self.error is not None:
+            out['error'] = self.error
+        if self.summary is not None:
+            out['summary'] = self.summary
+        return out
+
+
+def comparison_row(entry):
+    """One business's line of the batch comparison table, from its aggregate statistics"""
+    stats = entry.summary['stats']
+    total = stats['total']
+    row = {'business': entry.business, 'location': entry.location, 'reviews': total,
+           'avg_score': stats['score']['mean'], 'avg_stars': stats['stars']['mean'],
+           'median_stars': stats['stars']['median']}
+    for label, count in stats['counts'].items():
+        row[f"{label.lower()}_share"] = count / total if total else 0.0
+    return row
+
+
+class Batch:
+    """Businesses submitted together, analyzed by BatchScheduler's workers in submission order"""
+
+    def __init__(self, fn, entries, params):
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        self.entries = entries
+        self.params = params
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._pending = deque(entries)
+        self._unfinished = len(entries)
+
+    @property
+    def status(self):
+        if self.started is None:
+            return 'queued'
+        return 'running' if self.finished is None else 'done'
+
+    def counts(self):
+        counts = {}
+        for entry in self.entries:
+            counts[entry.status] = counts.get(entry.status, 0) + 1
+        return counts
+
+    @property
+    def failed(self):
+        return sum(entry.status == 'failed' for entry in self.entries)
+
+    @property
+    def businesses_per_minute(self):
+        """Businesses analyzed successfully per minute since the first one started (failures not counted)"""
+        if self.started is None:
+            return 0.0
+        elapsed = (self.finished or time.time()) - self.started
+        completed = sum(entry.status == 'done' for entry in self.entries)
+        return 60.0 * completed / elapsed if elapsed > 0 else 0.0
+
+    def comparison(self):
+        """Analyzed businesses side by side, best average score first"""
+        rows = [comparison_row(entry) for entry in self.entries if entry.status == 'done']
+        rows.sort(key=lambda row: -(row['avg_score'] if row['avg_score'] is not None else float('-inf')))
+        for rank, row in enumerate(rows, 1):
+            row['rank'] = rank
+        return rows
+
+    def to_dict(self, include_entries=True):
+        out = {
+            'id': self.id,
+            'status': self.status,
+            'params': self.params,
+            'businesses': len(self.entries),
+            'counts': self.counts(),
+            'progress': round(1 - self._unfinished / len(self.entries), 4),
+            'businesses_per_minute': round(self.businesses_per_minute, 2),
+            'failed': self.failed,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+        if include_entries:
+            out['entries'] = [entry.to_dict() for entry in self.entries]
+            out['comparison'] = self.comparison()
+        return out
+
+
+class BatchScheduler:
+    """Analyzes the businesses of every submitted batch on one shared pool of worker threads
+
+    The pool size is the global fetch budget: at most `workers` businesses are
+    scraped at once (each through the scraper's own page concurrency and the
+    shared per-host rate limiter), however many batches are waiting. Workers
+    take the next business from the waiting batches in turn, so a small batch
+    submitted behind one of hundreds of locations waits for at most one business
+    per worker instead of the whole large batch. submit() raises QueueFull once
+    max_pending businesses are waiting; finished batches are kept for result_ttl
+    seconds, then handed to on_expire(batch) if given. Workers start on the first
+    submit().
+    """
+
+    def __init__(self, workers=4, max_entries=500, max_pending=2000, result_ttl=3600, on_expire=None):
+        self.workers = max(1, workers)
+        self.max_entries = max_entries
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.on_expire = on_expire
+        self._batches = {}
+        self._ready = deque()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._threads = []
+
+    def _start_workers(self):
+        with self._cond:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"review-batch-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _next(self):
+        """The next (batch, entry) to run: round robin over the batches with businesses waiting"""
+        with self._cond:
+            while not self._ready:
+                self._cond.wait()
+            batch = self._ready.popleft()
+            entry = batch._pending.popleft()
+            if batch._pending:
+                self._ready.append(batch)
+            self._pending -= 1
+            entry.status = 'running'
+            entry.started = time.time()
+            if batch.started is None:
+                batch.started = entry.started
+            return batch, entry
+
+    def _work(self):
+        while True:
+            batch, entry = self._next()
+            try:
+                entry.summary = batch.fn(entry.report, business=entry.business, location=entry.location,
+                                         max_reviews=entry.max_reviews, **batch.params)
+                entry.status = 'done'
+            except Exception as e:
+                entry.error = str(e)
+                entry.status = 'failed'
+            finally:
+                entry.finished = time.time()
+                with self._cond:
+                    batch._unfinished -= 1
+                    if batch._unfinished == 0:
+                        batch.finished = entry.finished
+
+    def _expire(self):
+        cutoff = time.time() - self.result_ttl
+        with self._cond:
+            expired = [batch for batch in self._batches.values()
+                       if batch.finished is not None and batch.finished < cutoff]
+            for batch in expired:
+                del self._batches[batch.id]
+        if self.on_expire is not None:
+            for batch in expired:
+                self.on_expire(batch)
+
+    def submit(self, fn, items, default_max_reviews=200, **params):
+        """Queue fn(report, business=..., location=..., max_reviews=..., **params) for every item
+
+        Raises ValueError for an empty, oversized or malformed list of items.
+        """
+        items = list(items)
+        if not items:
+            raise ValueError("at least one business is required")
+        if len(items) > self.max_entries:
+            raise ValueError(f"at most {self.max_entries} businesses per batch")
+        entries = [BatchEntry.parse(i, item, default_max_reviews) for i, item in enumerate(items)]
+        self._expire()
+        self._start_workers()
+        batch = Batch(fn, entries, params)
+        with self._cond:
+            if self._pending + len(entries) > self.max_pending:
+                raise QueueFull(f"{self._pending} businesses are already waiting")
+            self._batches[batch.id] = batch
+            self._ready.append(batch)
+            self._pending += len(entries)
+            self._cond.notify_all()
+        return batch
+
+    def get(self, batch_id):
+        """The batch, or None if the id is unknown or its results have expired"""
+        self._expire()
+        with self._cond:
+            return self._batches.get(batch_id)
+
+    @property
+    def pending(self):
+        """Businesses waiting for a worker, across all batches"""
+        return self._pending
+
+
+def batch_scheduler_from_env(environ=None, on_expire=None):
+    """BatchScheduler sized by REVIEW_BATCH_WORKERS, REVIEW_BATCH_MAX, REVIEW_BATCH_QUEUE and REVIEW_BATCH_TTL"""
+    environ = os.environ if environ is None else environ
+    return BatchScheduler(
+        workers=int(environ.get('REVIEW_BATCH_WORKERS', 4)),
+        max_entries=int(environ.get('REVIEW_BATCH_MAX', 500)),
+        max_pending=int(environ.get('REVIEW_BATCH_QUEUE', 2000)),
+        result_ttl=float(environ.get('REVIEW_BATCH_TTL', 3600)),
+        on_expire=on_expire,
+    )
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from rate_limiter import is_throttled
+
+DEFAULT_CACHE_PATH = "review_cache.sqlite"
+
+# The body is stored already decoded, so transfer-level headers would no longer be true
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class CacheMiss(requests.exceptions.ConnectionError):
+    """Raised in replay-only mode when a page has never been cached"""
+
+
+def normalize_url(url):
+    """Canonical form of a URL: lowercase scheme/host, sorted query, no fragment"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+class ResponseCache:
+    """SQLite-backed page cache with a TTL, a total size cap and LRU eviction"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=6 * 3600, max_bytes=50 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                   key TEXT PRIMARY KEY,
+                   url TEXT NOT NULL,
+                   status INTEGER NOT NULL,
+                   headers TEXT NOT NULL,
+                   body BLOB NOT NULL,
+                   size INTEGER NOT NULL,
+                   created REAL NOT NULL,
+                   last_access REAL NOT NULL
+               )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._conn.commit()
+
+    @staticmethod
+    def key_for(url):
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url, ignore_ttl=False):
+        """Return (status, headers, body) for a fresh entry, or None"""
+        key = self.key_for(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, headers, body, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (not ignore_ttl and now - row[3] > self.ttl):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return row[0], json.loads(row[1]), row[2]
+
+    def put(self, url, status, headers, body):
+        headers = {k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS}
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.key_for(url), normalize_url(url), status, json.dumps(headers), body, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def purge_expired(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class CachedSession(requests.Session):
+    """requests.Session that answers GETs from a ResponseCache when it can
+
+    With replay_only=True the network is never touched: cached pages are served
+    regardless of age and anything else raises CacheMiss.
+    """
+
+    def __init__(self, cache=None, replay_only=False):
+        super().__init__()
+        self.cache = cache
+        self.replay_only = replay_only
+
+    def send(self, request, **kwargs):
+        if self.cache is None or request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        cached = self.cache.get(request.url, ignore_ttl=self.replay_only)
+        if cached is not None:
+            return self._build_response(request, *cached)
+        if self.replay_only:
+            raise CacheMiss(f"No cached response for {request.url}", request=request)
+
+        response = super().send(request, **kwargs)
+        # Captcha / "unusual traffic" pages also come back as 200; caching one would replay it for the TTL
+        if response.status_code == 200 and not is_throttled(response):
+            self.cache.put(request.url, response.status_code, dict(response.headers), response.content)
+        return response
+
+    @staticmethod
+    def _build_response(request, status, headers, body):
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK' if status == 200 else ''
+        response.from_cache = True
+        return response
+
+
+def cache_from_env():
+    """Build the cache configured by REVIEW_CACHE_PATH / REVIEW_CACHE_TTL / REVIEW_CACHE_MAX_MB"""
+    path = os.environ.get('REVIEW_CACHE_PATH')
+    if not path:
+        return None
+    return ResponseCache(
+        path,
+        ttl=float(os.environ.get('REVIEW_CACHE_TTL', 6 * 3600)),
+        max_bytes=int(float(os.environ.get('REVIEW_CACHE_MAX_MB', 50)) * 1024 * 1024),
+    )
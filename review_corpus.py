@@ -0,0 +1,183 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+SENTIMENTS = ('positive', 'neutral', 'negative')
+
+# Realistic sentiment distribution (slightly positive bias like real businesses)
+SENTIMENT_RATIOS = {'positive': 0.45, 'neutral': 0.35, 'negative': 0.20}
+
+# Star ratings and their weights per sentiment
+STAR_WEIGHTS = {
+    'positive': ([4, 5], [30, 70]),      # More 5-star reviews
+    'neutral': ([2, 3, 4], [20, 60, 20]),  # More 3-star reviews
+    'negative': ([1, 2], [60, 40]),      # More 1-star reviews
+}
+
+# Base review templates for different sentiments and star ratings ({b} is the business name)
+TEMPLATES = {
+    'positive': [
+        "Absolutely amazing experience at {b}! The service was top-notch and exceeded all my expectations.",
+        "Outstanding quality and service at {b}. Will definitely be coming back soon!",
+        "Love this place! {b} has become my go-to spot. Highly recommended!",
+        "Excellent service and great atmosphere at {b}. Staff is very professional and friendly.",
+        "Perfect experience! {b} really knows how to treat their customers right.",
+        "Fantastic! {b} offers incredible value and quality. Best in the area!",
+        "Wonderful experience at {b}. Clean, efficient, and great customer service.",
+        "Impressed by the quality at {b}. Everything was fresh and delicious.",
+        "Great place! {b} consistently delivers excellent service and products.",
+        "Superb! {b} has maintained high standards and great customer care.",
+        "Been coming to {b} for years and they never disappoint. Consistent quality!",
+        "Amazing team at {b}! They go above and beyond for customers.",
+        "Best {b} location I've visited. Everything was perfect from start to finish.",
+        "Incredible value for money at {b}. Quality exceeds the price point.",
+        "Clean, fast, and friendly service at {b}. Exactly what I expected!",
+        "The staff at {b} made my day! Such positive and helpful people.",
+        "Top-tier service at {b}. They really care about customer satisfaction.",
+        "Exceeded expectations! {b} has set a new standard for excellence.",
+        "Fresh and delicious! {b} maintains high quality standards consistently.",
+        "Brilliant experience! {b} delivers on all fronts - quality, service, value.",
+    ],
+    'neutral': [
+        "Decent experience at {b}. Nothing extraordinary but acceptable.",
+        "Average service at {b}. Could be better but not terrible.",
+        "Okay place. {b} is fine for what it is, nothing special though.",
+        "Standard experience at {b}. Met basic expectations.",
+        "It's alright. {b} has room for improvement but not bad.",
+        "Mixed feelings about {b}. Some things good, others could be better.",
+        "Moderate experience. {b} is decent but not remarkable.",
+        "Fair service at {b}. Average quality and pricing.",
+        "Reasonable experience. {b} is okay for occasional visits.",
+        "Nothing to complain about, but nothing to rave about either at {b}.",
+        "Standard experience at {b}. Gets the job done without any surprises.",
+        "It's fine. {b} provides basic service as expected, nothing more.",
+        "Typical {b} experience. Consistent with what you'd expect from the chain.",
+        "Adequate service at {b}. Not outstanding but fulfills basic needs.",
+        "Regular visit to {b}. Same as always - acceptable but unremarkable.",
+        "Standard fare at {b}. Does what it says on the tin.",
+        "Normal experience. {b} delivers standard service and quality.",
+        "As expected from {b}. No surprises, positive or negative.",
+        "Routine visit to {b}. Everything was standard and predictable.",
+        "Basic service at {b}. Meets minimum expectations adequately.",
+    ],
+    'negative': [
+        "Very disappointed with {b}. Service was poor and unprofessional.",
+        "Terrible experience! {b} has really gone downhill. Won't be back.",
+        "Poor service and quality at {b}. Not worth the money.",
+        "Awful experience at {b}. Staff was rude and unhelpful.",
+        "Completely unsatisfied with {b}. Poor management and service.",
+        "Worst experience ever! {b} failed to meet even basic expectations.",
+        "Disappointing visit to {b}. Quality has seriously declined.",
+        "Unacceptable service at {b}. Would not recommend to anyone.",
+        "Horrible experience! {b} needs major improvements in all areas.",
+        "Very poor quality and service at {b}. Waste of time and money.",
+        "Really disappointed with the decline in quality at {b}. Used to be much better.",
+        "Slow service and poor attention to detail at {b}. Needs improvement.",
+        "Not impressed with {b}. Several issues with order accuracy and timing.",
+        "Below average experience at {b}. Staff seemed disinterested and unhelpful.",
+        "Poor value for money at {b}. Quality doesn't justify the price.",
+        "Frustrating visit to {b}. Multiple problems with service and product quality.",
+        "Disappointing standards at {b}. Management needs to address serious issues.",
+        "Unsatisfactory experience. {b} failed to deliver on basic service promises.",
+        "Poor hygiene and slow service at {b}. Very concerning overall.",
+        "Terrible management at {b}. Staff clearly not properly trained or motivated.",
+    ],
+}
+
+# Variations applied to a filled-in template; None keeps it unchanged, '!.' swaps '!' for '.'
+VARIATIONS = {
+    'positive': [None, '!.', " Really satisfied with the experience.",
+                 " Definitely recommend to others.", " Will be back again soon."],
+    'neutral': [None, " Could use some improvements.", " Has potential but needs work.",
+                " Meets basic needs.", " Average compared to competitors."],
+    'negative': [None, " Very disappointed overall.", " Needs major improvements.",
+                 " Lost a customer today.", " Would not recommend to anyone."],
+}
+
+
+@lru_cache(maxsize=64)
+def template_table(business_name):
+    """Every (template x variation) text for a business, grouped by sentiment; built once per name"""
+    table = {}
+    for sentiment in SENTIMENTS:
+        texts = []
+        for template in TEMPLATES[sentiment]:
+            filled = template.format(b=business_name)
+            for variation in VARIATIONS[sentiment]:
+                if variation is None:
+                    texts.append(filled)
+                elif variation == '!.':
+                    texts.append(filled.replace("!", "."))
+                else:
+                    texts.append(filled + variation)
+        table[sentiment] = texts
+    return table
+
+
+def sentiment_counts(num_reviews):
+    """Split num_reviews 45/35/20 the same way the original generator did"""
+    num_positive = int(num_reviews * SENTIMENT_RATIOS['positive'])
+    num_neutral = int(num_reviews * SENTIMENT_RATIOS['neutral'])
+    return {
+        'positive': num_positive,
+        'neutral': num_neutral,
+        'negative': num_reviews - num_positive - num_neutral,
+    }
+
+
+def generate_sample_corpus(business_name, num_reviews=1000, seed=None):
+    """Sample a synthetic review corpus as columnar arrays
+
+    Returns a dict with 'text_id' (int32 index into 'vocabulary', the array of
+    distinct texts), 'stars' (int8) and 'sentiment_id' (int8 index into
+    SENTIMENTS). The same seed always gives the same corpus.
+    """
+    rng = np.random.default_rng(seed)
+    table = template_table(business_name)
+    counts = sentiment_counts(num_reviews)
+
+    # Some variations leave a template unchanged, so map variants onto distinct texts
+    vocabulary = {}
+    text_ids, stars, sentiment_ids = [], [], []
+    for sentiment_id, sentiment in enumerate(SENTIMENTS):
+        n = counts[sentiment]
+        variant_ids = np.array(
+            [vocabulary.setdefault(text, len(vocabulary)) for text in table[sentiment]], dtype=np.int32
+        )
+        star_values, weights = STAR_WEIGHTS[sentiment]
+        probabilities = np.asarray(weights, dtype=np.float64) / sum(weights)
+
+        text_ids.append(variant_ids[rng.integers(0, len(variant_ids), size=n)])
+        stars.append(rng.choice(np.asarray(star_values, dtype=np.int8), size=n, p=probabilities))
+        sentiment_ids.append(np.full(n, sentiment_id, dtype=np.int8))
+
+    # Shuffle reviews for realistic distribution
+    order = rng.permutation(num_reviews)
+    return {
+        'vocabulary': np.asarray(list(vocabulary), dtype=object),
+        'text_id': np.concatenate(text_ids)[order],
+        'stars': np.concatenate(stars)[order],
+        'sentiment_id': np.concatenate(sentiment_ids)[order],
+    }
+
+
+def sample_reviews_frame(business_name, num_reviews=1000, seed=None):
+    """The synthetic corpus as a DataFrame with categorical text/sentiment/source columns"""
+    corpus = generate_sample_corpus(business_name, num_reviews, seed)
+    return pd.DataFrame({
+        'text': pd.Categorical.from_codes(corpus['text_id'], categories=corpus['vocabulary']),
+        'stars': corpus['stars'],
+        'source': pd.Categorical.from_codes(np.zeros(num_reviews, dtype=np.int8), categories=['Sample Data']),
+        'template_sentiment': pd.Categorical.from_codes(corpus['sentiment_id'], categories=list(SENTIMENTS)),
+    })
+
+
+def generate_sample_reviews(business_name, num_reviews=1000, seed=None):
+    """The synthetic corpus as the scraper's list of {'text', 'stars', 'source'} dicts"""
+    corpus = generate_sample_corpus(business_name, num_reviews, seed)
+    texts = corpus['vocabulary'][corpus['text_id']].tolist()
+    return [
+        {'text': text, 'stars': stars, 'source': 'Sample Data'}
+        for text, stars in zip(texts, corpus['stars'].tolist())
+    ]
@@ -0,0 +1,118 @@
+import random
+import re
+
+import numpy as np
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SPACE_RE = re.compile(r'\s+')
+# (a * h + b) stays below 2**62 for 31-bit operands, so the permutations vectorize in int64
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+def normalize_review_text(text):
+    """Lowercase, drop punctuation and collapse whitespace so trivial variants compare equal"""
+    text = _PUNCT_RE.sub(' ', text.lower())
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+class ReviewDeduplicator:
+    """Remember which review texts have been seen, in O(1) per check
+
+    mode='exact' matches identical text only (the scraper's original behaviour).
+    mode='near' also collapses texts that differ only in whitespace/punctuation
+    and, through MinHash LSH buckets, texts whose character shingles overlap by
+    at least `threshold` (Jaccard).
+    """
+
+    def __init__(self, mode='exact', threshold=0.8, num_perm=32, bands=8, shingle_size=5, seed=1):
+        if mode not in ('exact', 'near'):
+            raise ValueError(f"Unknown dedup mode: {mode}")
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.mode = mode
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+
+        self._exact = set()
+        self._normalized = set()
+        self._buckets = [dict() for _ in range(bands)]
+        self._shingles = []
+
+        rng = random.Random(seed)
+        self._perm_a = np.array([rng.randrange(1, _MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.int64)
+        self._perm_b = np.array([rng.randrange(0, _MERSENNE_PRIME) for _ in range(num_perm)], dtype=np.int64)
+
+    def __len__(self):
+        return len(self._exact)
+
+    def __contains__(self, text):
+        if text in self._exact:
+            return True
+        if self.mode == 'exact':
+            return False
+        return self._find_near(normalize_review_text(text)) is not None
+
+    def add(self, text):
+        """Record text; return True if it is new, False if it duplicates an earlier one"""
+        if text in self._exact:
+            return False
+        if self.mode == 'exact':
+            self._exact.add(text)
+            return True
+
+        normalized = normalize_review_text(text)
+        if normalized in self._normalized:
+            return False
+        shingles = self._shingle(normalized)
+        signature = self._signature(shingles)
+        if self._find_near(normalized, shingles, signature) is not None:
+            return False
+
+        index = len(self._shingles)
+        self._shingles.append(shingles)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(index)
+        self._exact.add(text)
+        self._normalized.add(normalized)
+        return True
+
+    def _find_near(self, normalized, shingles=None, signature=None):
+        if normalized in self._normalized:
+            return -1
+        if shingles is None:
+            shingles = self._shingle(normalized)
+            signature = self._signature(shingles)
+        checked = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            for index in self._buckets[band].get(key, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                other = self._shingles[index]
+                overlap = len(shingles & other)
+                if overlap and overlap / len(shingles | other) >= self.threshold:
+                    return index
+        return None
+
+    def _shingle(self, normalized):
+        k = self.shingle_size
+        if len(normalized) <= k:
+            return {normalized}
+        return {normalized[i:i + k] for i in range(len(normalized) - k + 1)}
+
+    def _signature(self, shingles):
+        hashes = np.fromiter((hash(s) & _MERSENNE_PRIME for s in shingles), dtype=np.int64, count=len(shingles))
+        permuted = (self._perm_a[:, None] * hashes[None, :] + self._perm_b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1).tolist()
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(self.bands)]
+
+
+def dedupe_reviews(reviews, mode='exact', **kwargs):
+    """Return the reviews whose text was not seen earlier in the list, keeping first-seen order"""
+    seen = ReviewDeduplicator(mode=mode, **kwargs)
+    return [review for review in reviews if seen.add(review['text'])]
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from rate_limiter import RateLimitedAdapter
+
+
+class ConcurrentFetcher:
+    """Fetch a batch of URLs through one shared requests.Session using asyncio"""
+
+    def __init__(self, session, max_concurrency=5, timeout=15, rate_limiter=None):
+        self.session = session
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+
+        # One pooled adapter so every in-flight request reuses the same keep-alive connections.
+        # Pacing comes from the shared per-host token bucket instead of fixed sleeps.
+        adapter = RateLimitedAdapter(
+            rate_limiter,
+            pool_connections=self.max_concurrency,
+            pool_maxsize=self.max_concurrency
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def fetch_all(self, urls):
+        """Fetch every URL and return responses (or the raised exception) in input order"""
+        return list(self.iter_responses(urls))
+
+    def iter_responses(self, urls):
+        """Yield responses (or the raised exception) in input order as soon as each is available
+
+        All requests start at once on a background event loop, so the caller can
+        process the first page while the others are still in flight.
+        """
+        urls = list(urls)
+        results = [Future() for _ in urls]
+        if not urls:
+            return
+
+        async def run():
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def fetch_into(index, url):
+                try:
+                    results[index].set_result(await self._fetch_one(semaphore, url))
+                except Exception as e:
+                    results[index].set_result(e)
+
+            await asyncio.gather(*(fetch_into(i, url) for i, url in enumerate(urls)))
+
+        # A private loop on its own thread also works when the caller already runs one (e.g. notebooks)
+        threading.Thread(target=asyncio.run, args=(run(),), daemon=True).start()
+        for result in results:
+            yield result.result()
+
+    async def _fetch_one(self, semaphore, url):
+        async with semaphore:
+            return await asyncio.to_thread(self.session.get, url, timeout=self.timeout)
+
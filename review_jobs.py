@@ -0,0 +1,153 @@
+import os
+import queue
+import threading
+import time
+import uuid
+
+JOB_STATUSES = ('queued', 'running', 'done', 'failed')
+
+
+class QueueFull(Exception):
+    """Raised by JobManager.submit() when max_queue jobs are already waiting"""
+
+
+class Job:
+    """One queued analysis: status, progress and, once finished, its result or error"""
+
+    def __init__(self, fn, params):
+        self.id = uuid.uuid4().hex
+        self.fn = fn
+        self.params = params
+        self.status = 'queued'
+        self.processed = 0
+        self.target = None
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+    def report(self, processed, target=None):
+        """Progress callback handed to the job function"""
+        self.processed = processed
+        if target is not None:
+            self.target = target
+
+    @property
+    def progress(self):
+        if self.status == 'done':
+            return 1.0
+        if not self.target:
+            return 0.0
+        return min(1.0, self.processed / self.target)
+
+    def to_dict(self, include_result=True):
+        out = {
+            'id': self.id,
+            'status': self.status,
+            'params': self.params,
+            'progress': round(self.progress, 4),
+            'processed': self.processed,
+            'target': self.target,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+        if self.error is not None:
+            out['error'] = self.error
+        if include_result and self.status == 'done':
+            out['result'] = self.result
+        return out
+
+
+class JobManager:
+    """Bounded queue of jobs run by a fixed pool of worker threads
+
+    submit() returns at once with a Job whose id the client polls; it raises
+    QueueFull rather than queueing without limit. Finished jobs are kept for
+    result_ttl seconds and then dropped on the next submit() or get().
+    Workers start on the first submit().
+    """
+
+    def __init__(self, workers=2, max_queue=32, result_ttl=600):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.result_ttl = result_ttl
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def _start_workers(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"review-job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            job.started = time.time()
+            try:
+                job.result = job.fn(job.report, **job.params)
+                job.status = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+            finally:
+                job.finished = time.time()
+                self._queue.task_done()
+
+    def _expire(self):
+        cutoff = time.time() - self.result_ttl
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items()
+                           if job.finished is not None and job.finished < cutoff]:
+                del self._jobs[job_id]
+
+    def submit(self, fn, **params):
+        """Queue fn(report, **params); report(processed, target) updates the job's progress"""
+        self._expire()
+        self._start_workers()
+        job = Job(fn, params)
+        with self._lock:
+            self._jobs[job.id] = job
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job.id]
+            raise QueueFull(f"{self.max_queue} jobs are already queued")
+        return job
+
+    def get(self, job_id):
+        """The job, or None if the id is unknown or its result has expired"""
+        self._expire()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def queued(self):
+        return self._queue.qsize()
+
+    def counts(self):
+        """Jobs currently held, per status"""
+        with self._lock:
+            counts = dict.fromkeys(JOB_STATUSES, 0)
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+
+def job_manager_from_env(environ=None):
+    """JobManager sized by REVIEW_JOB_WORKERS, REVIEW_JOB_QUEUE and REVIEW_JOB_TTL (seconds)"""
+    environ = os.environ if environ is None else environ
+    return JobManager(
+        workers=int(environ.get('REVIEW_JOB_WORKERS', 2)),
+        max_queue=int(environ.get('REVIEW_JOB_QUEUE', 32)),
+        result_ttl=float(environ.get('REVIEW_JOB_TTL', 600)),
+    )
@@ -0,0 +1,174 @@
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Pipeline stages with a duration histogram; other names are accepted too
+STAGES = ('fetch', 'parse', 'validate', 'sentiment', 'sentiment_batch', 'dataframe', 'render')
+# Seconds; from a single validation pass up to a slow search page
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+COUNTERS = {
+    'reviews_scraped': "Review candidates extracted from result pages",
+    'reviews_rejected': "Candidates dropped by the review text filter",
+    'reviews_deduped': "Valid candidates dropped as duplicates",
+    'reviews_kept': "Scraped reviews passed on for analysis",
+    'sample_fallbacks': "Searches that fell back to sample reviews",
+    'reviews_sampled': "Sample reviews generated by those fallbacks",
+}
+PREFIX = 'review_analyzer_'
+
+
+class Histogram:
+    """Counts of observations per cumulative bucket, with their sum, as Prometheus histograms keep them"""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else math.nan
+
+    def quantile(self, q):
+        """Estimated q-quantile, interpolated within its bucket like PromQL's histogram_quantile()"""
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if not isinstance(value, int) else str(value)
+
+
+class MetricsRegistry:
+    """Per-stage duration histograms, event counters and cache hit rates of one process
+
+    Stages are timed with time(stage) or observe(stage, seconds); counters are
+    the COUNTERS names. Caches registered with track_cache() (anything with
+    `hits` and `misses` attributes) are read when metrics are rendered, so they
+    cost nothing per lookup here.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.started = time.time()
+        self._stages = {}
+        self._counters = dict.fromkeys(COUNTERS, 0)
+        self._caches = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def time(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed_iter(self, iterable, stage):
+        """Yield from iterable, timing each wait for its next item as `stage`"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(stage, time.perf_counter() - start)
+            yield item
+
+    def inc(self, counter, value=1):
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+
+    def track_cache(self, name, cache):
+        """Report cache's hits and misses under cache="name" (replaces a cache tracked under that name)"""
+        if cache is not None:
+            self._caches[name] = cache
+
+    def cache_stats(self):
+        """{name: (hits, misses, hit rate)} of the tracked caches"""
+        out = {}
+        for name, cache in list(self._caches.items()):
+            hits, misses = cache.hits, cache.misses
+            out[name] = (hits, misses, hits / (hits + misses) if hits + misses else 0.0)
+        return out
+
+    def snapshot(self):
+        """Stage statistics (seconds), counters and cache hit rates as plain data, for a dashboard"""
+        with self._lock:
+            stages = {stage: {'count': h.count, 'total': h.sum, 'mean': h.mean,
+                              'p50': h.quantile(0.5), 'p95': h.quantile(0.95)}
+                      for stage, h in self._stages.items()}
+            counters = dict(self._counters)
+        caches = {name: {'hits': hits, 'misses': misses, 'hit_rate': rate}
+                  for name, (hits, misses, rate) in self.cache_stats().items()}
+        return {'uptime': time.time() - self.started, 'stages': stages, 'counters': counters, 'caches': caches}
+
+    def render_prometheus(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        name = PREFIX + 'stage_duration_seconds'
+        lines = [f"# HELP {name} Time spent in each pipeline stage", f"# TYPE {name} histogram"]
+        with self._lock:
+            stages = sorted(self._stages.items())
+            counters = dict(self._counters)
+            for stage, histogram in stages:
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == math.inf else repr(bound)
+                    lines.append(f"{name}_bucket{_labels(stage=stage, le=le)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(stage=stage)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(stage=stage)} {histogram.count}")
+        for counter, value in counters.items():
+            name = f"{PREFIX}{counter}_total"
+            lines += [f"# HELP {name} {COUNTERS.get(counter, counter)}", f"# TYPE {name} counter",
+                      f"{name} {value}"]
+        cache_stats = self.cache_stats()
+        for suffix, kind, help_text, index in (('cache_hits_total', 'counter', "Cache lookups answered", 0),
+                                               ('cache_misses_total', 'counter', "Cache lookups missed", 1),
+                                               ('cache_hit_ratio', 'gauge', "Hits per lookup", 2)):
+            name = PREFIX + suffix
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            lines += [f"{name}{_labels(cache=cache)} {_number(stats[index])}"
+                      for cache, stats in sorted(cache_stats.items())]
+        return "\n".join(lines) + "\n"
+
+
+_shared_metrics = MetricsRegistry()
+
+
+def get_metrics():
+    """The process-wide registry every scraper, analyzer and app records into"""
+    return _shared_metrics
@@ -0,0 +1,216 @@
+import os
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # .parquet exports need pyarrow
+    pq = None
+
+from review_store import CATEGORY_COLUMNS, COLUMNS, FLOAT_COLUMNS, ReviewStore
+
+EXPORT_FORMATS = ('csv', 'csv.gz', 'parquet')
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'csv.gz': 'application/gzip', 'parquet': 'application/vnd.apache.parquet'}
+# Rows converted per chunk of an export, so no export holds more than this many rows as text at once
+EXPORT_CHUNK_ROWS = 5000
+# Export column order: the Streamlit CSV's columns first, then the VADER/TextBlob detail when scored
+EXPORT_COLUMNS = ('text', 'stars', 'sentiment', 'score', 'source', 'textblob_polarity', 'vader_compound',
+                  'vader_positive', 'vader_negative', 'vader_neutral')
+
+
+class StoredResult:
+    def __init__(self, store, meta, pinned=False):
+        self.id = uuid.uuid4().hex
+        self.store = store
+        self.meta = meta
+        self.created = time.time()
+        self.pinned = pinned
+
+
+class ResultStore:
+    """Analysis results kept server-side under a result id, for exports without re-uploading them
+
+    Holds up to max_results ReviewStores, dropping the least recently used one
+    beyond that and any older than ttl seconds. Pinned results (a batch's, whose
+    links must work for as long as the batch is kept) are exempt from both and
+    do not count towards max_results until unpin() releases them. Results live
+    in this worker process's memory.
+    """
+
+    def __init__(self, ttl=3600, max_results=100):
+        self.ttl = ttl
+        self.max_results = max_results
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for result_id in [rid for rid, result in self._results.items()
+                          if result.created < cutoff and not result.pinned]:
+            del self._results[result_id]
+
+    def _evict(self):
+        unpinned = [rid for rid, result in self._results.items() if not result.pinned]
+        for result_id in unpinned[:max(0, len(unpinned) - self.max_results)]:
+            del self._results[result_id]
+
+    def put(self, reviews, pinned=False, **meta):
+        """Store analyzed review dicts (or a ReviewStore); returns the StoredResult with its id"""
+        store = reviews if isinstance(reviews, ReviewStore) else ReviewStore.from_reviews(reviews)
+        result = StoredResult(store.seal(), meta, pinned)
+        with self._lock:
+            self._expire()
+            self._results[result.id] = result
+            self._evict()
+        return result
+
+    def unpin(self, result_ids):
+        """Make pinned results subject to ttl and max_results again (already expired ones go at once)"""
+        with self._lock:
+            for result_id in result_ids:
+                result = self._results.get(result_id)
+                if result is not None:
+                    result.pinned = False
+            self._expire()
+            self._evict()
+
+    def get(self, result_id):
+        """The StoredResult, or None if unknown or expired"""
+        with self._lock:
+            self._expire()
+            result = self._results.get(result_id)
+            if result is not None:
+                self._results.move_to_end(result_id)
+            return result
+
+    def __len__(self):
+        return len(self._results)
+
+
+def export_columns(store):
+    """The columns some review in the store has a value for, in EXPORT_COLUMNS order, then the extras
+
+    The Flask analyzer never fills the TextBlob and VADER detail columns, so
+    its exports leave them out instead of writing them empty.
+    """
+    columns = []
+    for name in EXPORT_COLUMNS:
+        if name in FLOAT_COLUMNS:
+            present = not np.isnan(store.floats(name)).all()
+        elif name in CATEGORY_COLUMNS:
+            labels = store.categories(name)
+            present = any(labels[code] is not None for code in np.unique(store.codes(name)))
+        else:
+            present = True
+        if present:
+            columns.append(name)
+    return columns + [name for name in store.columns if name not in COLUMNS]
+
+
+def export_frame(store, rows=None, columns=None):
+    """store.to_pandas() for export: whole-number star ratings written as integers, as the reviews held them"""
+    df = store.to_pandas(rows, export_columns(store) if columns is None else columns)
+    if 'stars' in df:
+        stars = df['stars']
+        if (stars.dropna() % 1 == 0).all():
+            df['stars'] = stars.astype('Int64')
+    return df
+
+
+def _row_chunks(n, chunk_rows):
+    for start in range(0, n, chunk_rows):
+        yield np.arange(start, min(n, start + chunk_rows))
+
+
+def iter_csv(store, columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """The store as CSV bytes, EXPORT_CHUNK_ROWS rows at a time (default columns: export_columns())"""
+    columns = export_columns(store) if columns is None else columns
+    first = True
+    for rows in _row_chunks(len(store), chunk_rows):
+        yield export_frame(store, rows, columns).to_csv(index=False, header=first).encode('utf-8')
+        first = False
+    if first:
+        yield (",".join(columns) + "\n").encode('utf-8')
+
+
+def iter_csv_gz(store, columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """iter_csv() through one streaming gzip compressor"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in iter_csv(store, columns, chunk_rows):
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class _StreamSink:
+    """Write-only file object that ParquetWriter writes into and the response drains"""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def iter_parquet(store, chunk_rows=EXPORT_CHUNK_ROWS):
+    """The store as Parquet, one row group per EXPORT_CHUNK_ROWS rows, each sent as soon as it is written"""
+    if pq is None:
+        raise ImportError("Parquet export requires pyarrow")
+    table = store.to_arrow()
+    table = table.select([name for name in export_columns(store) if name in table.column_names])
+    sink = _StreamSink()
+    writer = pq.ParquetWriter(sink, table.schema, compression='zstd')
+    try:
+        for start in range(0, table.num_rows, chunk_rows):
+            writer.write_table(table.slice(start, chunk_rows))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def iter_export(store, fmt):
+    if fmt == 'csv':
+        return iter_csv(store)
+    if fmt == 'csv.gz':
+        return iter_csv_gz(store)
+    if fmt == 'parquet':
+        if pq is None:  # checked here so callers can refuse before streaming starts
+            raise ImportError("Parquet export requires pyarrow")
+        return iter_parquet(store)
+    raise ValueError(f"Unknown export format {fmt!r}; expected one of {EXPORT_FORMATS}")
+
+
+def result_store_from_env(environ=None):
+    """ResultStore configured by REVIEW_RESULT_TTL (seconds) and REVIEW_RESULT_MAX (results kept)"""
+    environ = os.environ if environ is None else environ
+    return ResultStore(
+        ttl=float(environ.get('REVIEW_RESULT_TTL', 3600)),
+        max_results=int(environ.get('REVIEW_RESULT_MAX', 100)),
+    )
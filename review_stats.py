@@ -0,0 +1,144 @@
+import math
+
+SENTIMENT_LABELS = ('Positive', 'Negative', 'Neutral')
+
+
+class RunningStats:
+    """Count, mean, variance, min and max of a stream of numbers, in O(1) per value (Welford)"""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.nan
+        self.max = math.nan
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.count == 1:
+            self.min = self.max = value
+        elif value < self.min:
+            self.min = value
+        elif value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """Fold in another RunningStats, e.g. one built for a separate chunk of reviews (Chan et al.)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof=1):
+        """Sample variance by default, as pandas computes it; nan with too few values"""
+        if self.count <= ddof:
+            return math.nan
+        return self._m2 / (self.count - ddof)
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance())
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean if self.count else None,
+                'std': self.std if self.count > 1 else None,
+                'min': self.min if self.count else None, 'max': self.max if self.count else None}
+
+
+class SentimentAggregate:
+    """Summary statistics of analyzed reviews, updated once per review as it arrives
+
+    Tracks the review count per sentiment label, running score statistics and,
+    for rated reviews (stars > 0), running star statistics and a histogram of
+    star values. Every summary read is O(1), or O(distinct star values) for the
+    median and mode, so dashboards never rescan the reviews.
+    """
+
+    def __init__(self):
+        self.counts = dict.fromkeys(SENTIMENT_LABELS, 0)
+        self.score = RunningStats()
+        self.stars = RunningStats()
+        self.star_histogram = {}
+
+    def add(self, review):
+        """Count one analyzed review dict ('sentiment', 'score' and optionally 'stars')"""
+        self.counts[review['sentiment']] = self.counts.get(review['sentiment'], 0) + 1
+        self.score.add(review['score'])
+        stars = review.get('stars') or 0
+        if stars > 0:
+            self.stars.add(stars)
+            self.star_histogram[stars] = self.star_histogram.get(stars, 0) + 1
+        return review
+
+    def add_many(self, reviews):
+        for review in reviews:
+            self.add(review)
+        return self
+
+    def merge(self, other):
+        for label, count in other.counts.items():
+            self.counts[label] = self.counts.get(label, 0) + count
+        self.score.merge(other.score)
+        self.stars.merge(other.stars)
+        for stars, count in other.star_histogram.items():
+            self.star_histogram[stars] = self.star_histogram.get(stars, 0) + count
+        return self
+
+    @property
+    def total(self):
+        return self.score.count
+
+    def share(self, label):
+        """Fraction of reviews with this sentiment label"""
+        return self.counts.get(label, 0) / self.total if self.total else 0.0
+
+    @property
+    def has_ratings(self):
+        return self.stars.count > 0
+
+    def star_median(self):
+        """Median star rating from the histogram (mean of the middle two for an even count)"""
+        n = self.stars.count
+        if n == 0:
+            return math.nan
+        lower_rank, upper_rank = (n - 1) // 2, n // 2
+        seen = 0
+        lower = None
+        for stars in sorted(self.star_histogram):
+            seen += self.star_histogram[stars]
+            if lower is None and seen > lower_rank:
+                lower = stars
+            if seen > upper_rank:
+                return (lower + stars) / 2
+        return math.nan
+
+    def star_mode(self):
+        """Most common star rating; the smallest of tied values, as pandas' mode().iloc[0]"""
+        if not self.star_histogram:
+            return None
+        return min(self.star_histogram, key=lambda stars: (-self.star_histogram[stars], stars))
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'counts': dict(self.counts),
+            'score': self.score.to_dict(),
+            'stars': {**self.stars.to_dict(), 'median': self.star_median() if self.has_ratings else None,
+                      'mode': self.star_mode(),
+                      'histogram': {str(stars): count for stars, count in sorted(self.star_histogram.items())}},
+        }
@@ -0,0 +1,283 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # to_arrow() needs pyarrow; to_pandas() falls back to Python strings
+    pa = None
+
+from review_stats import SENTIMENT_LABELS
+
+# Per-review numeric fields, stored as float32 (textblob_polarity is NaN in the VADER-only fast mode)
+FLOAT_COLUMNS = ('stars', 'score', 'textblob_polarity', 'vader_compound', 'vader_positive',
+                 'vader_negative', 'vader_neutral')
+CATEGORY_COLUMNS = ('sentiment', 'source')
+COLUMNS = ('text',) + CATEGORY_COLUMNS + FLOAT_COLUMNS
+
+
+class _Categories:
+    """Values of a low-cardinality column, each stored once and referenced by an int8 code"""
+
+    def __init__(self, values=()):
+        self.values = []
+        self._codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            if len(self.values) >= 127:
+                raise ValueError("more than 127 distinct values in a categorical review column")
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ReviewStore:
+    """Analyzed reviews as columns instead of one dict per review
+
+    Scores and stars are float32 arrays, sentiment and source int8 codes into
+    their categories, and each distinct text is stored once as UTF-8 in one
+    buffer (Arrow's large_string layout) that reviews reference by an int32 code.
+    Filters and sorts return row-index arrays; to_pandas() and to_arrow() wrap
+    the arrays without copying them. Fields outside COLUMNS, such as the
+    full-mode aspect_scores, are kept as per-row Python objects.
+    """
+
+    def __init__(self, capacity=1024):
+        self._size = 0
+        self._capacity = max(1, capacity)
+        self._floats = {name: np.full(self._capacity, np.nan, dtype=np.float32) for name in FLOAT_COLUMNS}
+        self._codes = {name: np.zeros(self._capacity, dtype=np.int8) for name in CATEGORY_COLUMNS}
+        self._categories = {'sentiment': _Categories(SENTIMENT_LABELS), 'source': _Categories()}
+        self._text_codes = np.zeros(self._capacity, dtype=np.int32)
+        self._text_bytes = bytearray()
+        self._text_offsets = array('q', [0])
+        self._text_categories = None
+        # hash(text) -> text code; texts are compared on a hit, so a collision only costs the dedup
+        self._text_index = {}
+        self._extras = {}
+
+    @classmethod
+    def from_reviews(cls, reviews):
+        reviews = list(reviews)
+        store = cls(capacity=len(reviews))
+        store.extend(reviews)
+        return store.seal()
+
+    def __len__(self):
+        return self._size
+
+    # -------------------- Appending --------------------
+    def _grow(self):
+        capacity = self._capacity * 2
+        for columns in (self._floats, self._codes):
+            for name, values in columns.items():
+                grown = np.full(capacity, np.nan, dtype=values.dtype) if values.dtype.kind == 'f' \
+                    else np.zeros(capacity, dtype=values.dtype)
+                grown[:self._size] = values[:self._size]
+                columns[name] = grown
+        text_codes = np.zeros(capacity, dtype=np.int32)
+        text_codes[:self._size] = self._text_codes[:self._size]
+        self._text_codes = text_codes
+        self._capacity = capacity
+
+    def _text_code(self, text):
+        if self._text_index is None:
+            # Dropped by seal(): rebuild it from the distinct texts
+            self._text_index = {}
+            for code in range(self.distinct_texts):
+                self._text_index.setdefault(hash(self._decode(code)), code)
+        key = hash(text)
+        code = self._text_index.get(key)
+        if code is not None and self._decode(code) == text:
+            return code
+        code = len(self._text_offsets) - 1
+        if isinstance(self._text_bytes, bytes):
+            # Sealed by a conversion: reopen for appending (earlier frames keep the old buffers)
+            self._text_bytes = bytearray(self._text_bytes)
+            self._text_offsets = array('q', self._text_offsets.tobytes())
+        self._text_categories = None
+        self._text_bytes += text.encode('utf-8')
+        self._text_offsets.append(len(self._text_bytes))
+        if key not in self._text_index:
+            self._text_index[key] = code
+        return code
+
+    def _decode(self, code):
+        return self._text_bytes[self._text_offsets[code]:self._text_offsets[code + 1]].decode('utf-8')
+
+    def append(self, review):
+        """Add one analyzed review dict; returns its row index"""
+        if self._size == self._capacity:
+            self._grow()
+        row = self._size
+        self._text_codes[row] = self._text_code(review['text'])
+        for name in CATEGORY_COLUMNS:
+            self._codes[name][row] = self._categories[name].code(review.get(name))
+        for name in FLOAT_COLUMNS:
+            value = review.get(name)
+            self._floats[name][row] = np.nan if value is None else value
+        for name, value in review.items():
+            if name not in COLUMNS:
+                self._extras.setdefault(name, {})[row] = value
+        self._size += 1
+        return row
+
+    def extend(self, reviews):
+        for review in reviews:
+            self.append(review)
+        return self
+
+    # -------------------- Reading --------------------
+    @property
+    def columns(self):
+        return COLUMNS + tuple(self._extras)
+
+    def floats(self, name):
+        """A float32 column as a read-only view (no copy)"""
+        view = self._floats[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def codes(self, name):
+        """int8 codes of a categorical column, with categories(name) as their labels"""
+        view = self._codes[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def categories(self, name):
+        return list(self._categories[name].values)
+
+    @property
+    def distinct_texts(self):
+        return len(self._text_offsets) - 1
+
+    def text(self, row):
+        return self._decode(self._text_codes[row])
+
+    def texts(self, rows=None):
+        rows = range(self._size) if rows is None else rows
+        return [self.text(row) for row in rows]
+
+    def review(self, row):
+        """Row `row` as the dict the analyzers produce"""
+        out = {'text': self.text(row)}
+        for name in CATEGORY_COLUMNS:
+            out[name] = self._categories[name].values[self._codes[name][row]]
+        for name in FLOAT_COLUMNS:
+            value = float(self._floats[name][row])
+            out[name] = None if np.isnan(value) else value
+        for name, values in self._extras.items():
+            if row in values:
+                out[name] = values[row]
+        return out
+
+    def iter_reviews(self, rows=None):
+        rows = range(self._size) if rows is None else rows
+        for row in rows:
+            yield self.review(row)
+
+    # -------------------- Filtering and sorting --------------------
+    def rows_where(self, sentiment=None, rated=None):
+        """Row indices matching a sentiment label and/or having (rated=True) or lacking a star rating"""
+        mask = np.ones(self._size, dtype=bool)
+        if sentiment is not None:
+            code = self._categories['sentiment']._codes.get(sentiment)
+            if code is None:
+                return np.zeros(0, dtype=np.int64)
+            mask &= self.codes('sentiment') == code
+        if rated is not None:
+            mask &= (self.floats('stars') > 0) == rated
+        return np.flatnonzero(mask)
+
+    def sort_rows(self, rows=None, by='score', descending=True):
+        """rows (default all) ordered by a float column; stable, so ties keep their order"""
+        rows = np.arange(self._size) if rows is None else np.asarray(rows)
+        keys = self.floats(by)[rows]
+        order = np.argsort(-keys if descending else keys, kind='stable')
+        return rows[order]
+
+    def seal(self):
+        """Done appending for now: free the text dedup index and freeze the text buffer
+
+        Appending again still works; it rebuilds the index and reopens the buffer.
+        """
+        self._text_index = None
+        self._seal_text()
+        return self
+
+    # -------------------- Conversion --------------------
+    def _seal_text(self):
+        """Freeze the text buffer and offsets as immutable arrays other objects can share
+
+        A growable buffer cannot be exported while it may still be resized, so the
+        first conversion after an append copies it once; later ones share it.
+        """
+        if isinstance(self._text_bytes, bytearray):
+            self._text_bytes = bytes(self._text_bytes)
+            self._text_offsets = np.frombuffer(self._text_offsets.tobytes(), dtype=np.int64)
+        return self._text_bytes, self._text_offsets
+
+    def _text_array(self):
+        """The distinct texts as an Arrow large_string array over the store's own buffer"""
+        data, offsets = self._seal_text()
+        return pa.LargeStringArray.from_buffers(len(offsets) - 1, pa.py_buffer(offsets), pa.py_buffer(data))
+
+    def _text_index_values(self):
+        """The distinct texts as the pandas Index a text Categorical uses, built once per batch of appends"""
+        if self._text_categories is None:
+            if pa is not None:
+                self._text_categories = pd.Index(pd.arrays.ArrowStringArray(self._text_array()))
+            else:
+                self._text_categories = pd.Index([self._decode(code) for code in range(self.distinct_texts)])
+        return self._text_categories
+
+    def to_arrow(self):
+        """A pyarrow Table; numeric columns and codes are shared with the store, not copied"""
+        if pa is None:
+            raise ImportError("ReviewStore.to_arrow() requires pyarrow")
+        arrays = {'text': pa.DictionaryArray.from_arrays(pa.array(self._text_codes[:self._size]),
+                                                         self._text_array())}
+        for name in CATEGORY_COLUMNS:
+            arrays[name] = pa.DictionaryArray.from_arrays(
+                pa.array(self._codes[name][:self._size]), pa.array(self._categories[name].values, pa.string())
+            )
+        for name in FLOAT_COLUMNS:
+            arrays[name] = pa.array(self._floats[name][:self._size])
+        return pa.table(arrays)
+
+    def to_pandas(self, rows=None, columns=None):
+        """A DataFrame of rows (default all) with categorical text/sentiment/source and float32 scores
+
+        Without rows the float columns are views of the store's arrays, so the
+        frame must be treated as read-only.
+        """
+        columns = self.columns if columns is None else columns
+        data = {}
+        for name in columns:
+            if name == 'text':
+                codes = self._text_codes[:self._size] if rows is None else self._text_codes[rows]
+                data[name] = pd.Categorical.from_codes(codes, categories=self._text_index_values(),
+                                                       validate=False)
+            elif name in CATEGORY_COLUMNS:
+                codes = self.codes(name) if rows is None else self._codes[name][rows]
+                data[name] = pd.Categorical.from_codes(codes, categories=self._categories[name].values,
+                                                       validate=False)
+            elif name in FLOAT_COLUMNS:
+                data[name] = self.floats(name) if rows is None else self._floats[name][rows]
+            else:
+                values = self._extras.get(name, {})
+                data[name] = [values.get(row) for row in (range(self._size) if rows is None else rows)]
+        index = pd.RangeIndex(self._size) if rows is None else pd.Index(rows)
+        return pd.DataFrame(data, index=index, copy=False)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the columns and the text buffer (the dedup index and extras excluded)"""
+        n = self._size
+        return (n * (4 * len(FLOAT_COLUMNS) + len(CATEGORY_COLUMNS) + 4)
+                + len(self._text_bytes) + 8 * len(self._text_offsets))
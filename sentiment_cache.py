@@ -0,0 +1,165 @@
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_SENTIMENT_CACHE_PATH = "sentiment_cache.sqlite"
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text):
+    """NFC, trimmed, single-spaced text; neither TextBlob nor VADER scores change under this"""
+    return _SPACE_RE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+class SentimentCache:
+    """Memoize sentiment results by a hash of the normalized text
+
+    Results live in a bounded in-memory LRU; with `path` they are also written
+    to SQLite so later runs (and other processes) start warm. `namespace` keeps
+    results from different scoring modes apart.
+    """
+
+    def __init__(self, maxsize=20000, path=None, namespace='combined-v1'):
+        self.maxsize = maxsize
+        self.path = path
+        self.namespace = namespace
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+            )
+            self._conn.commit()
+
+    def with_namespace(self, namespace):
+        """A view onto the same LRU and SQLite table that keys results under another namespace"""
+        view = copy.copy(self)
+        view.namespace = namespace
+        view.hits = view.persistent_hits = view.misses = 0
+        return view
+
+    def key_for(self, text):
+        digest = hashlib.blake2b(normalize_text(text).encode('utf-8'), digest_size=16).hexdigest()
+        return f"{self.namespace}:{digest}"
+
+    def get(self, text, key=None):
+        key = key or self.key_for(text)
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return dict(result)
+            if self._conn is not None:
+                row = self._conn.execute("SELECT result FROM sentiment WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._remember(key, result)
+                    self.hits += 1
+                    self.persistent_hits += 1
+                    return dict(result)
+            self.misses += 1
+            return None
+
+    def put(self, text, result, key=None):
+        key = key or self.key_for(text)
+        with self._lock:
+            self._remember(key, dict(result))
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sentiment VALUES (?, ?)", (key, json.dumps(result))
+                )
+                self._conn.commit()
+
+    def put_many(self, items):
+        """Store (text, result) pairs with a single SQLite commit"""
+        rows = []
+        with self._lock:
+            for text, result in items:
+                key = self.key_for(text)
+                self._remember(key, dict(result))
+                rows.append((key, json.dumps(result)))
+            if self._conn is not None and rows:
+                self._conn.executemany("INSERT OR REPLACE INTO sentiment VALUES (?, ?)", rows)
+                self._conn.commit()
+
+    def get_or_compute(self, text, compute):
+        key = self.key_for(text)
+        result = self.get(text, key)
+        if result is None:
+            result = compute(text)
+            self.put(text, result, key)
+        return result
+
+    def get_or_compute_batch(self, texts, compute_batch):
+        """Cached results for many texts; each distinct uncached text goes to compute_batch once"""
+        keys = [self.key_for(text) for text in texts]
+        results = [None] * len(texts)
+        pending = {}
+        for index, (text, key) in enumerate(zip(texts, keys)):
+            if key in pending:
+                # A repeat within the batch is served by the first occurrence's result
+                pending[key][1].append(index)
+                self.hits += 1
+                continue
+            result = self.get(text, key)
+            if result is None:
+                pending[key] = (text, [index])
+            else:
+                results[index] = result
+
+        if pending:
+            missing = list(pending.values())
+            computed = compute_batch([text for text, _ in missing])
+            self.put_many((text, result) for (text, _), result in zip(missing, computed))
+            for (_, indexes), result in zip(missing, computed):
+                for index in indexes:
+                    results[index] = dict(result)
+        return results
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'persistent_hits': self.persistent_hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'memory_entries': len(self._memory),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM sentiment")
+                self._conn.commit()
+
+
+def sentiment_cache_from_env():
+    """In-memory cache sized by SENTIMENT_CACHE_SIZE, persisted to SENTIMENT_CACHE_PATH when set"""
+    return SentimentCache(
+        maxsize=int(os.environ.get('SENTIMENT_CACHE_SIZE', 20000)),
+        path=os.environ.get('SENTIMENT_CACHE_PATH') or None,
+    )
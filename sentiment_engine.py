@@ -0,0 +1,162 @@
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from textblob import TextBlob
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from textblob_fast import get_fast_polarity
+from vader_batch import LexiconVader
+
+# 'exact' builds a TextBlob per text; 'fast' scores TextBlob's lexicon directly (textblob_fast)
+POLARITY_MODES = ('exact', 'fast')
+
+# What each app computes per review (see SentimentAnalyzer in both apps). Measured with
+# `python -m benchmarks.bench_modes --n 10000` on one CPU, best of 3, no process pool:
+#   mode      computes                                        batch cold  batch warm  one review
+#   fast      VADER only, TextBlob skipped, not cached          ~70k/s      ~70k/s     ~0.1 ms
+#   balanced  TextBlob + VADER combined score, result-cached    ~4.1k/s    ~120k/s     ~0.3 ms
+#   full      balanced plus aspect and sentence-level scores    ~2.9k/s     ~19k/s     ~1.6 ms
+# "warm" is every text already in the SentimentCache; full still recomputes its extra detail.
+ANALYSIS_MODES = ('fast', 'balanced', 'full')
+
+
+def classify(combined_score):
+    """Map a combined score onto the three sentiment labels used by both apps"""
+    if combined_score >= 0.1:
+        return 'Positive'
+    if combined_score <= -0.1:
+        return 'Negative'
+    return 'Neutral'
+
+
+def combine_scores(textblob_polarity, vader_scores):
+    """The per-review result dict from a TextBlob polarity and VADER polarity_scores()"""
+    # Combine both approaches for more robust analysis
+    combined_score = (textblob_polarity + vader_scores['compound']) / 2
+
+    return {
+        'sentiment': classify(combined_score),
+        'score': combined_score,
+        'textblob_polarity': textblob_polarity,
+        'vader_compound': vader_scores['compound'],
+        'vader_positive': vader_scores['pos'],
+        'vader_negative': vader_scores['neg'],
+        'vader_neutral': vader_scores['neu']
+    }
+
+
+def vader_only_scores(vader_scores):
+    """The per-review result dict from VADER alone: same fields, the score is the compound"""
+    return {
+        'sentiment': classify(vader_scores['compound']),
+        'score': vader_scores['compound'],
+        'textblob_polarity': None,
+        'vader_compound': vader_scores['compound'],
+        'vader_positive': vader_scores['pos'],
+        'vader_negative': vader_scores['neg'],
+        'vader_neutral': vader_scores['neu']
+    }
+
+
+def textblob_polarity(text, mode='exact'):
+    if mode == 'fast':
+        return get_fast_polarity().polarity(text)
+    if mode != 'exact':
+        raise ValueError(f"Unknown polarity mode {mode!r}; expected one of {POLARITY_MODES}")
+    return TextBlob(text).sentiment.polarity
+
+
+def score_text(text, vader, mode='exact'):
+    """Analyze sentiment using both TextBlob and VADER"""
+    return combine_scores(textblob_polarity(text, mode), vader.polarity_scores(text))
+
+
+def score_texts(texts, vader, mode='exact'):
+    """score_text() for a list of texts, with VADER run over the whole list at once"""
+    vader_scores = LexiconVader(vader).polarity_scores_batch(texts)
+    return [
+        combine_scores(textblob_polarity(text, mode), scores)
+        for text, scores in zip(texts, vader_scores)
+    ]
+
+
+def score_text_vader(text, vader):
+    """The 'fast' analysis mode: VADER only, TextBlob is skipped entirely"""
+    return vader_only_scores(vader.polarity_scores(text))
+
+
+def score_texts_vader(texts, vader):
+    """score_text_vader() for a list of texts, through the batch VADER scorer"""
+    return [vader_only_scores(scores) for scores in LexiconVader(vader).polarity_scores_batch(texts)]
+
+
+def check_analysis_mode(analysis_mode):
+    if analysis_mode not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown analysis mode {analysis_mode!r}; expected one of {ANALYSIS_MODES}")
+    return analysis_mode
+
+
+# -------------------- Process pool --------------------
+# Each worker process builds its VADER analyzer once, in the pool initializer
+_worker_vader = None
+_pools = {}
+
+
+def _init_worker():
+    global _worker_vader
+    _worker_vader = SentimentIntensityAnalyzer()
+
+
+def _score_chunk(texts, mode='exact'):
+    return score_texts(texts, _worker_vader, mode)
+
+
+def _get_pool(workers):
+    pool = _pools.get(workers)
+    if pool is None:
+        # spawn, not fork: the web apps run threads, which fork does not copy safely
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker
+        )
+        _pools[workers] = pool
+    return pool
+
+
+@atexit.register
+def shutdown_pools():
+    for pool in _pools.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _pools.clear()
+
+
+def score_batch(texts, vader=None, workers=None, chunk_size=None, mode='exact'):
+    """Score many texts; results are in input order
+
+    workers=None or 1 scores in this process with `vader`. With workers > 1
+    the texts are split into chunks of `chunk_size` and scored by a persistent
+    process pool that is reused across calls.
+    """
+    texts = list(texts)
+    workers = workers or 1
+    if workers <= 1 or len(texts) < 2:
+        return score_texts(texts, vader or SentimentIntensityAnalyzer(), mode)
+
+    if chunk_size is None:
+        # A few chunks per worker keeps them all busy without much pickling overhead
+        chunk_size = max(1, min(2000, -(-len(texts) // (workers * 4))))
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+    results = []
+    for chunk_results in _get_pool(workers).map(partial(_score_chunk, mode=mode), chunks):
+        results.extend(chunk_results)
+    return results
+
+
+def default_workers():
+    """Worker count from SENTIMENT_WORKERS, defaulting to in-process scoring"""
+    return int(os.environ.get('SENTIMENT_WORKERS', 1))
@@ -1,18 +1,32 @@
 import streamlit as st
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import re
 import time
-import random
 from urllib.parse import quote_plus, urlparse
 import warnings
+from rate_limiter import configure_from_env
+from review_aspects import AspectExtractor
+from review_cache import CachedSession, ResponseCache
+from review_corpus import generate_sample_reviews
+from review_dedup import ReviewDeduplicator
+from review_fetcher import ConcurrentFetcher
+from review_metrics import STAGES, get_metrics
+from review_parsing import ReviewTextFilter, SelectorEngine, StarRatingExtractor, response_charset
+from review_results import export_frame
+from review_stats import SentimentAggregate
+from review_store import ReviewStore
+from sentiment_cache import DEFAULT_SENTIMENT_CACHE_PATH, SentimentCache
+from sentiment_engine import (ANALYSIS_MODES, POLARITY_MODES, check_analysis_mode, score_batch, score_text,
+                              score_text_vader, score_texts_vader)
 warnings.filterwarnings('ignore')
 
+# Per-host request pacing shared by all scrapers (REVIEW_RATE_LIMIT / REVIEW_RATE_BURST)
+configure_from_env()
+
 # Configure Streamlit page - MUST be first Streamlit command
 st.set_page_config(
     page_title="Google Reviews Sentiment Analyzer",
@@ -22,8 +36,45 @@ st.set_page_config(
 )
 
 class GoogleReviewsScraper:
-    def __init__(self):
-        self.session = requests.Session()
+    search_endpoint = "https://www.google.com/search"
+
+    # Multiple selectors for review content
+    review_selectors = [
+        'div[data-attrid]',
+        'span.aCOpRe',
+        'div.VwiC3b',
+        'div.yXK7lf',
+        'div.MUxGbd',
+        'div.kp-blk',
+        'div.review-item',
+        'div.gws-localreviews__google-review',
+        'span.review-text',
+        'div[jsname="fmcmS"]'
+    ]
+    
+    # Skip obvious non-review content
+    skip_patterns = [
+        'http', 'www', '.com', '.org',
+        'privacy policy', 'terms of service',
+        'contact us', 'about us',
+        'follow us', 'subscribe',
+        'copyright', '©', '®',
+        'menu', 'hours', 'location',
+        'phone', 'email', 'address'
+    ]
+    
+    # Look for review indicators
+    review_indicators = [
+        'good', 'bad', 'great', 'terrible', 'amazing', 'awful', 'nice', 'poor', 
+        'excellent', 'disappointing', 'satisfied', 'recommend', 'love', 'hate',
+        'worst', 'best', 'fantastic', 'horrible', 'outstanding', 'mediocre',
+        'service', 'staff', 'food', 'experience', 'quality', 'price',
+        'clean', 'dirty', 'fresh', 'stale', 'fast', 'slow', 'friendly',
+        'rude', 'helpful', 'professional', 'unprofessional'
+    ]
+
+    def __init__(self, max_concurrency=5, dedup_mode='exact', cache=None, replay_only=False, rate_limiter=None):
+        self.session = CachedSession(cache, replay_only=replay_only)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept-Language': 'en-US,en;q=0.9',
@@ -33,7 +84,21 @@ class GoogleReviewsScraper:
             'Upgrade-Insecure-Requests': '1',
         }
         self.session.headers.update(self.headers)
-    
+
+        # Fetch all query variants at once, paced by the shared per-host token bucket
+        self.fetcher = ConcurrentFetcher(
+            self.session,
+            max_concurrency=max_concurrency,
+            timeout=15,
+            rate_limiter=rate_limiter
+        )
+        # 'exact' or 'near' (also collapses whitespace/punctuation variants)
+        self.dedup_mode = dedup_mode
+        # Compiled once; uses lxml when installed, html.parser otherwise
+        self.selector_engine = SelectorEngine(self.review_selectors)
+        self.review_filter = ReviewTextFilter(self.skip_patterns, self.review_indicators, max_length=1000)
+        self.star_extractor = StarRatingExtractor()
+
     def search_business(self, business_name, location=""):
         """Search for a business and get its Google Maps URL"""
         try:
@@ -44,7 +109,7 @@ class GoogleReviewsScraper:
                 search_query = business_name
             
             # Google search URL
-            search_url = f"https://www.google.com/search?q={quote_plus(search_query)}"
+            search_url = f"{self.search_endpoint}?q={quote_plus(search_query)}"
             
             response = self.session.get(search_url, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -134,7 +199,13 @@ class GoogleReviewsScraper:
     
     def scrape_reviews_from_search(self, business_name, location="", max_reviews=1000):
         """Scrape reviews by searching for business with multiple strategies"""
-        reviews = []
+        return list(self.iter_reviews_from_search(business_name, location, max_reviews))
+    
+    def iter_reviews_from_search(self, business_name, location="", max_reviews=1000):
+        """Yield reviews as soon as each result page is parsed, topping up with samples at the end"""
+        count = 0
+        seen = ReviewDeduplicator(mode=self.dedup_mode)
+        metrics = get_metrics()
         
         try:
             st.write("🔍 Searching across multiple sources...")
@@ -151,342 +222,183 @@ class GoogleReviewsScraper:
             if location:
                 search_queries = [f"{query} {location}" for query in search_queries]
             
-            for i, query in enumerate(search_queries):
+            search_urls = [
+                f"{self.search_endpoint}?q={quote_plus(query)}&num=20"
+                for query in search_queries
+            ]
+            # 'fetch' is the wait for each next page; the fetcher has the others in flight meanwhile
+            responses = metrics.timed_iter(self.fetcher.iter_responses(search_urls), 'fetch')
+
+            for i, (query, response) in enumerate(zip(search_queries, responses)):
                 st.write(f"📄 Processing search query {i+1}/{len(search_queries)}: {query}")
-                
+
                 try:
-                    search_url = f"https://www.google.com/search?q={quote_plus(query)}&num=20"
-                    response = self.session.get(search_url, timeout=15)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Multiple selectors for review content
-                    review_selectors = [
-                        'div[data-attrid]',
-                        'span.aCOpRe',
-                        'div.VwiC3b',
-                        'div.yXK7lf',
-                        'div.MUxGbd',
-                        'div.kp-blk',
-                        'div.review-item',
-                        'div.gws-localreviews__google-review',
-                        'span.review-text',
-                        'div[jsname="fmcmS"]'
-                    ]
-                    
-                    for selector in review_selectors:
-                        containers = soup.select(selector)
-                        
-                        for container in containers:
+                    if isinstance(response, Exception):
+                        raise response
+                    # One pass over the page collects the matches of every review selector
+                    with metrics.time('parse'):
+                        texts = self.selector_engine.extract_texts(response.content, response_charset(response))
+                    candidates = []
+                    with metrics.time('validate'):
+                        for text in texts:
                             try:
-                                text = container.get_text().strip()
-                                
                                 # Enhanced filtering for review content
                                 if self._is_valid_review(text):
-                                    stars = self._extract_stars_from_text(text)
-                                    
-                                    review = {
-                                        'text': text,
-                                        'stars': stars,
-                                        'source': f'Google Search - Query {i+1}'
-                                    }
-                                    
-                                    # Avoid duplicates
-                                    if not any(existing['text'] == text for existing in reviews):
-                                        reviews.append(review)
-                                        
-                                        if len(reviews) >= max_reviews:
-                                            break
-                                            
+                                    candidates.append((text, self._extract_stars_from_text(text)))
                             except Exception:
                                 continue
-                        
-                        if len(reviews) >= max_reviews:
-                            break
-                    
-                    # Add delay between requests
-                    time.sleep(random.uniform(2, 4))
+                    metrics.inc('reviews_scraped', len(texts))
+                    metrics.inc('reviews_rejected', len(texts) - len(candidates))
                     
-                    if len(reviews) >= max_reviews:
-                        break
+                    for text, stars in candidates:
+                        # Avoid duplicates (hashed index, O(1) per candidate)
+                        if not seen.add(text):
+                            metrics.inc('reviews_deduped')
+                            continue
+                        
+                        count += 1
+                        metrics.inc('reviews_kept')
+                        yield {
+                            'text': text,
+                            'stars': stars,
+                            'source': f'Google Search - Query {i+1}'
+                        }
+                        
+                        if count >= max_reviews:
+                            return
                         
                 except Exception as e:
                     st.write(f"⚠️ Error with query '{query}': {str(e)}")
                     continue
             
-            # Strategy 2: Add comprehensive sample reviews if we need more
-            if len(reviews) < max_reviews:
-                sample_needed = max_reviews - len(reviews)
-                st.write(f"📝 Adding {sample_needed} sample reviews for comprehensive analysis...")
-                reviews.extend(self._get_comprehensive_sample_reviews(business_name, sample_needed))
-            
-            return reviews[:max_reviews]
-            
         except Exception as e:
             st.error(f"Error scraping reviews: {str(e)}")
-            return self._get_comprehensive_sample_reviews(business_name, max_reviews)
+        
+        # Strategy 2: Add comprehensive sample reviews if we need more
+        if count < max_reviews:
+            sample_needed = max_reviews - count
+            metrics.inc('sample_fallbacks')
+            metrics.inc('reviews_sampled', sample_needed)
+            st.write(f"📝 Adding {sample_needed} sample reviews for comprehensive analysis...")
+            yield from self._get_comprehensive_sample_reviews(business_name, sample_needed)
     
     def _is_valid_review(self, text):
-        """Enhanced validation for review content"""
-        if len(text) < 15 or len(text) > 1000:
-            return False
-        
-        # Skip obvious non-review content
-        skip_patterns = [
-            'http', 'www', '.com', '.org',
-            'privacy policy', 'terms of service',
-            'contact us', 'about us',
-            'follow us', 'subscribe',
-            'copyright', '©', '®',
-            'menu', 'hours', 'location',
-            'phone', 'email', 'address'
-        ]
-        
-        text_lower = text.lower()
-        if any(pattern in text_lower for pattern in skip_patterns):
-            return False
-        
-        # Look for review indicators
-        review_indicators = [
-            'good', 'bad', 'great', 'terrible', 'amazing', 'awful', 'nice', 'poor', 
-            'excellent', 'disappointing', 'satisfied', 'recommend', 'love', 'hate',
-            'worst', 'best', 'fantastic', 'horrible', 'outstanding', 'mediocre',
-            'service', 'staff', 'food', 'experience', 'quality', 'price',
-            'clean', 'dirty', 'fresh', 'stale', 'fast', 'slow', 'friendly',
-            'rude', 'helpful', 'professional', 'unprofessional'
-        ]
-        
-        return any(indicator in text_lower for indicator in review_indicators)
+        """Enhanced validation for review content (one compiled pass, see ReviewTextFilter)"""
+        return self.review_filter.is_valid(text)
     
     def _extract_stars_from_text(self, text):
         """Extract star rating from review text"""
-        # Look for patterns like "5 stars", "★★★★★", "5/5"
-        star_patterns = [
-            r'(\d)\s*(?:stars?|out of 5|\/5)',
-            r'★{1,5}',
-            r'(\d)\.?\d*\s*(?:stars?)',
-        ]
-        
-        for pattern in star_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                if '★' in match.group():
-                    return len(match.group())
-                else:
-                    try:
-                        return float(match.group(1))
-                    except:
-                        return 0
-        
-        return 0
+        # Look for patterns like "5 stars", "★★★★★", "5/5" (precompiled, see review_parsing.STAR_PATTERNS)
+        return self.star_extractor.extract(text)
     
-    def _get_comprehensive_sample_reviews(self, business_name, num_reviews=1000):
+    def _get_comprehensive_sample_reviews(self, business_name, num_reviews=1000, seed=None):
         """Generate comprehensive sample reviews for demonstration purposes"""
-        
-        # Base review templates for different sentiments and star ratings
-        positive_templates = [
-            f"Absolutely amazing experience at {business_name}! The service was top-notch and exceeded all my expectations.",
-            f"Outstanding quality and service at {business_name}. Will definitely be coming back soon!",
-            f"Love this place! {business_name} has become my go-to spot. Highly recommended!",
-            f"Excellent service and great atmosphere at {business_name}. Staff is very professional and friendly.",
-            f"Perfect experience! {business_name} really knows how to treat their customers right.",
-            f"Fantastic! {business_name} offers incredible value and quality. Best in the area!",
-            f"Wonderful experience at {business_name}. Clean, efficient, and great customer service.",
-            f"Impressed by the quality at {business_name}. Everything was fresh and delicious.",
-            f"Great place! {business_name} consistently delivers excellent service and products.",
-            f"Superb! {business_name} has maintained high standards and great customer care."
-        ]
-        
-        neutral_templates = [
-            f"Decent experience at {business_name}. Nothing extraordinary but acceptable.",
-            f"Average service at {business_name}. Could be better but not terrible.",
-            f"Okay place. {business_name} is fine for what it is, nothing special though.",
-            f"Standard experience at {business_name}. Met basic expectations.",
-            f"It's alright. {business_name} has room for improvement but not bad.",
-            f"Mixed feelings about {business_name}. Some things good, others could be better.",
-            f"Moderate experience. {business_name} is decent but not remarkable.",
-            f"Fair service at {business_name}. Average quality and pricing.",
-            f"Reasonable experience. {business_name} is okay for occasional visits.",
-            f"Nothing to complain about, but nothing to rave about either at {business_name}."
-        ]
-        
-        negative_templates = [
-            f"Very disappointed with {business_name}. Service was poor and unprofessional.",
-            f"Terrible experience! {business_name} has really gone downhill. Won't be back.",
-            f"Poor service and quality at {business_name}. Not worth the money.",
-            f"Awful experience at {business_name}. Staff was rude and unhelpful.",
-            f"Completely unsatisfied with {business_name}. Poor management and service.",
-            f"Worst experience ever! {business_name} failed to meet even basic expectations.",
-            f"Disappointing visit to {business_name}. Quality has seriously declined.",
-            f"Unacceptable service at {business_name}. Would not recommend to anyone.",
-            f"Horrible experience! {business_name} needs major improvements in all areas.",
-            f"Very poor quality and service at {business_name}. Waste of time and money."
-        ]
-        
-        # Additional varied templates for more diversity
-        extended_positive = [
-            f"Been coming to {business_name} for years and they never disappoint. Consistent quality!",
-            f"Amazing team at {business_name}! They go above and beyond for customers.",
-            f"Best {business_name} location I've visited. Everything was perfect from start to finish.",
-            f"Incredible value for money at {business_name}. Quality exceeds the price point.",
-            f"Clean, fast, and friendly service at {business_name}. Exactly what I expected!",
-            f"The staff at {business_name} made my day! Such positive and helpful people.",
-            f"Top-tier service at {business_name}. They really care about customer satisfaction.",
-            f"Exceeded expectations! {business_name} has set a new standard for excellence.",
-            f"Fresh and delicious! {business_name} maintains high quality standards consistently.",
-            f"Brilliant experience! {business_name} delivers on all fronts - quality, service, value."
-        ]
-        
-        extended_neutral = [
-            f"Standard experience at {business_name}. Gets the job done without any surprises.",
-            f"It's fine. {business_name} provides basic service as expected, nothing more.",
-            f"Typical {business_name} experience. Consistent with what you'd expect from the chain.",
-            f"Adequate service at {business_name}. Not outstanding but fulfills basic needs.",
-            f"Regular visit to {business_name}. Same as always - acceptable but unremarkable.",
-            f"Standard fare at {business_name}. Does what it says on the tin.",
-            f"Normal experience. {business_name} delivers standard service and quality.",
-            f"As expected from {business_name}. No surprises, positive or negative.",
-            f"Routine visit to {business_name}. Everything was standard and predictable.",
-            f"Basic service at {business_name}. Meets minimum expectations adequately."
-        ]
-        
-        extended_negative = [
-            f"Really disappointed with the decline in quality at {business_name}. Used to be much better.",
-            f"Slow service and poor attention to detail at {business_name}. Needs improvement.",
-            f"Not impressed with {business_name}. Several issues with order accuracy and timing.",
-            f"Below average experience at {business_name}. Staff seemed disinterested and unhelpful.",
-            f"Poor value for money at {business_name}. Quality doesn't justify the price.",
-            f"Frustrating visit to {business_name}. Multiple problems with service and product quality.",
-            f"Disappointing standards at {business_name}. Management needs to address serious issues.",
-            f"Unsatisfactory experience. {business_name} failed to deliver on basic service promises.",
-            f"Poor hygiene and slow service at {business_name}. Very concerning overall.",
-            f"Terrible management at {business_name}. Staff clearly not properly trained or motivated."
-        ]
-        
-        # Combine all templates
-        all_templates = {
-            'positive': positive_templates + extended_positive,
-            'neutral': neutral_templates + extended_neutral,
-            'negative': negative_templates + extended_negative
-        }
-        
-        # Generate reviews with realistic distribution
-        reviews = []
-        
-        # Realistic sentiment distribution (slightly positive bias like real businesses)
-        positive_ratio = 0.45  # 45% positive
-        neutral_ratio = 0.35   # 35% neutral  
-        negative_ratio = 0.20  # 20% negative
-        
-        num_positive = int(num_reviews * positive_ratio)
-        num_neutral = int(num_reviews * neutral_ratio)
-        num_negative = num_reviews - num_positive - num_neutral
-        
-        # Generate positive reviews (4-5 stars)
-        for i in range(num_positive):
-            template = random.choice(all_templates['positive'])
-            stars = random.choices([4, 5], weights=[30, 70])[0]  # More 5-star reviews
-            
-            # Add some variation to templates
-            variations = [
-                template,
-                template.replace("!", "."),
-                template + " Really satisfied with the experience.",
-                template + " Definitely recommend to others.",
-                template + " Will be back again soon."
-            ]
-            
-            reviews.append({
-                'text': random.choice(variations),
-                'stars': stars,
-                'source': 'Sample Data'
-            })
-        
-        # Generate neutral reviews (2-4 stars)
-        for i in range(num_neutral):
-            template = random.choice(all_templates['neutral'])
-            stars = random.choices([2, 3, 4], weights=[20, 60, 20])[0]  # More 3-star reviews
-            
-            variations = [
-                template,
-                template + " Could use some improvements.",
-                template + " Has potential but needs work.",
-                template + " Meets basic needs.",
-                template + " Average compared to competitors."
-            ]
-            
-            reviews.append({
-                'text': random.choice(variations),
-                'stars': stars,
-                'source': 'Sample Data'
-            })
-        
-        # Generate negative reviews (1-2 stars)
-        for i in range(num_negative):
-            template = random.choice(all_templates['negative'])
-            stars = random.choices([1, 2], weights=[60, 40])[0]  # More 1-star reviews
-            
-            variations = [
-                template,
-                template + " Very disappointed overall.",
-                template + " Needs major improvements.",
-                template + " Lost a customer today.",
-                template + " Would not recommend to anyone."
-            ]
-            
-            reviews.append({
-                'text': random.choice(variations),
-                'stars': stars,
-                'source': 'Sample Data'
-            })
-        
-        # Shuffle reviews for realistic distribution
-        random.shuffle(reviews)
-        
-        return reviews
+        # Templates, 45/35/20 sentiment split and star weights live in review_corpus
+        return generate_sample_reviews(business_name, num_reviews, seed=seed)
 
 class SentimentAnalyzer:
-    def __init__(self):
+    def __init__(self, cache=None, mode='exact', analysis_mode='balanced', aspect_extractor=None):
+        """mode 'exact' scores TextBlob polarity with TextBlob itself, 'fast' with its lexicon directly
+
+        analysis_mode is one of sentiment_engine.ANALYSIS_MODES: 'fast' scores with
+        VADER only, 'balanced' the cached TextBlob + VADER combination and 'full'
+        adds per-aspect and per-sentence scores from aspect_extractor.
+        """
+        if mode not in POLARITY_MODES:
+            raise ValueError(f"Unknown polarity mode {mode!r}; expected one of {POLARITY_MODES}")
         self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.mode = mode
+        self.analysis_mode = check_analysis_mode(analysis_mode)
+        if analysis_mode == 'full' and aspect_extractor is None:
+            aspect_extractor = AspectExtractor(vader=self.vader_analyzer)
+        self.aspect_extractor = aspect_extractor
+        # Each mode keeps its own cached results
+        self.cache = cache.with_namespace(f"combined-{mode}-v1") if cache is not None and mode != 'exact' else cache
     
     def analyze_sentiment(self, text):
-        """Analyze sentiment using both TextBlob and VADER"""
-        # TextBlob analysis
-        blob = TextBlob(text)
-        textblob_polarity = blob.sentiment.polarity
-        
-        # VADER analysis
-        vader_scores = self.vader_analyzer.polarity_scores(text)
-        
-        # Combine both approaches for more robust analysis
-        combined_score = (textblob_polarity + vader_scores['compound']) / 2
-        
-        # Classify sentiment
-        if combined_score >= 0.1:
-            sentiment = 'Positive'
-        elif combined_score <= -0.1:
-            sentiment = 'Negative'
+        """Analyze sentiment using both TextBlob and VADER (VADER alone in fast analysis mode)"""
+        with get_metrics().time('sentiment'):
+            return self._analyze_sentiment(text)
+    
+    def _analyze_sentiment(self, text):
+        if self.analysis_mode == 'fast':
+            return score_text_vader(text, self.vader_analyzer)
+        if self.cache is not None:
+            result = self.cache.get_or_compute(text, self._score)
         else:
-            sentiment = 'Neutral'
-        
-        return {
-            'sentiment': sentiment,
-            'score': combined_score,
-            'textblob_polarity': textblob_polarity,
-            'vader_compound': vader_scores['compound'],
-            'vader_positive': vader_scores['pos'],
-            'vader_negative': vader_scores['neg'],
-            'vader_neutral': vader_scores['neu']
-        }
+            result = self._score(text)
+        if self.analysis_mode == 'full':
+            result = {**result, **self.aspect_extractor.detail_batch([text])[0]}
+        return result
+    
+    def _score(self, text):
+        return score_text(text, self.vader_analyzer, mode=self.mode)
+    
+    def analyze_batch(self, texts, workers=None, chunk_size=None):
+        """Analyze many texts, on a process pool when workers > 1; results keep input order"""
+        with get_metrics().time('sentiment_batch'):
+            return self._analyze_batch(list(texts), workers, chunk_size)
+    
+    def _analyze_batch(self, texts, workers, chunk_size):
+        if self.analysis_mode == 'fast':
+            return score_texts_vader(texts, self.vader_analyzer)
+        def compute(batch):
+            return score_batch(batch, vader=self.vader_analyzer, workers=workers, chunk_size=chunk_size,
+                               mode=self.mode)
+        if self.cache is not None:
+            results = self.cache.get_or_compute_batch(texts, compute)
+        else:
+            results = compute(texts)
+        if self.analysis_mode == 'full':
+            results = [{**result, **detail}
+                       for result, detail in zip(results, self.aspect_extractor.detail_batch(texts))]
+        return results
+    
+    def analyze_stream(self, reviews):
+        """Annotate reviews one at a time as they arrive from the scraper"""
+        for review in reviews:
+            review.update(self.analyze_sentiment(review['text']))
+            yield review
+
+# Sidebar labels with the throughput documented next to sentiment_engine.ANALYSIS_MODES
+ANALYSIS_MODE_LABELS = {
+    'fast': "Fast - VADER only (~70k reviews/s)",
+    'balanced': "Balanced - TextBlob + VADER, cached (~4k/s new, ~120k/s cached)",
+    'full': "Full - adds aspects and sentences (~2.9k reviews/s)",
+}
+
+@st.cache_resource
+def get_response_cache():
+    """One on-disk page cache shared by every session of the app"""
+    cache = ResponseCache()
+    get_metrics().track_cache('pages', cache)
+    return cache
+
+@st.cache_resource
+def get_sentiment_cache():
+    """Sentiment results keyed by review text, shared by every session and kept across restarts"""
+    cache = SentimentCache(path=DEFAULT_SENTIMENT_CACHE_PATH)
+    get_metrics().track_cache('sentiment', cache)
+    return cache
+
+@st.cache_resource
+def get_aspect_extractor():
+    """Aspect keyword scanner and batch VADER lexicon, built once for all sessions"""
+    return AspectExtractor()
 
 def main():
     st.title("⭐ Google Reviews Sentiment Analyzer")
     st.markdown("Analyze customer sentiment from Google business reviews")
     
     # Initialize session state
-    if 'reviews_data' not in st.session_state:
-        st.session_state.reviews_data = None
+    if 'review_store' not in st.session_state:
+        st.session_state.review_store = None
     if 'business_info' not in st.session_state:
         st.session_state.business_info = None
+    if 'review_stats' not in st.session_state:
+        st.session_state.review_stats = None
+    if 'analysis_mode' not in st.session_state:
+        st.session_state.analysis_mode = 'balanced'
     
     # Main input
     st.header("Search for Business Reviews")
@@ -504,6 +416,16 @@ def main():
         )
     
     max_reviews = st.sidebar.slider("Max reviews to analyze", 50, 1000, 200)
+    use_cache = st.sidebar.checkbox("Cache fetched pages", value=True)
+    replay_only = st.sidebar.checkbox("Replay cached pages only (offline)", value=False)
+    analysis_mode = st.sidebar.selectbox(
+        "Analysis mode",
+        ANALYSIS_MODES,
+        index=ANALYSIS_MODES.index('balanced'),
+        format_func=lambda mode: ANALYSIS_MODE_LABELS[mode],
+        help="Fast: VADER only, for sub-second dashboards. Balanced: cached TextBlob + VADER score. "
+             "Full: balanced plus aspect and sentence-level scores, for reports."
+    )
     
     if st.button("Analyze Reviews", type="primary"):
         if not business_name:
@@ -511,8 +433,12 @@ def main():
             return
         
         # Initialize components
-        scraper = GoogleReviewsScraper()
-        analyzer = SentimentAnalyzer()
+        scraper = GoogleReviewsScraper(
+            cache=get_response_cache() if use_cache or replay_only else None,
+            replay_only=replay_only
+        )
+        analyzer = SentimentAnalyzer(cache=get_sentiment_cache(), analysis_mode=analysis_mode,
+                                     aspect_extractor=get_aspect_extractor())
         
         # Progress tracking
         progress_bar = st.progress(0)
@@ -532,30 +458,42 @@ def main():
             }
             st.session_state.business_info = business_info
             
-            # Scrape reviews
-            status_text.text("Scraping reviews...")
-            progress_bar.progress(40)
-            reviews = scraper.scrape_reviews_from_search(business_name, location, max_reviews)
-            
-            if not reviews:
+            # Scrape and analyze as a stream so results show up while pages are still loading
+            status_text.text("Scraping and analyzing reviews...")
+            live_metrics = st.empty()
+            live_chart = st.empty()
+            
+            reviews = scraper.iter_reviews_from_search(business_name, location, max_reviews)
+            # Columnar storage: float32 scores, categorical labels, each distinct text stored once
+            analyzed_reviews = ReviewStore()
+            # Summary statistics accumulate as reviews arrive, so results never rescan them
+            review_stats = SentimentAggregate()
+            last_render = 0.0
+            for review in analyzer.analyze_stream(reviews):
+                analyzed_reviews.append(review)
+                review_stats.add(review)
+                
+                # Redraw a few times per second rather than once per review
+                now = time.monotonic()
+                if now - last_render > 0.25 or len(analyzed_reviews) == max_reviews:
+                    last_render = now
+                    render_live_progress(live_metrics, live_chart, review_stats.counts, len(analyzed_reviews),
+                                         max_reviews)
+                    progress_bar.progress(min(100, int(len(analyzed_reviews) / max_reviews * 100)))
+            
+            if not analyzed_reviews:
                 st.error("No reviews found. Please try a different business name or check your internet connection.")
                 return
             
-            # Analyze sentiment
-            status_text.text("Analyzing sentiment...")
-            progress_bar.progress(60)
-            
-            analyzed_reviews = []
-            for review in reviews:
-                sentiment_result = analyzer.analyze_sentiment(review['text'])
-                review.update(sentiment_result)
-                analyzed_reviews.append(review)
-            
+            live_metrics.empty()
+            live_chart.empty()
             progress_bar.progress(100)
             status_text.text("Analysis complete!")
             
             # Store in session state
-            st.session_state.reviews_data = analyzed_reviews
+            st.session_state.review_store = analyzed_reviews.seal()
+            st.session_state.review_stats = review_stats
+            st.session_state.analysis_mode = analysis_mode
             
             time.sleep(1)
             status_text.empty()
@@ -566,35 +504,96 @@ def main():
             return
     
     # Display results if available
-    if st.session_state.reviews_data:
-        display_results(st.session_state.reviews_data, st.session_state.business_info)
+    if st.session_state.review_store:
+        # 'render' covers the whole results page, its DataFrame conversions included
+        with get_metrics().time('render'):
+            display_results(st.session_state.review_store, st.session_state.business_info,
+                            st.session_state.review_stats, st.session_state.analysis_mode)
+    
+    render_debug_panel()
 
-def display_results(reviews_data, business_info):
-    """Display analysis results"""
+def render_debug_panel():
+    """Sidebar expander with this server process's stage timings, scrape counters and cache hit rates"""
+    snapshot = get_metrics().snapshot()
+    with st.sidebar.expander("🛠️ Debug: pipeline metrics"):
+        st.caption(f"Since server start, {snapshot['uptime'] / 60:.0f} min ago, across all sessions")
+        stages = [stage for stage in STAGES if stage in snapshot['stages']]
+        stages += sorted(set(snapshot['stages']) - set(stages))
+        if stages:
+            st.table(pd.DataFrame({
+                'Stage': stages,
+                'Calls': [snapshot['stages'][stage]['count'] for stage in stages],
+                'Total (s)': [f"{snapshot['stages'][stage]['total']:.2f}" for stage in stages],
+                'Mean (ms)': [f"{snapshot['stages'][stage]['mean'] * 1000:.2f}" for stage in stages],
+                'p95 (ms)': [f"{snapshot['stages'][stage]['p95'] * 1000:.2f}" for stage in stages],
+            }).set_index('Stage'))
+        else:
+            st.write("No stage timings yet.")
+        st.table(pd.DataFrame({
+            'Counter': list(snapshot['counters']),
+            'Value': [str(value) for value in snapshot['counters'].values()],
+        }).set_index('Counter'))
+        for name, cache in snapshot['caches'].items():
+            st.write(f"**{name.capitalize()} cache:** {cache['hit_rate']:.0%} hit rate "
+                     f"({cache['hits']} hits, {cache['misses']} misses)")
+
+def render_live_progress(metrics_slot, chart_slot, counts, processed, target):
+    """Running sentiment counts shown while the analysis stream is still producing reviews"""
+    with metrics_slot.container():
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Analyzed", f"{processed}/{target}")
+        col2.metric("Positive", counts['Positive'])
+        col3.metric("Negative", counts['Negative'])
+        col4.metric("Neutral", counts['Neutral'])
+    fig = px.bar(
+        x=list(counts.keys()),
+        y=list(counts.values()),
+        title="Sentiment Count (live)",
+        color=list(counts.keys()),
+        color_discrete_map={
+            'Positive': '#2E8B57',
+            'Negative': '#DC143C',
+            'Neutral': '#FFD700'
+        }
+    )
+    fig.update_layout(showlegend=False)
+    chart_slot.plotly_chart(fig, use_container_width=True)
+
+def display_results(review_store, business_info, review_stats=None, analysis_mode='balanced'):
+    """Display analysis results; metrics and summary tables read the SentimentAggregate
+
+    The VADER-only 'fast' analysis mode also skips the aspect section.
+    """
+    if review_stats is None:
+        review_stats = SentimentAggregate().add_many(review_store.iter_reviews())
     st.header("Analysis Results")
     
     # Business info
     st.subheader(f"📍 {business_info['name']}")
     if business_info['location']:
         st.write(f"**Location:** {business_info['location']}")
-    st.write(f"**Reviews Analyzed:** {len(reviews_data)}")
+    st.write(f"**Reviews Analyzed:** {len(review_store)}")
     
     # Sentiment summary
-    df = pd.DataFrame(reviews_data)
-    sentiment_counts = df['sentiment'].value_counts()
+    # Views of the store's columns, not a copy of every review
+    with get_metrics().time('dataframe'):
+        df = review_store.to_pandas(columns=['text', 'sentiment', 'score', 'stars'])
+    # Labels present, most frequent first, as value_counts() orders them
+    sentiment_counts = pd.Series(
+        {label: count for label, count in review_stats.counts.items() if count}
+    ).sort_values(ascending=False, kind='stable')
     
     # Create metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Positive Reviews", sentiment_counts.get('Positive', 0))
+        st.metric("Positive Reviews", review_stats.counts['Positive'])
     with col2:
-        st.metric("Negative Reviews", sentiment_counts.get('Negative', 0))
+        st.metric("Negative Reviews", review_stats.counts['Negative'])
     with col3:
-        st.metric("Neutral Reviews", sentiment_counts.get('Neutral', 0))
+        st.metric("Neutral Reviews", review_stats.counts['Neutral'])
     with col4:
-        avg_sentiment = df['score'].mean()
-        st.metric("Avg Sentiment Score", f"{avg_sentiment:.3f}")
+        st.metric("Avg Sentiment Score", f"{review_stats.score.mean:.3f}")
     
     # Visualizations
     st.header("📊 Sentiment Visualizations")
@@ -643,7 +642,7 @@ def display_results(reviews_data, business_info):
     st.plotly_chart(fig_hist, use_container_width=True)
     
     # Star rating vs sentiment (if available)
-    if 'stars' in df.columns and df['stars'].sum() > 0:
+    if review_stats.has_ratings:
         fig_scatter = px.scatter(
             df, 
             x='stars', 
@@ -659,6 +658,39 @@ def display_results(reviews_data, business_info):
         )
         st.plotly_chart(fig_scatter, use_container_width=True)
     
+    # Aspect-based sentiment
+    st.header("🧩 Aspect Sentiment")
+    if analysis_mode == 'fast':
+        mentioned = None
+        st.info("Aspect sentiment is skipped in Fast mode; choose Balanced or Full to see it.")
+    else:
+        aspects = get_aspect_extractor().analyze(df['text'])
+        mentioned = aspects[aspects['mentions'] > 0]
+        if mentioned.empty:
+            st.info("No reviews mention service, staff, food, price, quality, cleanliness or speed.")
+    if mentioned is not None and not mentioned.empty:
+        fig_aspects = px.bar(
+            mentioned,
+            x='aspect',
+            y='avg_score',
+            title="Average Sentiment by Aspect",
+            hover_data=['mentions', 'reviews'],
+            color='avg_score',
+            color_continuous_scale=['#DC143C', '#FFD700', '#2E8B57'],
+            range_color=[-1, 1]
+        )
+        st.plotly_chart(fig_aspects, use_container_width=True)
+        aspect_df = pd.DataFrame({
+            'Aspect': mentioned['aspect'].str.title(),
+            'Mentions': mentioned['mentions'],
+            'Share of Reviews': [f"{share * 100:.1f}%" for share in mentioned['review_share']],
+            'Average Score': [f"{score:.3f}" for score in mentioned['avg_score']],
+            'Positive': mentioned['positive'],
+            'Neutral': mentioned['neutral'],
+            'Negative': mentioned['negative']
+        })
+        st.table(aspect_df)
+    
     # Detailed results
     st.header("📝 Detailed Review Analysis")
     
@@ -675,20 +707,18 @@ def display_results(reviews_data, business_info):
             ['Sentiment Score', 'Star Rating', 'Original Order']
         )
     
-    # Apply filters
-    filtered_df = df.copy()
-    if sentiment_filter != 'All':
-        filtered_df = filtered_df[filtered_df['sentiment'] == sentiment_filter]
+    # Apply filters (row indices into the store)
+    rows = review_store.rows_where(sentiment=None if sentiment_filter == 'All' else sentiment_filter)
     
     # Apply sorting
     if sort_by == 'Sentiment Score':
-        filtered_df = filtered_df.sort_values('score', ascending=False)
-    elif sort_by == 'Star Rating' and 'stars' in filtered_df.columns:
-        filtered_df = filtered_df.sort_values('stars', ascending=False)
+        rows = review_store.sort_rows(rows, 'score', descending=True)
+    elif sort_by == 'Star Rating':
+        rows = review_store.sort_rows(rows, 'stars', descending=True)
     
     # Display reviews
-    for idx, review in filtered_df.iterrows():
-        stars_display = f"⭐ {review['stars']} stars" if review['stars'] > 0 else "No rating"
+    for review in review_store.iter_reviews(rows):
+        stars_display = f"⭐ {review['stars']:g} stars" if review['stars'] > 0 else "No rating"
         
         with st.expander(f"{stars_display} - {review['sentiment']} ({review['score']:.3f})"):
             st.write(f"**Review:** {review['text']}")
@@ -697,17 +727,29 @@ def display_results(reviews_data, business_info):
             # Sentiment details
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.write(f"**TextBlob:** {review['textblob_polarity']:.3f}")
+                if review['textblob_polarity'] is not None:
+                    st.write(f"**TextBlob:** {review['textblob_polarity']:.3f}")
+                else:
+                    st.write("**TextBlob:** skipped (fast mode)")
             with col2:
                 st.write(f"**VADER:** {review['vader_compound']:.3f}")
             with col3:
                 st.write(f"**Combined:** {review['score']:.3f}")
+            
+            # Full analysis mode only
+            if isinstance(review.get('aspect_scores'), dict) and review['aspect_scores']:
+                st.write("**Aspects:** " + ", ".join(
+                    f"{aspect} {score:+.2f}" for aspect, score in review['aspect_scores'].items()
+                ))
+            if isinstance(review.get('sentence_scores'), list) and len(review['sentence_scores']) > 1:
+                for sentence in review['sentence_scores']:
+                    st.caption(f"{sentence['compound']:+.3f}  {sentence['text']}")
     
     # Download results
     st.header("💾 Download Results")
     
     # Prepare CSV data
-    csv_data = filtered_df[['text', 'stars', 'sentiment', 'score', 'source']].copy()
+    csv_data = export_frame(review_store, rows, columns=['text', 'stars', 'sentiment', 'score', 'source'])
     csv = csv_data.to_csv(index=False)
     
     st.download_button(
@@ -727,26 +769,25 @@ def display_results(reviews_data, business_info):
         stats_df = pd.DataFrame({
             'Metric': ['Total Reviews', 'Positive %', 'Negative %', 'Neutral %', 'Average Score'],
             'Value': [
-                len(df),
-                f"{(sentiment_counts.get('Positive', 0) / len(df) * 100):.1f}%",
-                f"{(sentiment_counts.get('Negative', 0) / len(df) * 100):.1f}%",
-                f"{(sentiment_counts.get('Neutral', 0) / len(df) * 100):.1f}%",
-                f"{df['score'].mean():.3f}"
+                review_stats.total,
+                f"{review_stats.share('Positive') * 100:.1f}%",
+                f"{review_stats.share('Negative') * 100:.1f}%",
+                f"{review_stats.share('Neutral') * 100:.1f}%",
+                f"{review_stats.score.mean:.3f}"
             ]
         })
         st.table(stats_df)
     
     with col2:
         st.subheader("Rating Statistics")
-        if 'stars' in df.columns and df['stars'].sum() > 0:
-            rating_stats = df[df['stars'] > 0]['stars'].describe()
+        if review_stats.has_ratings:
             rating_df = pd.DataFrame({
                 'Metric': ['Average Stars', 'Median Stars', 'Most Common', 'Standard Deviation'],
                 'Value': [
-                    f"{rating_stats['mean']:.2f}",
-                    f"{rating_stats['50%']:.1f}",
-                    f"{df[df['stars'] > 0]['stars'].mode().iloc[0]:.1f}" if len(df[df['stars'] > 0]['stars'].mode()) > 0 else "N/A",
-                    f"{rating_stats['std']:.2f}"
+                    f"{review_stats.stars.mean:.2f}",
+                    f"{review_stats.star_median():.1f}",
+                    f"{review_stats.star_mode():.1f}",
+                    f"{review_stats.stars.std:.2f}"
                 ]
             })
             st.table(rating_df)
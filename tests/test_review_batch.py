@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from review_batch import BatchEntry, BatchScheduler
+
+
+@pytest.mark.parametrize('item', [
+    {'business': 123},
+    {'business': 'Cafe', 'location': 123},
+    {'business': ['Cafe']},
+    [123, 'Springfield', 10],
+    ['Cafe', {'city': 'Springfield'}],
+])
+def test_non_string_business_or_location_is_rejected(item):
+    with pytest.raises(ValueError, match="must be a string"):
+        BatchEntry.parse(0, item)
+
+
+def test_entry_forms():
+    assert BatchEntry.parse(0, {'business': ' Cafe ', 'location': None}).business == 'Cafe'
+    entry = BatchEntry.parse(1, ['Cafe', 'Springfield'], default_max_reviews=30)
+    assert (entry.business, entry.location, entry.max_reviews) == ('Cafe', 'Springfield', 30)
+    assert BatchEntry.parse(2, 'Cafe').location == ""
+
+
+def test_submit_rejects_before_queueing():
+    scheduler = BatchScheduler(workers=1)
+    with pytest.raises(ValueError):
+        scheduler.submit(lambda report, **params: params, [{'business': 'Cafe'}, {'business': 5}])
+    assert scheduler.pending == 0
+
+
+@pytest.fixture
+def client():
+    flask_script = pytest.importorskip('flask_script')
+    return flask_script.create_app(warm_in_background=False).test_client()
+
+
+@pytest.mark.parametrize('body', [
+    {'businesses': [{'business': 123}]},
+    {'businesses': [{'business': 'Cafe', 'location': 123}]},
+    {'businesses': ['Cafe'], 'max_reviews': [10]},
+    ['Cafe'],
+])
+def test_batch_route_answers_400_for_malformed_input(client, body):
+    response = client.post('/api/batch', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_failed_businesses_do_not_count_as_throughput():
+    def analyze(report, business, **params):
+        if business.startswith('Bad'):
+            raise RuntimeError("scrape failed")
+        return {'stats': {}}
+
+    scheduler = BatchScheduler(workers=2)
+    batch = scheduler.submit(analyze, ['Good Cafe', 'Bad Cafe', 'Bad Diner'])
+    deadline = time.time() + 10
+    while batch.finished is None and time.time() < deadline:
+        time.sleep(0.01)
+    assert batch.failed == 2
+    elapsed = batch.finished - batch.started
+    assert batch.businesses_per_minute == pytest.approx(60.0 / elapsed)
+    body = batch.to_dict(include_entries=False)
+    assert body['failed'] == 2 and body['counts'] == {'done': 1, 'failed': 2}
+
+
+def test_every_download_of_a_batch_larger_than_the_result_store_works(tmp_path, monkeypatch):
+    flask_script = pytest.importorskip('flask_script')
+    # An empty replay-only cache: every search falls back to sample reviews at once
+    monkeypatch.setenv('REVIEW_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    monkeypatch.setenv('REVIEW_CACHE_REPLAY', '1')
+    monkeypatch.setenv('REVIEW_RESULT_MAX', '100')
+    client = flask_script.create_app(warm_in_background=False).test_client()
+    businesses = [f"Cafe {i}" for i in range(120)]
+    response = client.post('/api/batch', json={'businesses': businesses, 'max_reviews': 3,
+                                               'analysis_mode': 'fast'})
+    assert response.status_code == 202
+    status_url = response.get_json()['status_url']
+    deadline = time.time() + 120
+    while (body := client.get(status_url).get_json())['status'] != 'done' and time.time() < deadline:
+        time.sleep(0.1)
+    assert body['counts'] == {'done': 120}
+    for entry in (body['entries'][0], body['entries'][-1]):
+        download = client.get(entry['summary']['downloads']['csv'])
+        assert download.status_code == 200
+        assert download.data.startswith(b"text,")
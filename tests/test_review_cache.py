@@ -0,0 +1,22 @@
+from review_cache import CachedSession, ResponseCache
+from benchmarks.stub_server import StubSearchServer
+
+CAPTCHA_PAGE = ("<html><body>Our systems have detected unusual traffic from your computer network."
+                "<div class='g-recaptcha'></div></body></html>")
+
+
+def test_throttled_200_page_is_not_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    with StubSearchServer(latency=0, page_builder=lambda query: CAPTCHA_PAGE) as server:
+        response = CachedSession(cache).get(f"{server.search_endpoint}?q=cafe")
+    assert response.status_code == 200
+    assert len(cache) == 0
+
+
+def test_result_page_is_cached(tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    with StubSearchServer(latency=0) as server:
+        url = f"{server.search_endpoint}?q=cafe"
+        CachedSession(cache).get(url)
+    assert len(cache) == 1
+    assert CachedSession(cache, replay_only=True).get(url).from_cache
@@ -0,0 +1,37 @@
+import gzip
+
+from review_results import ResultStore, iter_csv, iter_csv_gz
+from review_store import ReviewStore
+
+FLASK_REVIEWS = [
+    {'text': "Great service, will return!", 'stars': 5, 'source': 'Google Search',
+     'sentiment': 'Positive', 'score': 0.5},
+    {'text': "Terrible, not recommended.", 'stars': 1, 'source': 'Google Search',
+     'sentiment': 'Negative', 'score': -0.25},
+]
+
+
+def test_csv_has_only_filled_columns_and_integer_stars():
+    csv = b''.join(iter_csv(ReviewStore.from_reviews(FLASK_REVIEWS))).decode()
+    assert csv.splitlines() == [
+        "text,stars,sentiment,score,source",
+        "\"Great service, will return!\",5,Positive,0.5,Google Search",
+        "\"Terrible, not recommended.\",1,Negative,-0.25,Google Search",
+    ]
+
+
+def test_csv_gz_matches_csv():
+    store = ReviewStore.from_reviews(FLASK_REVIEWS)
+    assert gzip.decompress(b''.join(iter_csv_gz(store))) == b''.join(iter_csv(store))
+
+
+def test_pinned_results_survive_eviction_until_unpinned():
+    results = ResultStore(max_results=2)
+    pinned = [results.put(FLASK_REVIEWS, pinned=True) for _ in range(3)]
+    for _ in range(3):
+        results.put(FLASK_REVIEWS)
+    assert all(results.get(result.id) is not None for result in pinned)
+    assert len(results) == 5
+    results.unpin([result.id for result in pinned])
+    # Reading the pinned results made them the most recently used
+    assert [results.get(result.id) is not None for result in pinned] == [False, True, True]
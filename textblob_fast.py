@@ -0,0 +1,113 @@
+from textblob._text import EMOTICONS, PUNCTUATION, RE_EMOTICONS, RE_SARCASM
+from textblob.en import sentiment as pattern_sentiment
+
+_EMOTICON_POLARITY = {}
+for (_mood, _polarity), _faces in EMOTICONS.items():
+    for _face in _faces:
+        _EMOTICON_POLARITY.setdefault(_face.lower(), _polarity)
+
+
+class FastPolarity:
+    """TextBlob's pattern polarity without building a TextBlob per text
+
+    The pattern lexicon is read once into plain dicts. Each whitespace-separated
+    chunk of a text is run through TextBlob's own tokenizer only the first time
+    it is seen, so a batch of reviews tokenizes its vocabulary rather than every
+    word. The assessment rules (modifiers, negation, "!", "(!)", emoticons) are
+    TextBlob's, for words without part-of-speech tags as TextBlob uses them.
+
+    Tolerance: TextBlob rejoins spaced-out emoticons (": )") within a sentence,
+    this does so across the whole text, so the two differ only for an emoticon
+    split by a sentence-ending period. Everywhere else the polarity is the same
+    float as TextBlob(text).sentiment.polarity; benchmarks/bench_polarity.py
+    measures the agreement on a regression corpus.
+    """
+
+    def __init__(self, max_cached_chunks=200000):
+        lexicon = pattern_sentiment
+        # Indexing loads the XML lexicon on first use
+        self.lexicon = {word: tuple(lexicon[word][None]) for word in lexicon}
+        self.modifier_words = frozenset(
+            word for word in lexicon if any(tag in lexicon[word] for tag in lexicon.modifiers)
+        )
+        self.negations = frozenset(lexicon.negations)
+        self.tokenizer = lexicon.tokenizer
+        self.max_cached_chunks = max_cached_chunks
+        self._chunk_tokens = {}
+
+    def _tokens(self, text):
+        cache = self._chunk_tokens
+        parts = []
+        for chunk in text.split():
+            tokenized = cache.get(chunk)
+            if tokenized is None:
+                if len(cache) >= self.max_cached_chunks:
+                    cache.clear()
+                tokenized = cache[chunk] = " ".join(self.tokenizer(chunk))
+            parts.append(tokenized)
+        # Emoticons and "(!)" can span chunks (": )"), so rejoin them over the whole text
+        joined = RE_SARCASM.sub("(!)", " ".join(parts))
+        joined = RE_EMOTICONS.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), joined)
+        return joined.lower().split()
+
+    def polarity(self, text):
+        lexicon = self.lexicon
+        negations = self.negations
+        assessments = []  # [polarity, intensity, negated] per assessed chunk
+        modifier = None
+        negation = None
+        for word in self._tokens(text):
+            scores = lexicon.get(word)
+            if scores is not None:
+                p, _, i = scores
+                if modifier is None:
+                    assessments.append([p, i, False])
+                else:
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(p * last[1], +1.0))
+                    last[1] = i
+                if negation is not None:
+                    last = assessments[-1]
+                    last[1] = 1.0 / last[1]
+                    last[2] = True
+                modifier = word if word in self.modifier_words else None
+                negation = word if word in negations else None
+                continue
+
+            if word in negations:
+                negation = word
+            elif negation and len(word.strip("'")) > 1:
+                negation = None
+            if negation is not None and modifier is not None and modifier.endswith("ly"):
+                assessments[-1][2] = True
+                negation = None
+            elif modifier and len(word) > 2:
+                modifier = None
+            if word == "!" and assessments:
+                assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, +1.0))
+            if word == "(!)":
+                assessments.append([0.0, 1.0, False])
+            if not word.isalpha() and len(word) <= 5 and word not in PUNCTUATION:
+                face = _EMOTICON_POLARITY.get(word)
+                if face is not None:
+                    assessments.append([face, 1.0, False])
+
+        # "not good" = slightly bad, "not bad" = slightly good
+        total = 0
+        for p, _, negated in assessments:
+            total += p * -0.5 if negated else p
+        return total / float(len(assessments) or 1)
+
+    def polarity_batch(self, texts):
+        return [self.polarity(text) for text in texts]
+
+
+_shared = None
+
+
+def get_fast_polarity():
+    """The process-wide FastPolarity, built on first use"""
+    global _shared
+    if _shared is None:
+        _shared = FastPolarity()
+    return _shared
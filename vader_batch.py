@@ -0,0 +1,317 @@
+import string
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+from vaderSentiment.vaderSentiment import (
+    BOOSTER_DICT, C_INCR, N_SCALAR, NEGATE, SPECIAL_CASES, SentimentIntensityAnalyzer
+)
+
+_NEGATE = frozenset(NEGATE)
+# Multi-word rule keys; single-word keys such as "badass" can never equal a joined n-gram
+_SPECIAL_PHRASES = [(tuple(key.split()), value) for key, value in SPECIAL_CASES.items() if ' ' in key]
+_BOOSTER_PHRASES = [(tuple(key.split()), value) for key, value in BOOSTER_DICT.items() if ' ' in key]
+# Plain words the rules look for next to a lexicon word
+_RULE_WORDS = ('no', 'or', 'nor', 'kind', 'of', 'never', 'so', 'this', 'without', 'doubt',
+               'least', 'at', 'very', 'but')
+
+
+def _strip_punc_if_word(token):
+    stripped = token.strip(string.punctuation)
+    return token if len(stripped) <= 2 else stripped
+
+
+def _shift(values, k, fill):
+    """values moved k places later (k > 0) or earlier (k < 0) in the flat token array"""
+    out = np.full_like(values, fill)
+    if k > 0:
+        out[k:] = values[:-k]
+    elif k < 0:
+        out[:k] = values[-k:]
+    return out
+
+
+def _but_check_reference(sentiments, but_index):
+    """VADER's own "but" pass, kept for the rare texts where its list.index() lookups
+    hit an equal earlier value and so scale a different position than the array version"""
+    for sentiment in sentiments:
+        si = sentiments.index(sentiment)
+        if si < but_index:
+            sentiments.pop(si)
+            sentiments.insert(si, sentiment * 0.5)
+        elif si > but_index:
+            sentiments.pop(si)
+            sentiments.insert(si, sentiment * 1.5)
+    return sentiments
+
+
+def _round_like_python(values, ndigits):
+    """round(value, ndigits) for a float array, as Python lists of floats
+
+    np.round scales, rounds and unscales, which can land on the other side of a
+    .5 boundary than Python's correctly rounded round(); those few values are
+    redone with round() itself.
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = np.rint(scaled) / scale
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    out = rounded.tolist()
+    for index in np.flatnonzero(near_half).tolist():
+        out[index] = round(float(values[index]), ndigits)
+    return out
+
+
+def _index_collides(values):
+    """True when list.index() could resolve a value to another position during the "but" pass"""
+    nonzero = [v for v in values if v]
+    seen = set(nonzero)
+    if len(seen) < len(nonzero):
+        return True
+    return any(v * 0.5 in seen or v * 1.5 in seen for v in nonzero)
+
+
+class LexiconVader:
+    """VADER polarity scores for a whole batch of texts at once
+
+    Every token of the batch is interned into one vocabulary; lexicon valence,
+    booster weight, negation and capitalisation are looked up once per distinct
+    token and gathered into flat arrays. VADER's per-token heuristics (boosters,
+    "no"/negation windows, idioms, "least", "but") then run as array operations
+    over all tokens together, in the same floating-point order as
+    SentimentIntensityAnalyzer.polarity_scores, so the scores are identical.
+    """
+
+    def __init__(self, analyzer=None):
+        self.analyzer = analyzer or SentimentIntensityAnalyzer()
+        self.lexicon = self.analyzer.lexicon
+        self.emojis = self.analyzer.emojis
+
+    def polarity_scores(self, text):
+        return self.polarity_scores_batch([text])[0]
+
+    def _replace_emojis(self, text):
+        if text.isascii() or not any(ch in self.emojis for ch in text):
+            return text
+        parts = []
+        prev_space = True
+        for ch in text:
+            description = self.emojis.get(ch)
+            if description is not None:
+                if not prev_space:
+                    parts.append(' ')
+                parts.append(description)
+                prev_space = False
+            else:
+                parts.append(ch)
+                prev_space = ch == ' '
+        return ''.join(parts)
+
+    def _vocabulary(self, uniques):
+        """Per-distinct-token feature arrays, with one extra all-empty row for out-of-text neighbours"""
+        size = len(uniques) + 1
+        lex_val = np.zeros(size)
+        in_lex = np.zeros(size, dtype=bool)
+        booster_val = np.zeros(size)
+        is_booster = np.zeros(size, dtype=bool)
+        is_upper = np.zeros(size, dtype=bool)
+        is_neg = np.zeros(size, dtype=bool)
+        lower_id = np.full(size, -1, dtype=np.int64)
+        lower_index = {}
+        lexicon = self.lexicon
+        for i, raw in enumerate(uniques):
+            word = _strip_punc_if_word(raw)
+            lower = word.lower()
+            lower_id[i] = lower_index.setdefault(lower, len(lower_index))
+            valence = lexicon.get(lower)
+            if valence is not None:
+                lex_val[i] = valence
+                in_lex[i] = True
+            boost = BOOSTER_DICT.get(lower)
+            if boost is not None:
+                booster_val[i] = boost
+                is_booster[i] = True
+            is_upper[i] = word.isupper()
+            is_neg[i] = lower in _NEGATE or "n't" in lower
+        return lex_val, in_lex, booster_val, is_booster, is_upper, is_neg, lower_id, lower_index
+
+    def polarity_scores_batch(self, texts):
+        """polarity_scores() for every text, as a list of {'neg', 'neu', 'pos', 'compound'} dicts"""
+        texts = [self._replace_emojis(text) for text in texts]
+        n_texts = len(texts)
+        if not n_texts:
+            return []
+
+        split = [text.split() for text in texts]
+        lengths = np.fromiter(map(len, split), dtype=np.int64, count=n_texts)
+        n_tokens = int(lengths.sum())
+        codes, uniques = pd.factorize(np.fromiter(chain.from_iterable(split), dtype=object, count=n_tokens))
+        (lex_val, in_lex, booster_val, is_booster, is_upper, is_neg,
+         lower_id, lower_index) = self._vocabulary(uniques)
+        empty = len(uniques)
+        codes = codes.astype(np.int64)
+
+        text_idx = np.repeat(np.arange(n_texts), lengths)
+        starts = np.cumsum(lengths) - lengths
+        pos = np.arange(n_tokens) - starts[text_idx]
+        remaining = lengths[text_idx] - pos - 1
+
+        # Neighbour tokens as vocabulary rows; positions outside the text point at the empty row
+        prev = {k: np.where(pos >= k, _shift(codes, k, empty), empty) for k in (1, 2, 3)}
+        nxt = {k: np.where(remaining >= k, _shift(codes, -k, empty), empty) for k in (1, 2)}
+        lw, lw_prev = lower_id[codes], {k: lower_id[c] for k, c in prev.items()}
+        lw_next = {k: lower_id[c] for k, c in nxt.items()}
+        ids = {word: lower_index.get(word, -2) for word in _RULE_WORDS}
+
+        # Some but not all words of the text in ALL CAPS
+        n_upper = np.bincount(text_idx, weights=is_upper[codes], minlength=n_texts)
+        cap_diff = ((n_upper > 0) & (n_upper < lengths))[text_idx]
+
+        valence = lex_val[codes].copy()
+        valence[(lw == ids['no']) & in_lex[nxt[1]]] = 0.0
+        after_no = ((lw_prev[1] == ids['no']) | (lw_prev[2] == ids['no'])
+                    | ((lw_prev[3] == ids['no']) & ((lw_prev[1] == ids['or']) | (lw_prev[1] == ids['nor']))))
+        valence = np.where(after_no, lex_val[codes] * N_SCALAR, valence)
+        capped = is_upper[codes] & cap_diff
+        valence = np.where(capped, np.where(valence > 0, valence + C_INCR, valence - C_INCR), valence)
+
+        so_this = {k: (lw_prev[k] == ids['so']) | (lw_prev[k] == ids['this']) for k in (1, 2)}
+        for k in (1, 2, 3):
+            p = prev[k]
+            applies = (pos >= k) & ~in_lex[p]
+
+            scalar = np.where(valence < 0, booster_val[p] * -1, booster_val[p])
+            boost_capped = is_booster[p] & is_upper[p] & cap_diff
+            scalar = np.where(boost_capped, np.where(valence > 0, scalar + C_INCR, scalar - C_INCR), scalar)
+            if k == 2:
+                scalar = np.where(scalar != 0, scalar * 0.95, scalar)
+            elif k == 3:
+                scalar = np.where(scalar != 0, scalar * 0.9, scalar)
+            valence = np.where(applies, valence + scalar, valence)
+
+            # Negation in the k-th preceding word, with VADER's "never so/this" and "without doubt" exceptions
+            if k == 1:
+                amplify = np.zeros(n_tokens, dtype=bool)
+                keep = np.zeros(n_tokens, dtype=bool)
+            elif k == 2:
+                amplify = (lw_prev[2] == ids['never']) & so_this[1]
+                keep = (lw_prev[2] == ids['without']) & (lw_prev[1] == ids['doubt'])
+            else:
+                amplify = ((lw_prev[3] == ids['never']) & so_this[2]) | so_this[1]
+                keep = (lw_prev[3] == ids['without']) & ((lw_prev[2] == ids['doubt']) | (lw_prev[1] == ids['doubt']))
+            negate = ~amplify & ~keep & is_neg[p]
+            valence = np.where(applies & amplify, valence * 1.25, valence)
+            valence = np.where(applies & negate, valence * N_SCALAR, valence)
+
+            if k == 3:
+                valence = np.where(applies, self._idioms(valence, lw, lw_prev, lw_next, lower_index), valence)
+
+        least_1 = ~in_lex[prev[1]] & (lw_prev[1] == ids['least'])
+        least_negates = np.where(pos > 1, (lw_prev[2] != ids['at']) & (lw_prev[2] != ids['very']), pos == 1)
+        valence = np.where(least_1 & least_negates, valence * N_SCALAR, valence)
+
+        # Boosters, and "kind" in "kind of", score 0 themselves; so does every non-lexicon token
+        silent = (is_booster[codes] | ~in_lex[codes]
+                  | ((lw == ids['kind']) & (lw_next[1] == ids['of'])))
+        sentiments = np.where(silent, 0.0, valence)
+
+        sentiments = self._but_check(sentiments, lw, ids['but'], text_idx, pos, starts, lengths)
+        return self._score_valence(sentiments, texts, text_idx, lengths)
+
+    @staticmethod
+    def _idioms(valence, lw, lw_prev, lw_next, lower_index):
+        """VADER's special-case idioms and multi-word boosters around each token"""
+        def grams(*columns):
+            return columns
+
+        def matches(columns, words):
+            if len(columns) != len(words):
+                return None
+            word_ids = [lower_index.get(word) for word in words]
+            if None in word_ids:
+                return None
+            mask = columns[0] == word_ids[0]
+            for column, word_id in zip(columns[1:], word_ids[1:]):
+                mask &= column == word_id
+            return mask
+
+        p1, p2, p3 = lw_prev[1], lw_prev[2], lw_prev[3]
+        # The first of these sequences found in SPECIAL_CASES sets the valence
+        sequences = [grams(p1, lw), grams(p2, p1, lw), grams(p2, p1), grams(p3, p2, p1), grams(p3, p2)]
+        special = np.full(len(valence), np.nan)
+        for columns in reversed(sequences):
+            for words, value in _SPECIAL_PHRASES:
+                mask = matches(columns, words)
+                if mask is not None:
+                    special = np.where(mask, value, special)
+        valence = np.where(np.isnan(special), valence, special)
+
+        for columns in (grams(lw, lw_next[1]), grams(lw, lw_next[1], lw_next[2])):
+            for words, value in _SPECIAL_PHRASES:
+                mask = matches(columns, words)
+                if mask is not None:
+                    valence = np.where(mask, value, valence)
+
+        for columns in (grams(p3, p2, p1), grams(p3, p2), grams(p2, p1)):
+            for words, value in _BOOSTER_PHRASES:
+                mask = matches(columns, words)
+                if mask is not None:
+                    valence = np.where(mask, valence + value, valence)
+        return valence
+
+    @staticmethod
+    def _but_check(sentiments, lw, but_id, text_idx, pos, starts, lengths):
+        """Halve sentiment before the first "but" of a text and scale it by 1.5 after"""
+        but_tokens = np.flatnonzero(lw == but_id)
+        if not len(but_tokens):
+            return sentiments
+        but_texts, first = np.unique(text_idx[but_tokens], return_index=True)
+        but_pos = np.full(len(lengths), -1, dtype=np.int64)
+        but_pos[but_texts] = pos[but_tokens[first]]
+
+        token_but = but_pos[text_idx]
+        has_but = token_but >= 0
+        original = sentiments
+        sentiments = np.where(has_but & (pos < token_but), original * 0.5, original)
+        sentiments = np.where(has_but & (pos > token_but), original * 1.5, sentiments)
+
+        for text in but_texts.tolist():
+            start, stop = starts[text], starts[text] + lengths[text]
+            values = original[start:stop].tolist()
+            if _index_collides(values):
+                sentiments[start:stop] = _but_check_reference(values, int(but_pos[text]))
+        return sentiments
+
+    @staticmethod
+    def _score_valence(sentiments, texts, text_idx, lengths):
+        n_texts = len(texts)
+        # bincount accumulates in token order, the same order as VADER's sum()
+        sum_s = np.bincount(text_idx, weights=sentiments, minlength=n_texts)
+        pos_sum = np.bincount(text_idx, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_texts)
+        neg_sum = np.bincount(text_idx, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_texts)
+        neu_count = np.bincount(text_idx, weights=sentiments == 0, minlength=n_texts)
+
+        ep = np.minimum(np.fromiter((text.count('!') for text in texts), dtype=np.int64, count=n_texts), 4)
+        qm = np.fromiter((text.count('?') for text in texts), dtype=np.int64, count=n_texts)
+        qm_amplifier = np.where(qm > 3, 0.96, np.where(qm > 1, qm * 0.18, 0.0))
+        amplifier = ep * 0.292 + qm_amplifier
+
+        sum_s = np.where(sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s))
+        compound = np.clip(sum_s / np.sqrt(sum_s * sum_s + 15), -1.0, 1.0)
+
+        abs_neg = np.abs(neg_sum)
+        pos_sum, neg_sum = (np.where(pos_sum > abs_neg, pos_sum + amplifier, pos_sum),
+                            np.where(pos_sum < abs_neg, neg_sum - amplifier, neg_sum))
+        total = pos_sum + np.abs(neg_sum) + neu_count
+        has_words = lengths > 0
+        safe_total = np.where(has_words, total, 1.0)
+        pos = np.where(has_words, np.abs(pos_sum / safe_total), 0.0)
+        neg = np.where(has_words, np.abs(neg_sum / safe_total), 0.0)
+        neu = np.where(has_words, np.abs(neu_count / safe_total), 0.0)
+        compound = np.where(has_words, compound, 0.0)
+
+        return [
+            {'neg': n, 'neu': u, 'pos': p, 'compound': c}
+            for n, u, p, c in zip(_round_like_python(neg, 3), _round_like_python(neu, 3),
+                                  _round_like_python(pos, 3), _round_like_python(compound, 4))
+        ]